@@ -0,0 +1,65 @@
+"""
+Moves closed cases into the *_Archive tables (and back) from the command line.
+
+Safe to schedule: each batch is its own short transaction, and a stopped run
+simply continues with the remaining closed cases next time.
+
+    uv run python src/archive.py run --batch-size 200 --idle-days 90
+    uv run python src/archive.py list
+    uv run python src/archive.py restore 105
+"""
+
+import argparse
+import sys
+
+from db_utils import DatabaseManager, add_connection_args, config_from_args
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Archive closed cases, list archived cases or restore one."
+    )
+    add_connection_args(parser)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Archive closed cases in batches")
+    run.add_argument("--batch-size", type=int, default=100)
+    run.add_argument(
+        "--idle-days",
+        type=int,
+        default=None,
+        help="Only cases without updates in this many days",
+    )
+    run.add_argument("--max-batches", type=int, default=None)
+    run.add_argument("--pause", type=float, default=0.1, help="Seconds between batches")
+    sub.add_parser("list", help="List archived cases")
+    restore = sub.add_parser("restore", help="Move an archived case back")
+    restore.add_argument("case_id", type=int)
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(config_from_args(args), use_cache=False)
+    success, msg = db.connect()
+    if not success:
+        print(msg)
+        sys.exit(1)
+
+    try:
+        if args.command == "run":
+            print(
+                db.archive_closed_cases(
+                    batch_size=args.batch_size,
+                    idle_days=args.idle_days,
+                    max_batches=args.max_batches,
+                    pause=args.pause,
+                )
+            )
+        elif args.command == "list":
+            print(db.get_archived_cases().to_string(index=False))
+        else:
+            print(db.restore_case(args.case_id))
+    except Exception as e:
+        print(e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
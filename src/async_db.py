@@ -0,0 +1,232 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import pymysql
+
+from db_utils import DatabaseManager
+
+# DatabaseManager methods mirrored as coroutines on AsyncDatabaseManager
+READ_OPERATIONS = (
+    "get_squad_roster",
+    "get_case_load",
+    "get_heist_winners",
+    "search_evidence",
+    "get_perpetrator_network",
+    "get_unsolved_cases",
+    "get_resource_custody",
+    "get_betting_history",
+    "get_interview_logs",
+    "get_detective_specializations",
+)
+WRITE_OPERATIONS = (
+    "insert_evidence",
+    "update_case_status",
+    "delete_resource",
+    "create_new_case",
+    "assign_detective",
+    "add_person_of_interest",
+    "add_perpetrator_details",
+    "promote_detective",
+    "transfer_detective",
+    "delete_evidence",
+)
+EXECUTE_METHODS = (
+    "execute_query",
+    "execute_update",
+    "execute_batch",
+    "execute_transaction",
+)
+
+
+class QueryTimeoutError(Exception):
+    """Raised when an awaited call does not finish within its timeout."""
+
+
+class _Call:
+    """Tracks which server thread is running a call, so it can be interrupted.
+
+    `thread_id` is set only while the call holds its connection, and both it
+    and `cancelled` change under `lock`: a KILL is sent while holding the lock,
+    so the worker cannot hand the connection to another call in the meantime.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.thread_id: Optional[int] = None
+        self.cancelled = False
+
+
+class AsyncDatabaseManager:
+    """
+    Asyncio counterpart of DatabaseManager.
+
+    Every operation is a coroutine that runs the synchronous method on a
+    worker thread holding its own pooled connection, so concurrent awaits
+    overlap their round trips while sharing the pool, result cache, metrics
+    and SQL log of the synchronous manager. Calls accept a keyword-only
+    `timeout`; on timeout or cancellation a queued call is dropped and a
+    running statement is stopped with KILL QUERY.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, str],
+        timeout: Optional[float] = 30.0,
+        max_workers: Optional[int] = None,
+        **manager_options,
+    ):
+        self._setup(DatabaseManager(config, **manager_options), timeout, max_workers)
+        self._owns_db = True
+
+    @classmethod
+    def from_manager(
+        cls,
+        db: DatabaseManager,
+        timeout: Optional[float] = 30.0,
+        max_workers: Optional[int] = None,
+    ) -> "AsyncDatabaseManager":
+        """Wraps an existing DatabaseManager (sharing its settings).
+
+        close() then only stops the wrapper's workers; `db` stays open.
+        """
+        manager = cls.__new__(cls)
+        manager._setup(db, timeout, max_workers)
+        manager._owns_db = False
+        return manager
+
+    def _setup(
+        self, db: DatabaseManager, timeout: Optional[float], max_workers: Optional[int]
+    ):
+        self.db = db
+        self.timeout = timeout
+        # A call holds its pooled connection while it runs and may need a second
+        # one (streamed replica/graph loads), so keep one connection spare: with
+        # a worker per connection, a full set of calls would wait on each other
+        spare = max(db.pool_options.get("max_size", 10) - 1, 1)
+        workers = min(max_workers or spare, spare)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="dna-async"
+        )
+
+    async def connect(self):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.db.connect
+        )
+
+    def close(self):
+        """Stops the worker threads (queued calls are cancelled).
+
+        The DatabaseManager is closed too unless it came from from_manager().
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._owns_db:
+            self.db.close()
+
+    async def __aenter__(self) -> "AsyncDatabaseManager":
+        success, msg = await self.connect()
+        if not success:
+            raise Exception(msg)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    # ==========================================
+    #  EXECUTION
+    # ==========================================
+
+    async def run(
+        self, func: Callable, *args, timeout: Optional[float] = None, **kwargs
+    ) -> Any:
+        """Runs a blocking DatabaseManager call on a worker thread and awaits it."""
+        timeout = self.timeout if timeout is None else timeout
+        call = _Call()
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(self._invoke, call, func, args, kwargs)
+        )
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._interrupt(call)
+            name = getattr(func, "__name__", "call")
+            raise QueryTimeoutError(f"{name} timed out after {timeout:.1f}s")
+        except asyncio.CancelledError:
+            self._interrupt(call)
+            raise
+
+    def _invoke(self, call: _Call, func: Callable, args, kwargs) -> Any:
+        # Hold the thread's pooled connection for the whole call; the nested
+        # DatabaseManager methods re-enter it, so its server thread id is known
+        with self.db._get_pool().connection() as conn:
+            with call.lock:
+                if call.cancelled:
+                    raise asyncio.CancelledError()
+                call.thread_id = conn.thread_id()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # Waits for a KILL in flight before the connection is reused
+                with call.lock:
+                    call.thread_id = None
+
+    def _interrupt(self, call: _Call):
+        """Stops a call: skips it if still queued, kills its statement if running."""
+        with call.lock:
+            call.cancelled = True
+            running = call.thread_id is not None
+        if running:
+            threading.Thread(target=self._kill_query, args=(call,), daemon=True).start()
+
+    def _kill_query(self, call: _Call):
+        # A connection of its own: under load the pool may have none to spare,
+        # and the KILL must not wait behind the calls it is meant to stop
+        config = self.db.config
+        try:
+            conn = pymysql.connect(
+                host=config["host"],
+                user=config["user"],
+                password=config["password"],
+                database=config["database"],
+                connect_timeout=5,
+            )
+        except pymysql.Error as e:
+            print(f"KILL QUERY failed: {e}")
+            return
+        try:
+            with call.lock:
+                # Only if the call still holds its connection; once it has
+                # finished, the thread id may belong to someone else's call
+                if call.thread_id is None:
+                    return
+                with conn.cursor() as cursor:
+                    cursor.execute("KILL QUERY %s", (call.thread_id,))
+        except pymysql.Error:
+            pass  # statement already finished
+        finally:
+            conn.close()
+
+    async def gather(
+        self, calls: Dict[str, Awaitable], return_exceptions: bool = True
+    ) -> Dict[str, Any]:
+        """Awaits several calls concurrently; returns {name: result or exception}."""
+        results = await asyncio.gather(
+            *calls.values(), return_exceptions=return_exceptions
+        )
+        return dict(zip(calls, results))
+
+
+def _make_coroutine(name: str):
+    sync_method = getattr(DatabaseManager, name)
+
+    @functools.wraps(sync_method)
+    async def method(self, *args, timeout: Optional[float] = None, **kwargs):
+        return await self.run(getattr(self.db, name), *args, timeout=timeout, **kwargs)
+
+    return method
+
+
+for _name in EXECUTE_METHODS + READ_OPERATIONS + WRITE_OPERATIONS:
+    setattr(AsyncDatabaseManager, _name, _make_coroutine(_name))
@@ -0,0 +1,407 @@
+"""
+Benchmark harness for the 20 DatabaseManager operations.
+
+Runs every read and write operation against a local MySQL with configurable
+concurrency, warmup and data scale, reports throughput and latency
+percentiles, saves JSON baselines and flags regressions against one.
+
+    uv run python src/bench.py --iterations 200 --concurrency 4 --save baseline.json
+    uv run python src/bench.py --compare baseline.json --threshold 0.15
+    uv run python src/bench.py --scales 0.1,1 --generate   # reload data per scale
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from db_utils import DatabaseManager, add_connection_args, config_from_args
+
+# Benchmark rows live above these ids/prefixes and are removed afterwards
+BENCH_ID_BASE = 900_000_000
+BENCH_PREFIX = "BENCH-"
+
+
+class BenchContext:
+    """Existing ids to read/write against plus a thread-safe id sequence."""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.case_ids = self._ids(
+            "SELECT case_id FROM Case_File WHERE case_id < %s LIMIT 200"
+        )
+        self.badges = self._ids(
+            "SELECT badge_no FROM Detective WHERE badge_no < %s LIMIT 200"
+        )
+        self.squads = self._ids(
+            "SELECT squad_id FROM Squad WHERE squad_id < %s LIMIT 50"
+        )
+        if not (self.case_ids and self.badges and self.squads):
+            raise Exception("Benchmark needs at least one case, detective and squad.")
+        self._seq = itertools.count(BENCH_ID_BASE + int(time.time()) % 1_000_000 * 100)
+        self._lock = threading.Lock()
+
+    def _ids(self, sql: str) -> List:
+        frame = self.db.execute_query(sql, (BENCH_ID_BASE,))
+        return frame.iloc[:, 0].tolist() if not frame.empty else []
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._seq)
+
+    def pick(self, values: List, i: int):
+        return values[i % len(values)]
+
+    def new_case(self) -> int:
+        case_id = self.next_id()
+        self.db.create_new_case(case_id, f"{BENCH_PREFIX}case")
+        return case_id
+
+    def cleanup(self):
+        db = self.db
+        db.execute_update(
+            "DELETE FROM Evidence_Log WHERE evidence_tag LIKE %s", (BENCH_PREFIX + "%",)
+        )
+        db.execute_update("DELETE FROM Case_File WHERE case_id >= %s", (BENCH_ID_BASE,))
+        db.execute_update(
+            "DELETE FROM Person_Of_Interest WHERE person_id >= %s", (BENCH_ID_BASE,)
+        )
+        db.execute_update(
+            "DELETE FROM Precinct_Resource WHERE asset_tag LIKE %s",
+            (BENCH_PREFIX + "%",),
+        )
+        # Bench assignments were removed by the cascade; recount those detectives
+        db.refresh_case_load(self.badges)
+
+
+# name -> (kind, prepare(ctx, i) -> args [untimed], run(db, *args) [timed])
+Operation = Tuple[str, Callable[[BenchContext, int], tuple], Callable]
+
+
+def _evidence_args(ctx: BenchContext, i: int) -> tuple:
+    return (
+        ctx.pick(ctx.case_ids, i),
+        f"{BENCH_PREFIX}{ctx.next_id()}",
+        "bench item",
+        "Locker B",
+        ctx.pick(ctx.badges, i),
+    )
+
+
+def _prepare_delete_resource(ctx: BenchContext, i: int) -> tuple:
+    tag = f"{BENCH_PREFIX}{ctx.next_id()}"
+    ctx.db.execute_update(
+        "INSERT INTO Precinct_Resource (asset_tag, item_name) VALUES (%s, %s)",
+        (tag, "bench"),
+    )
+    return (tag,)
+
+
+def _prepare_delete_evidence(ctx: BenchContext, i: int) -> tuple:
+    args = _evidence_args(ctx, i)
+    ctx.db.insert_evidence(*args)
+    return (args[1],)
+
+
+def _prepare_perp(ctx: BenchContext, i: int) -> tuple:
+    person_id = ctx.next_id()
+    ctx.db.add_person_of_interest(person_id, "Bench Perp", "Perpetrator")
+    return (ctx.next_id(), person_id, "The Benchmark")
+
+
+def _current_rank(ctx: BenchContext, i: int) -> tuple:
+    badge = ctx.pick(ctx.badges, i)
+    rank = ctx.db.execute_query(
+        "SELECT `rank` FROM Detective WHERE badge_no = %s", (badge,)
+    ).iloc[0, 0]
+    return (badge, rank)
+
+
+def _current_squad(ctx: BenchContext, i: int) -> tuple:
+    badge = ctx.pick(ctx.badges, i)
+    sql = "SELECT COALESCE(squad_id, %s) FROM Detective WHERE badge_no = %s"
+    squad = ctx.db.execute_query(sql, (ctx.pick(ctx.squads, i), badge)).iloc[0, 0]
+    return (badge, int(squad))
+
+
+def _current_status(ctx: BenchContext, i: int) -> tuple:
+    case_id = ctx.pick(ctx.case_ids, i)
+    status = ctx.db.execute_query(
+        "SELECT status FROM Case_File WHERE case_id = %s", (case_id,)
+    ).iloc[0, 0]
+    return (case_id, status)
+
+
+def _none(ctx: BenchContext, i: int) -> tuple:
+    return ()
+
+
+OPERATIONS: Dict[str, Operation] = {
+    # READ OPERATIONS
+    "get_squad_roster": (
+        "read",
+        lambda ctx, i: ("Squad",),
+        DatabaseManager.get_squad_roster,
+    ),
+    "get_case_load": ("read", _none, DatabaseManager.get_case_load),
+    "get_heist_winners": ("read", _none, DatabaseManager.get_heist_winners),
+    "search_evidence": (
+        "read",
+        lambda ctx, i: ("key",),
+        DatabaseManager.search_evidence,
+    ),
+    "get_perpetrator_network": ("read", _none, DatabaseManager.get_perpetrator_network),
+    "get_unsolved_cases": ("read", _none, DatabaseManager.get_unsolved_cases),
+    "get_resource_custody": ("read", _none, DatabaseManager.get_resource_custody),
+    "get_betting_history": ("read", _none, DatabaseManager.get_betting_history),
+    "get_interview_logs": ("read", _none, DatabaseManager.get_interview_logs),
+    "get_detective_specializations": (
+        "read",
+        _none,
+        DatabaseManager.get_detective_specializations,
+    ),
+    # WRITE OPERATIONS (state-preserving or cleaned up afterwards)
+    "insert_evidence": ("write", _evidence_args, DatabaseManager.insert_evidence),
+    "update_case_status": (
+        "write",
+        _current_status,
+        DatabaseManager.update_case_status,
+    ),
+    "delete_resource": (
+        "write",
+        _prepare_delete_resource,
+        DatabaseManager.delete_resource,
+    ),
+    "create_new_case": (
+        "write",
+        lambda ctx, i: (ctx.next_id(), f"{BENCH_PREFIX}case"),
+        DatabaseManager.create_new_case,
+    ),
+    "assign_detective": (
+        "write",
+        lambda ctx, i: (ctx.pick(ctx.badges, i), ctx.new_case()),
+        DatabaseManager.assign_detective,
+    ),
+    "add_person_of_interest": (
+        "write",
+        lambda ctx, i: (ctx.next_id(), "Bench Witness", "Witness"),
+        DatabaseManager.add_person_of_interest,
+    ),
+    "add_perpetrator_details": (
+        "write",
+        _prepare_perp,
+        DatabaseManager.add_perpetrator_details,
+    ),
+    "promote_detective": ("write", _current_rank, DatabaseManager.promote_detective),
+    "transfer_detective": ("write", _current_squad, DatabaseManager.transfer_detective),
+    "delete_evidence": (
+        "write",
+        _prepare_delete_evidence,
+        DatabaseManager.delete_evidence,
+    ),
+}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(q) - 1]
+
+
+def run_operation(
+    ctx: BenchContext, name: str, iterations: int, warmup: int, concurrency: int
+) -> Dict:
+    """Runs one operation `iterations` times across `concurrency` threads."""
+    _, prepare, run = OPERATIONS[name]
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    for i in range(warmup):
+        run(ctx.db, *prepare(ctx, i))
+
+    def worker():
+        local: List[float] = []
+        while True:
+            i = next(counter)
+            if i >= iterations:
+                break
+            try:
+                args = prepare(ctx, i)
+                start = time.perf_counter()
+                run(ctx.db, *args)
+                local.append(time.perf_counter() - start)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+        with lock:
+            latencies.extend(local)
+
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - wall
+
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "operation": name,
+        "iterations": len(ms),
+        "errors": len(errors),
+        "throughput_ops": len(ms) / wall if wall else 0.0,
+        "mean_ms": statistics.fmean(ms) if ms else 0.0,
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "max_ms": ms[-1] if ms else 0.0,
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Lists operations whose p95 grew or throughput fell by more than `threshold`."""
+    regressions = []
+    for scale, results in current["scales"].items():
+        base = {r["operation"]: r for r in baseline.get("scales", {}).get(scale, [])}
+        for r in results:
+            old = base.get(r["operation"])
+            if not old or not old["iterations"]:
+                continue
+            if old["p95_ms"] and r["p95_ms"] > old["p95_ms"] * (1 + threshold):
+                regressions.append(
+                    f"[scale {scale}] {r['operation']}: p95 {old['p95_ms']:.2f} -> {r['p95_ms']:.2f} ms"
+                )
+            if old["throughput_ops"] and r["throughput_ops"] < old["throughput_ops"] * (
+                1 - threshold
+            ):
+                regressions.append(
+                    f"[scale {scale}] {r['operation']}: throughput {old['throughput_ops']:.1f} -> {r['throughput_ops']:.1f} ops/s"
+                )
+    return regressions
+
+
+def print_table(scale: str, results: List[Dict]):
+    print(f"\n=== Scale {scale} ===")
+    print(
+        f"{'operation':<32}{'ops/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'err':>6}"
+    )
+    for r in results:
+        print(
+            f"{r['operation']:<32}{r['throughput_ops']:>10.1f}{r['p50_ms']:>9.2f}"
+            f"{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}{r['errors']:>6}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark DatabaseManager operations."
+    )
+    add_connection_args(parser)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--ops", default="all", help="Comma list, 'reads', 'writes' or 'all'"
+    )
+    parser.add_argument(
+        "--scales", default="current", help="e.g. 0.1,1,10 (needs --generate)"
+    )
+    parser.add_argument(
+        "--generate", action="store_true", help="Regenerate and load data per scale"
+    )
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument(
+        "--cache", action="store_true", help="Leave the result cache on"
+    )
+    parser.add_argument("--save", help="Write results JSON here")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.ops in ("all", "reads", "writes"):
+        names = [
+            n
+            for n, (kind, _, _) in OPERATIONS.items()
+            if args.ops == "all" or kind + "s" == args.ops
+        ]
+    else:
+        names = [n.strip() for n in args.ops.split(",")]
+        unknown = [n for n in names if n not in OPERATIONS]
+        if unknown:
+            parser.error(f"Unknown operation(s): {', '.join(unknown)}")
+
+    config = config_from_args(args)
+    db = DatabaseManager(
+        config,
+        log_file=None,
+        use_cache=args.cache,
+        pool_options={"max_size": max(10, args.concurrency * 2)},
+    )
+    success, msg = db.connect()
+    if not success:
+        print(msg)
+        sys.exit(1)
+
+    report = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "host": platform.node(),
+        "settings": {
+            k: getattr(args, k)
+            for k in ("iterations", "warmup", "concurrency", "cache")
+        },
+        "scales": {},
+    }
+    for scale in args.scales.split(","):
+        scale = scale.strip()
+        if args.generate and scale != "current":
+            import datagen
+
+            print(f"Generating and loading scale {scale} ...")
+            datagen.generate(args.data_dir, float(scale))
+            datagen.load(config, args.data_dir)
+            db.clear_cache()
+
+        ctx = BenchContext(db)
+        results = []
+        try:
+            for name in names:
+                results.append(
+                    run_operation(
+                        ctx, name, args.iterations, args.warmup, args.concurrency
+                    )
+                )
+        finally:
+            ctx.cleanup()
+        report["scales"][scale] = results
+        print_table(scale, results)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\nREGRESSIONS (> {args.threshold:.0%}):")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.compare}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import csv
+import io
+import itertools
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from db_utils import DatabaseManager
+
+# kind -> (ordered CSV columns, column converters, DatabaseManager batch method)
+IMPORT_KINDS: Dict[str, Tuple[List[str], Dict[str, Callable], str]] = {
+    "evidence": (
+        ["case_id", "evidence_tag", "description", "storage_location", "logged_by_id"],
+        {"case_id": int, "logged_by_id": int},
+        "insert_evidence_batch",
+    ),
+    "cases": (
+        ["case_id", "case_title"],
+        {"case_id": int},
+        "create_new_case_batch",
+    ),
+    "assignments": (
+        ["badge_no", "case_id"],
+        {"badge_no": int, "case_id": int},
+        "assign_detective_batch",
+    ),
+    "persons": (
+        ["person_id", "name", "poi_type"],
+        {"person_id": int},
+        "add_person_of_interest_batch",
+    ),
+}
+
+
+def _open_text(source: Union[str, io.IOBase]):
+    """Accepts a path, a text stream or a binary upload (e.g. Streamlit)."""
+    if isinstance(source, str):
+        return open(source, newline="", encoding="utf-8")
+    if isinstance(source, io.TextIOBase):
+        return source
+    return io.TextIOWrapper(source, encoding="utf-8", newline="")
+
+
+def _validated_rows(
+    reader: csv.DictReader,
+    columns: List[str],
+    converters: Dict[str, Callable],
+    errors: List,
+) -> Iterator[Tuple[int, Tuple]]:
+    """Yields (csv_line, params) for valid rows; records invalid ones in `errors`."""
+    missing = [c for c in columns if c not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}")
+
+    for record in reader:
+        line = reader.line_num
+        try:
+            values = []
+            for col in columns:
+                raw = (record.get(col) or "").strip()
+                if raw == "" and col in converters:
+                    raise ValueError(f"'{col}' is required")
+                values.append(converters[col](raw) if col in converters else raw)
+        except ValueError as e:
+            errors.append((line, f"Invalid row: {e}"))
+            continue
+        yield line, tuple(values)
+
+
+def import_csv(
+    db: DatabaseManager,
+    source: Union[str, io.IOBase],
+    kind: str,
+    chunk_size: int = 1000,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Streams a CSV file into the database in validated, committed chunks.
+
+    Only one chunk is held in memory at a time, so files far larger than RAM
+    can be loaded. Returns totals plus a list of (csv_line, error) pairs for
+    rows that failed validation or were rejected by MySQL.
+    """
+    if kind not in IMPORT_KINDS:
+        raise ValueError(
+            f"Unknown import kind '{kind}'. Use one of: {', '.join(IMPORT_KINDS)}"
+        )
+    columns, converters, method = IMPORT_KINDS[kind]
+    batch = getattr(db, method)
+
+    summary: Dict[str, Any] = {"rows": 0, "loaded": 0, "errors": []}
+    f = _open_text(source)
+    try:
+        rows = _validated_rows(
+            csv.DictReader(f), columns, converters, summary["errors"]
+        )
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            lines = [line for line, _ in chunk]
+            result = batch([params for _, params in chunk], chunk_size=chunk_size)
+            summary["rows"] += len(chunk)
+            summary["loaded"] += len(chunk) - len(result["errors"])
+            summary["errors"].extend((lines[i], msg) for i, msg in result["errors"])
+            if on_progress:
+                on_progress(summary["rows"])
+    finally:
+        if isinstance(source, str):
+            f.close()
+        elif isinstance(f, io.TextIOWrapper) and f is not source:
+            f.detach()
+    return summary
@@ -0,0 +1,63 @@
+import threading
+from collections import deque
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+class ChangeFeed:
+    """
+    Process-wide, table-level record of writes made through DatabaseManager.
+
+    Every write publishes the tables it touched under an increasing sequence
+    number. Derived structures (graph index, local replica, ...) remember the
+    last sequence they saw and ask which tables changed since then, so they
+    only refresh what is stale. Only the most recent `maxlen` events are kept;
+    a consumer that falls further behind is told to refresh everything.
+    """
+
+    def __init__(self, maxlen: int = 10000):
+        self._lock = threading.Lock()
+        self._events: deque = deque(maxlen=maxlen)  # (seq, tables or None)
+        self.sequence = 0
+
+    def publish(self, tables: Optional[Iterable[str]]) -> int:
+        """Records a write; `tables=None` means "anything may have changed"."""
+        with self._lock:
+            self.sequence += 1
+            entry = frozenset(t.lower() for t in tables) if tables is not None else None
+            self._events.append((self.sequence, entry))
+            return self.sequence
+
+    def changes_since(self, sequence: int) -> Tuple[int, Optional[Set[str]]]:
+        """Returns (current sequence, changed tables) since `sequence`.
+
+        The table set is None when the answer is unknown (an unscoped write or
+        events older than the retained window).
+        """
+        with self._lock:
+            if sequence >= self.sequence:
+                return self.sequence, set()
+            oldest = self._events[0][0] if self._events else self.sequence + 1
+            if sequence + 1 < oldest:
+                return self.sequence, None
+            changed: Set[str] = set()
+            for seq, tables in self._events:
+                if seq <= sequence:
+                    continue
+                if tables is None:
+                    return self.sequence, None
+                changed |= tables
+            return self.sequence, changed
+
+
+_feeds: Dict[Tuple, ChangeFeed] = {}
+_feeds_lock = threading.Lock()
+
+
+def get_change_feed(config: Dict[str, str]) -> ChangeFeed:
+    """Returns the feed shared by every DatabaseManager on the same database."""
+    key = (config["host"], config["database"])
+    with _feeds_lock:
+        feed = _feeds.get(key)
+        if feed is None:
+            feed = _feeds[key] = ChangeFeed()
+        return feed
@@ -1,7 +1,30 @@
+import time
+
+_IMPORT_START = time.perf_counter()
+
+import argparse
 import getpass
+import json
 import sys
 
-from db_utils import DatabaseManager
+from bulk_import import IMPORT_KINDS, import_csv
+from cli_script import ScriptRunner, parse_script
+from db_utils import DatabaseManager, add_connection_args, config_from_args
+from table_render import render_table
+
+# pandas is deliberately not imported here: results stream straight from the
+# cursor into render_table, and pandas only loads for the few admin options
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+
+def show(db: DatabaseManager, call, page_size: int = 40) -> str:
+    """Streams the result of a read operation to the terminal, page by page.
+
+    Returns the captured SQL so callers can report details about it.
+    """
+    sql, params = db.capture_query(call)
+    render_table(db.iter_batches(sql, params, batch_size=page_size), page_size)
+    return sql
 
 
 def print_menu():
@@ -27,10 +50,97 @@ def print_menu():
     print("18. [WRITE] Promote Detective Rank (UPDATE)")
     print("19. [WRITE] Transfer Detective to New Squad (UPDATE)")
     print("20. [WRITE] Delete Evidence Record (DELETE)")
+    print("-" * 60)
+    print("21. [BULK]  Import CSV File (Evidence/Cases/Assignments/Persons)")
+    print("22. [ADMIN] Verify Case-Load Summary")
+    print("23. [ADMIN] Rebuild Case-Load Summary")
     print("q.  Quit")
 
 
+def run_script(args: argparse.Namespace) -> int:
+    """Non-interactive mode: runs a script of commands and reports a summary."""
+    if args.script == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(args.script, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    commands, errors = parse_script(lines)
+    if errors:
+        # Nothing runs unless the whole script parses
+        for error in errors:
+            print(f"Parse error: {error}", file=sys.stderr)
+        return 2
+
+    db = DatabaseManager(config_from_args(args))
+    success, msg = db.connect()
+    if not success:
+        print(msg, file=sys.stderr)
+        return 1
+
+    show = not args.quiet and args.summary != "-"
+
+    def print_read(command, frame):
+        print(f"# line {command[0]}: {command[1]} {' '.join(map(str, command[2]))}")
+        print(frame.to_string())
+
+    runner = ScriptRunner(
+        db,
+        chunk_size=args.chunk_size,
+        parallel=args.parallel,
+        on_read=print_read if show else None,
+    )
+    summary = runner.run(commands)
+    if args.summary == "-":
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    elif args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    if args.summary != "-":
+        print(
+            f"{summary['ok']}/{summary['commands']} command(s) succeeded "
+            f"in {summary['seconds']:.2f}s.",
+            file=sys.stderr,
+        )
+        for error in summary["errors"]:
+            print(f"  line {error['line']}: {error['error']}", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
 def main():
+    parser = argparse.ArgumentParser(description="99th Precinct Database CLI.")
+    script = parser.add_argument_group("script mode")
+    script.add_argument(
+        "--script",
+        metavar="FILE",
+        help="Run commands from FILE ('-' for stdin) instead of the menu",
+    )
+    script.add_argument(
+        "--chunk-size", type=int, default=200, help="Writes per transaction"
+    )
+    script.add_argument(
+        "--parallel", type=int, default=1, help="Consecutive reads run concurrently"
+    )
+    script.add_argument(
+        "--summary", metavar="FILE", help="Write a JSON summary ('-' for stdout)"
+    )
+    script.add_argument(
+        "--quiet", action="store_true", help="Do not print read results"
+    )
+    add_connection_args(script)
+    parser.add_argument(
+        "--startup-time",
+        action="store_true",
+        help="Print how long module imports took and exit",
+    )
+    args = parser.parse_args()
+    if args.startup_time:
+        loaded = "yes" if "pandas" in sys.modules else "no"
+        print(f"Imports: {IMPORT_SECONDS * 1000:.0f} ms (pandas loaded: {loaded})")
+        return
+    if args.script:
+        sys.exit(run_script(args))
+
     print("Connect to Database:")
     user = input("User [default: detective]: ") or "detective"
     password = getpass.getpass("Password [default: ******]: ") or "Team82"
@@ -58,26 +168,30 @@ def main():
             # READ OPERATIONS
             elif choice == "1":
                 f = input("Filter by Squad Name [e.g., '99', 'Cyber']: ")
-                print(db.get_squad_roster(f).to_string())
+                show(db, lambda: db.get_squad_roster(f))
             elif choice == "2":
-                print(db.get_case_load().to_string())
+                show(db, db.get_case_load)
             elif choice == "3":
-                print(db.get_heist_winners().to_string())
+                show(db, db.get_heist_winners)
             elif choice == "4":
-                k = input("Search keyword [e.g., 'Key', 'Wrapper']: ")
-                print(db.search_evidence(k).to_string())
+                k = input(
+                    "Search keyword [e.g., 'Key', 'Wrapper', '\"exact phrase\"']: "
+                )
+                sql = show(db, lambda: db.search_evidence(k))
+                mode = "fulltext" if "MATCH(" in sql else "substring"
+                print(f"(search mode: {mode})")
             elif choice == "5":
-                print(db.get_perpetrator_network().to_string())
+                show(db, db.get_perpetrator_network)
             elif choice == "6":
-                print(db.get_unsolved_cases().to_string())
+                show(db, db.get_unsolved_cases)
             elif choice == "7":
-                print(db.get_resource_custody().to_string())
+                show(db, db.get_resource_custody)
             elif choice == "8":
-                print(db.get_betting_history().to_string())
+                show(db, db.get_betting_history)
             elif choice == "9":
-                print(db.get_interview_logs().to_string())
+                show(db, db.get_interview_logs)
             elif choice == "10":
-                print(db.get_detective_specializations().to_string())
+                show(db, db.get_detective_specializations)
 
             # WRITE OPERATIONS
             elif choice == "11":
@@ -143,6 +257,29 @@ def main():
                 db.delete_evidence(input("Evidence Tag [STRING]: "))
                 print("Evidence Deleted.")
 
+            elif choice == "21":
+                kind = input(f"Kind [{'/'.join(IMPORT_KINDS)}]: ").strip().lower()
+                path = input("CSV Path [STRING]: ").strip()
+                summary = import_csv(
+                    db, path, kind, on_progress=lambda n: print(f"  {n} rows...")
+                )
+                print(
+                    f"Imported {summary['loaded']} row(s), "
+                    f"{len(summary['errors'])} error(s)."
+                )
+                for line, err in summary["errors"][:20]:
+                    print(f"  line {line}: {err}")
+
+            elif choice == "22":
+                mismatches = db.verify_case_load()
+                if mismatches.empty:
+                    print("Case-load summary is consistent.")
+                else:
+                    print(mismatches.to_string())
+
+            elif choice == "23":
+                print(db.rebuild_case_load())
+
             else:
                 print("Invalid choice.")
 
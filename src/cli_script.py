@@ -0,0 +1,241 @@
+import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from db_utils import DatabaseManager
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# command -> (kind, DatabaseManager method, argument converters)
+SCRIPT_COMMANDS: Dict[str, Tuple[str, str, Tuple[Callable, ...]]] = {
+    "roster": ("read", "get_squad_roster", (str,)),
+    "caseload": ("read", "get_case_load", ()),
+    "heists": ("read", "get_heist_winners", ()),
+    "search": ("read", "search_evidence", (str,)),
+    "network": ("read", "get_perpetrator_network", ()),
+    "unsolved": ("read", "get_unsolved_cases", ()),
+    "custody": ("read", "get_resource_custody", ()),
+    "bets": ("read", "get_betting_history", ()),
+    "interviews": ("read", "get_interview_logs", ()),
+    "specializations": ("read", "get_detective_specializations", ()),
+    "evidence": ("write", "insert_evidence", (int, str, str, str, int)),
+    "status": ("write", "update_case_status", (int, str)),
+    "dispose": ("write", "delete_resource", (str,)),
+    "case": ("write", "create_new_case", (int, str)),
+    "assign": ("write", "assign_detective", (int, int)),
+    "unassign": ("write", "unassign_detective", (int, int)),
+    "poi": ("write", "add_person_of_interest", (int, str, str)),
+    "perp": ("write", "add_perpetrator_details", (int, int, str)),
+    "promote": ("write", "promote_detective", (int, str)),
+    "transfer": ("write", "transfer_detective", (int, int)),
+    "delete-evidence": ("write", "delete_evidence", (str,)),
+}
+
+# A parsed script line: (line number, command name, converted arguments)
+Command = Tuple[int, str, Tuple]
+
+
+def parse_script(lines: Iterable[str]) -> Tuple[List[Command], List[str]]:
+    """Parses a whole script up front; returns (commands, error messages).
+
+    One command per line, shell-style quoting ('case 901 "Pontiac Bandit"'),
+    blank lines and # comments are ignored.
+    """
+    commands: List[Command] = []
+    errors: List[str] = []
+    for number, raw in enumerate(lines, start=1):
+        try:
+            words = shlex.split(raw, comments=True)
+        except ValueError as e:
+            errors.append(f"line {number}: {e}")
+            continue
+        if not words:
+            continue
+        name, args = words[0].lower(), words[1:]
+        if name not in SCRIPT_COMMANDS:
+            errors.append(f"line {number}: unknown command '{name}'")
+            continue
+        converters = SCRIPT_COMMANDS[name][2]
+        if len(args) != len(converters):
+            errors.append(
+                f"line {number}: '{name}' takes {len(converters)} argument(s), got {len(args)}"
+            )
+            continue
+        try:
+            values = tuple(conv(arg) for conv, arg in zip(converters, args))
+        except ValueError as e:
+            errors.append(f"line {number}: {e}")
+            continue
+        commands.append((number, name, values))
+    return commands, errors
+
+
+def _describe(command: Command) -> str:
+    return " ".join([command[1]] + [str(a) for a in command[2]])
+
+
+def _segments(commands: List[Command]) -> Iterable[Tuple[str, List[Command]]]:
+    """Splits the script into runs of consecutive reads or writes."""
+    run: List[Command] = []
+    kind = None
+    for command in commands:
+        command_kind = SCRIPT_COMMANDS[command[1]][0]
+        if run and command_kind != kind:
+            yield kind, run
+            run = []
+        kind = command_kind
+        run.append(command)
+    if run:
+        yield kind, run
+
+
+class ScriptRunner:
+    """
+    Executes a parsed script against a DatabaseManager.
+
+    Consecutive writes are grouped into chunks that commit as one transaction:
+    each command's statements are captured (not run) and merged, with runs of
+    the same single-statement command sent through `executemany`. A chunk that
+    fails is rolled back and replayed command by command so the failing lines
+    are pinpointed. Consecutive reads can run in parallel on pooled
+    connections; writes always act as a barrier, so reads still see every
+    write that precedes them in the script.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        chunk_size: int = 200,
+        parallel: int = 1,
+        on_read: Optional[Callable[[Command, "pd.DataFrame"], None]] = None,
+    ):
+        self.db = db
+        self.chunk_size = max(chunk_size, 1)
+        self.parallel = max(parallel, 1)
+        self.on_read = on_read
+        self.summary: Dict[str, Any] = {}
+
+    def run(self, commands: List[Command]) -> Dict[str, Any]:
+        self.summary = {
+            "commands": len(commands),
+            "ok": 0,
+            "failed": 0,
+            "reads": [],
+            "chunks": [],
+            "errors": [],
+            "seconds": 0.0,
+        }
+        start = time.perf_counter()
+        for kind, run in _segments(commands):
+            if kind == "read":
+                self._run_reads(run)
+            else:
+                for i in range(0, len(run), self.chunk_size):
+                    self._run_chunk(run[i : i + self.chunk_size])
+        self.summary["seconds"] = round(time.perf_counter() - start, 3)
+        return self.summary
+
+    def _fail(self, command: Command, error: Exception):
+        self.summary["failed"] += 1
+        self.summary["errors"].append(
+            {"line": command[0], "command": _describe(command), "error": str(error)}
+        )
+
+    # ------------------------------------------
+    #  Reads
+    # ------------------------------------------
+
+    def _read(self, command: Command) -> Tuple[Command, Any, float]:
+        start = time.perf_counter()
+        try:
+            method = getattr(self.db, SCRIPT_COMMANDS[command[1]][1])
+            result = method(*command[2])
+        except Exception as e:
+            result = e
+        return command, result, time.perf_counter() - start
+
+    def _run_reads(self, run: List[Command]):
+        if self.parallel > 1 and len(run) > 1:
+            with ThreadPoolExecutor(max_workers=self.parallel) as pool:
+                outcomes = list(pool.map(self._read, run))
+        else:
+            outcomes = [self._read(command) for command in run]
+        # Reported in script order regardless of completion order
+        for command, result, seconds in outcomes:
+            if isinstance(result, Exception):
+                self._fail(command, result)
+                continue
+            self.summary["ok"] += 1
+            self.summary["reads"].append(
+                {
+                    "line": command[0],
+                    "command": _describe(command),
+                    "rows": len(result),
+                    "ms": round(seconds * 1000, 2),
+                }
+            )
+            if self.on_read:
+                self.on_read(command, result)
+
+    # ------------------------------------------
+    #  Writes
+    # ------------------------------------------
+
+    def _run_chunk(self, chunk: List[Command]):
+        start = time.perf_counter()
+        steps: List[Tuple[str, Any]] = []
+        tables: Optional[set] = set()
+        batchable = False  # whether steps[-1] is an executemany group
+        captured: List[Command] = []
+        for command in chunk:
+            method = getattr(self.db, SCRIPT_COMMANDS[command[1]][1])
+            try:
+                command_steps, command_tables = self.db.capture_writes(
+                    lambda: method(*command[2])
+                )
+            except Exception as e:
+                self._fail(command, e)
+                continue
+            captured.append(command)
+            if command_tables is None or tables is None:
+                tables = None
+            else:
+                tables.update(command_tables)
+            single = len(command_steps) == 1 and not isinstance(
+                command_steps[0][1], list
+            )
+            if single and batchable and steps[-1][0] == command_steps[0][0]:
+                steps[-1][1].append(command_steps[0][1])
+            elif single:
+                steps.append((command_steps[0][0], [command_steps[0][1]]))
+                batchable = True
+            else:
+                steps.extend(command_steps)
+                batchable = False
+
+        if not captured:
+            return
+        record = {
+            "lines": [captured[0][0], captured[-1][0]],
+            "commands": len(captured),
+            "statements": len(steps),
+            "affected": 0,
+            "replayed": False,
+        }
+        try:
+            record["affected"] = sum(self.db.execute_transaction(steps, tables))
+            self.summary["ok"] += len(captured)
+        except Exception:
+            # Rolled back as a whole; replay one command per transaction
+            record["replayed"] = True
+            for command in captured:
+                method = getattr(self.db, SCRIPT_COMMANDS[command[1]][1])
+                try:
+                    method(*command[2])
+                    self.summary["ok"] += 1
+                except Exception as e:
+                    self._fail(command, e)
+        record["ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self.summary["chunks"].append(record)
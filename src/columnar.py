@@ -0,0 +1,65 @@
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pymysql.constants import FIELD_TYPE
+
+INTEGER_TYPES = {
+    FIELD_TYPE.TINY,
+    FIELD_TYPE.SHORT,
+    FIELD_TYPE.LONG,
+    FIELD_TYPE.LONGLONG,
+    FIELD_TYPE.INT24,
+    FIELD_TYPE.YEAR,
+}
+FLOAT_TYPES = {FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE}
+DECIMAL_TYPES = {FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL}
+DATETIME_TYPES = {FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP}
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = {"status", "rank", "poi_type"}
+
+
+def _column(values: Tuple[Any, ...], type_code: int, scale: Optional[int], name: str):
+    """Converts one column of raw values into a typed array."""
+    has_null = None in values
+    if type_code in INTEGER_TYPES or (type_code in DECIMAL_TYPES and scale == 0):
+        # SUM()/COUNT() over integers come back as DECIMAL(n, 0)
+        if type_code in DECIMAL_TYPES:
+            values = tuple(None if v is None else int(v) for v in values)
+        if not has_null:
+            return np.fromiter(values, dtype=np.int64, count=len(values))
+        return pd.array(values, dtype="Int64")
+    if type_code in FLOAT_TYPES:
+        return np.array(values, dtype=np.float64)  # None becomes NaN
+    if type_code in DATETIME_TYPES:
+        return pd.to_datetime(values)  # None becomes NaT
+    if name in CATEGORICAL_COLUMNS:
+        return pd.Categorical(values)
+    if type_code in DECIMAL_TYPES:
+        return np.array(values, dtype=object)  # keep exact Decimal values
+    return list(values)
+
+
+def build_frame(
+    description: Optional[Sequence[Tuple]], rows: List[Tuple]
+) -> pd.DataFrame:
+    """Builds a DataFrame straight from tuple rows and a DB-API cursor description.
+
+    Rows are transposed into one array per column with the dtype implied by
+    the MySQL column type, instead of creating a dict per row and letting
+    pandas infer dtypes from Python objects.
+    """
+    if not description:
+        return pd.DataFrame()
+    names = [col[0] for col in description]
+    if not rows:
+        return pd.DataFrame(columns=names)
+    # Keyed by position so duplicate labels (e.g. from a join) survive
+    data = {
+        i: _column(values, col[1], col[5], col[0])
+        for i, (col, values) in enumerate(zip(description, zip(*rows)))
+    }
+    frame = pd.DataFrame(data, copy=False)
+    frame.columns = names
+    return frame
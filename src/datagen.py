@@ -0,0 +1,489 @@
+"""
+Deterministic synthetic data generator for mini_world_db.
+
+Produces referentially consistent rows for every table in schema.sql at a
+configurable scale factor, writes them as tab-separated shard files, and bulk
+loads them with parallel LOAD DATA LOCAL INFILE connections.
+
+    uv run python src/datagen.py generate --scale 10 --out data/
+    uv run python src/datagen.py load --out data/ --workers 8
+"""
+
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pymysql
+
+from db_utils import (
+    ARCHIVE_TABLES,
+    DatabaseManager,
+    add_connection_args,
+    config_from_args,
+)
+
+BASE_TIME = 1_262_304_000  # 2010-01-01 00:00:00 UTC
+
+# Row counts at scale 1.0; --scale multiplies every entity count.
+BASE_COUNTS = {
+    "squads": 100,
+    "detectives": 10_000,
+    "cases": 100_000,
+    "resources": 5_000,
+    "heists": 50,
+    "persons": 200_000,
+    "evidence": 1_000_000,
+    "case_updates": 500_000,
+    "bets": 100_000,
+}
+
+# Table -> column list, in schema.sql order (also the LOAD DATA column order)
+COLUMNS = {
+    "Squad": ["squad_id", "squad_name", "shift"],
+    "Detective": ["badge_no", "first_name", "last_name", "`rank`", "squad_id"],
+    "Case_File": ["case_id", "case_title", "status"],
+    "Precinct_Resource": ["asset_tag", "item_name"],
+    "Halloween_Heist": ["heist_year", "objective_item", "winner_id"],
+    "Person_Of_Interest": ["person_id", "name", "poi_type"],
+    "Perpetrator": ["perp_id", "person_id", "primary_alias"],
+    "Confidential_Informant": ["person_id"],
+    "Detective_Specialization": ["badge_no", "specialization"],
+    "Perpetrator_Known_Associate": ["perp_id", "associate_name"],
+    "Evidence_Log": [
+        "case_id",
+        "evidence_tag",
+        "description",
+        "logged_by_id",
+        "storage_location",
+    ],
+    "Case_Update": ["case_id", "update_timestamp", "entry_text", "detective_id"],
+    "Bet_Ledger": [
+        "defendant_id",
+        "bet_timestamp",
+        "challenger_id",
+        "stake",
+        "outcome",
+    ],
+    "Assigned_To": ["badge_no", "case_id"],
+    "Targets": ["perp_id", "case_id"],
+    "Custodian_Of": ["badge_no", "asset_tag"],
+    "Records_Interview": ["badge_no", "perp_id", "case_id"],
+    "Documents_Heist_Participation": ["badge_no", "heist_year", "role"],
+}
+
+FIRST = "Jake Amy Rosa Terry Charles Gina Raymond Norm Michael Kevin Adrian Doug Sophia Keith Madeline".split()
+LAST = "Peralta Santiago Diaz Jeffords Boyle Linetti Holt Scully Hitchcock Cozner Pimento Judy Perkins Wuntch".split()
+WORDS = "key wrapper bandit pontiac oolong safe glove receipt phone badge ring map ledger van knife photo laptop cupcake tiara wallet camera note".split()
+SPECIALIZATIONS = "Homicide Narcotics Cyber Robbery Vice Forensics Undercover Fraud K9 Negotiation".split()
+RANKS = (
+    ["Detective", "Sergeant", "Lieutenant", "Captain", "Officer"],
+    [70, 12, 5, 2, 11],
+)
+STATUSES = (["Open", "Closed", "Cold"], [30, 60, 10])
+
+Row = Tuple
+
+
+def scaled_counts(scale: float) -> Dict[str, int]:
+    return {k: max(1, int(v * scale)) for k, v in BASE_COUNTS.items()}
+
+
+class Zipf:
+    """Skewed sampler over ids 1..n (id 1 is the hottest)."""
+
+    def __init__(self, n: int, skew: float):
+        self.n = n
+        self.cum = list(itertools.accumulate(1.0 / (r**skew) for r in range(1, n + 1)))
+        self.ids = range(1, n + 1)
+
+    def sample(self, rng: random.Random, k: int = 1) -> List[int]:
+        return rng.choices(self.ids, cum_weights=self.cum, k=k)
+
+    def distinct(self, rng: random.Random, k: int) -> List[int]:
+        k = min(k, self.n)
+        picked = set()
+        while len(picked) < k:
+            picked.update(self.sample(rng, k - len(picked)))
+        return list(picked)
+
+
+def _text(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choices(WORDS, k=n))
+
+
+def _ts(seconds: int) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(BASE_TIME + seconds))
+
+
+def _badge(i: int) -> int:
+    return 10_000 + i
+
+
+# ==========================================
+#  TABLE GENERATORS
+#  Each yields rows for ids in [lo, hi) using only its own RNG, so every
+#  (table, shard) task is reproducible and can run in any process.
+# ==========================================
+
+
+def gen_entities(rng, counts, lo, hi, table) -> Iterator[Row]:
+    n_det = counts["detectives"]
+    n_perps = counts["persons"] // 2
+    if table == "Squad":
+        for i in range(lo, hi):
+            yield (
+                i,
+                f"Squad {i:05d} - {rng.choice(LAST)}",
+                rng.choice(["Day", "Night", "Swing"]),
+            )
+    elif table == "Detective":
+        squads = Zipf(counts["squads"], 0.8)
+        for i in range(lo, hi):
+            rank = rng.choices(*RANKS)[0]
+            yield (
+                _badge(i),
+                rng.choice(FIRST),
+                rng.choice(LAST),
+                rank,
+                squads.sample(rng)[0],
+            )
+    elif table == "Case_File":
+        for i in range(lo, hi):
+            title = f"The {rng.choice(WORDS).title()} {rng.choice(WORDS).title()} #{i}"
+            yield (i, title, rng.choices(*STATUSES)[0])
+    elif table == "Precinct_Resource":
+        for i in range(lo, hi):
+            yield (f"RES-{i:07d}", f"{rng.choice(WORDS).title()} Unit {i}")
+    elif table == "Halloween_Heist":
+        dets = Zipf(n_det, 1.1)
+        for i in range(lo, hi):
+            yield (
+                1900 + i,
+                f"The {rng.choice(WORDS).title()}",
+                _badge(dets.sample(rng)[0]),
+            )
+    elif table == "Person_Of_Interest":
+        for i in range(lo, hi):
+            kind = "Perpetrator" if i <= n_perps else rng.choice(["Witness", "Victim"])
+            yield (i, f"{rng.choice(FIRST)} {rng.choice(LAST)}", kind)
+    elif table == "Perpetrator":
+        for i in range(lo, min(hi, n_perps + 1)):
+            yield (i, i, f"The {rng.choice(WORDS).title()}")
+    elif table == "Confidential_Informant":
+        for i in range(max(lo, n_perps + 1), hi):
+            if i % 20 == 0:
+                yield (i,)
+    elif table == "Detective_Specialization":
+        for i in range(lo, hi):
+            for spec in rng.sample(SPECIALIZATIONS, rng.randint(1, 3)):
+                yield (_badge(i), spec)
+    elif table == "Perpetrator_Known_Associate":
+        for i in range(lo, min(hi, n_perps + 1)):
+            names = {
+                f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+                for _ in range(rng.randint(0, 3))
+            }
+            for name in sorted(names):
+                yield (i, name)
+    elif table == "Custodian_Of":
+        dets = Zipf(n_det, 1.0)
+        for i in range(lo, hi):
+            if rng.random() < 0.7:
+                yield (_badge(dets.sample(rng)[0]), f"RES-{i:07d}")
+    elif table == "Documents_Heist_Participation":
+        dets = Zipf(n_det, 1.1)
+        for i in range(lo, hi):
+            for badge in dets.distinct(rng, rng.randint(5, 15)):
+                yield (
+                    _badge(badge),
+                    1900 + i,
+                    rng.choice(["Contestant", "Judge", "Accomplice"]),
+                )
+
+
+def gen_events(rng, counts, lo, hi, table) -> Iterator[Row]:
+    """Large time-keyed / log tables with skewed case and detective choice."""
+    cases = Zipf(counts["cases"], 1.05)
+    dets = Zipf(counts["detectives"], 1.0)
+    batch = 10_000
+    for start in range(lo, hi, batch):
+        end = min(start + batch, hi)
+        case_ids = cases.sample(rng, end - start)
+        badges = dets.sample(rng, end - start)
+        for i, case_id, badge in zip(range(start, end), case_ids, badges):
+            if table == "Evidence_Log":
+                yield (
+                    case_id,
+                    f"EV-{i:09d}",
+                    _text(rng, rng.randint(3, 12)),
+                    _badge(badge),
+                    f"Locker {rng.randint(1, 500)}",
+                )
+            elif table == "Case_Update":
+                # One-second spacing per global row keeps (case_id, ts) unique
+                yield (case_id, _ts(i), _text(rng, rng.randint(5, 20)), _badge(badge))
+            elif table == "Bet_Ledger":
+                challenger = dets.sample(rng)[0]
+                if challenger == badge:
+                    challenger = badge % counts["detectives"] + 1
+                yield (
+                    _badge(badge),
+                    _ts(i),
+                    _badge(challenger),
+                    f"{rng.randint(1, 500)} dollars",
+                    rng.choice(["Won", "Lost", "Pending"]),
+                )
+
+
+def gen_case_edges(rng, counts, lo, hi, density: float) -> Dict[str, List[Row]]:
+    """Assigned_To, Targets and Records_Interview for cases [lo, hi).
+
+    Interviews only pair detectives assigned to the case with perps that
+    target it, so the three relationship tables stay mutually consistent.
+    """
+    dets = Zipf(counts["detectives"], 1.0)
+    perps = Zipf(counts["persons"] // 2, 0.9)
+    out: Dict[str, List[Row]] = {
+        "Assigned_To": [],
+        "Targets": [],
+        "Records_Interview": [],
+    }
+    for case_id in range(lo, hi):
+        team = dets.distinct(
+            rng, max(1, int(rng.choice([1, 1, 2, 2, 3, 4, 6]) * density))
+        )
+        out["Assigned_To"].extend((_badge(b), case_id) for b in team)
+        suspects = perps.distinct(rng, rng.randint(0, max(1, int(3 * density))))
+        for perp in suspects:
+            out["Targets"].append((perp, case_id))
+            for b in rng.sample(team, min(len(team), rng.randint(1, 2))):
+                out["Records_Interview"].append((_badge(b), perp, case_id))
+    return out
+
+
+# ==========================================
+#  FILE OUTPUT
+# ==========================================
+
+ENTITY_TABLES = {
+    "Squad": "squads",
+    "Detective": "detectives",
+    "Case_File": "cases",
+    "Precinct_Resource": "resources",
+    "Halloween_Heist": "heists",
+    "Person_Of_Interest": "persons",
+    "Perpetrator": "persons",
+    "Confidential_Informant": "persons",
+    "Detective_Specialization": "detectives",
+    "Perpetrator_Known_Associate": "persons",
+    "Custodian_Of": "resources",
+    "Documents_Heist_Participation": "heists",
+}
+EVENT_TABLES = {
+    "Evidence_Log": "evidence",
+    "Case_Update": "case_updates",
+    "Bet_Ledger": "bets",
+}
+
+
+def _encode(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, int):
+        return str(value)
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _write(path: str, rows) -> int:
+    n = 0
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        for row in rows:
+            f.write("\t".join(_encode(v) for v in row))
+            f.write("\n")
+            n += 1
+    return n
+
+
+def _shards(n: int, rows_per_shard: int) -> List[Tuple[int, int, int]]:
+    """Splits ids 1..n into (shard, lo, hi) ranges."""
+    count = max(1, math.ceil(n / rows_per_shard))
+    step = math.ceil(n / count)
+    return [(s, 1 + s * step, min(n, (s + 1) * step) + 1) for s in range(count)]
+
+
+def _run_task(task) -> List[Tuple[str, int]]:
+    kind, table, shard, lo, hi, counts, seed, density, out_dir = task
+    rng = random.Random(f"{seed}:{table}:{shard}")
+    if kind == "edges":
+        written = []
+        for name, rows in gen_case_edges(rng, counts, lo, hi, density).items():
+            written.append(
+                (name, _write(os.path.join(out_dir, f"{name}.{shard:04d}.tsv"), rows))
+            )
+        return written
+    gen = gen_entities if kind == "entity" else gen_events
+    path = os.path.join(out_dir, f"{table}.{shard:04d}.tsv")
+    return [(table, _write(path, gen(rng, counts, lo, hi, table)))]
+
+
+def generate(
+    out_dir: str,
+    scale: float = 1.0,
+    seed: int = 82,
+    density: float = 1.0,
+    workers: int = os.cpu_count() or 2,
+    rows_per_shard: int = 250_000,
+) -> Dict[str, int]:
+    """Writes every table as TSV shards under `out_dir`; returns row counts."""
+    os.makedirs(out_dir, exist_ok=True)
+    for name in os.listdir(out_dir):
+        if name.endswith(".tsv"):
+            os.remove(os.path.join(out_dir, name))
+    counts = scaled_counts(scale)
+
+    tasks = []
+    for table, key in ENTITY_TABLES.items():
+        for shard, lo, hi in _shards(counts[key], rows_per_shard):
+            tasks.append(
+                ("entity", table, shard, lo, hi, counts, seed, density, out_dir)
+            )
+    for table, key in EVENT_TABLES.items():
+        for shard, lo, hi in _shards(counts[key], rows_per_shard):
+            tasks.append(
+                ("event", table, shard, lo, hi, counts, seed, density, out_dir)
+            )
+    for shard, lo, hi in _shards(counts["cases"], rows_per_shard // 4):
+        tasks.append(("edges", "edges", shard, lo, hi, counts, seed, density, out_dir))
+
+    totals: Dict[str, int] = {t: 0 for t in COLUMNS}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for written in pool.map(_run_task, tasks):
+            for table, n in written:
+                totals[table] += n
+    return totals
+
+
+# ==========================================
+#  BULK LOADER
+# ==========================================
+
+
+def _load_file(config: Dict[str, str], table: str, path: str) -> int:
+    conn = pymysql.connect(
+        host=config["host"],
+        user=config["user"],
+        password=config["password"],
+        database=config["database"],
+        local_infile=True,
+        autocommit=False,
+    )
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+                f"CHARACTER SET utf8mb4 ({', '.join(COLUMNS[table])})",
+                (os.path.abspath(path),),
+            )
+            rows = cursor.rowcount
+        conn.commit()
+        return rows
+    finally:
+        conn.close()
+
+
+def load(
+    config: Dict[str, str], out_dir: str, workers: int = 4, truncate: bool = True
+) -> Dict[str, int]:
+    """Loads every shard in `out_dir` with `workers` parallel connections.
+
+    Foreign-key and unique checks are disabled per session: the generator
+    already guarantees referential integrity and key uniqueness.
+    """
+    files = sorted(f for f in os.listdir(out_dir) if f.endswith(".tsv"))
+    if truncate:
+        conn = pymysql.connect(**config)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SET SESSION foreign_key_checks = 0")
+                for table in COLUMNS:
+                    cursor.execute(f"TRUNCATE TABLE {table}")
+                # Archived cases would collide with the generated case ids
+                for table in ARCHIVE_TABLES.values():
+                    try:
+                        cursor.execute(f"TRUNCATE TABLE {table}")
+                    except pymysql.err.ProgrammingError:
+                        pass  # migration 0005 not applied yet
+        finally:
+            conn.close()
+
+    totals: Dict[str, int] = {}
+    jobs = [(f.split(".")[0], os.path.join(out_dir, f)) for f in files]
+    # Biggest files first so the long loads start early
+    jobs.sort(key=lambda job: os.path.getsize(job[1]), reverse=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            (table, pool.submit(_load_file, config, table, path))
+            for table, path in jobs
+        ]
+        for table, future in futures:
+            totals[table] = totals.get(table, 0) + future.result()
+
+    # Derived tables are rebuilt from the loaded rows
+    db = DatabaseManager(config, log_file=None, use_cache=False)
+    db.rebuild_case_load()
+    db.refresh_activity_buckets(full=True, wait=60)
+    return totals
+
+
+def _print_counts(title: str, counts: Dict[str, int], elapsed: float):
+    print(f"{title} in {elapsed:.1f}s")
+    for table, n in counts.items():
+        print(f"  {table:<32}{n:>14,}")
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Synthetic data for mini_world_db.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Write TSV shards")
+    gen.add_argument("--out", default="data")
+    gen.add_argument(
+        "--scale", type=float, default=1.0, help="Multiplies every row count"
+    )
+    gen.add_argument("--seed", type=int, default=82)
+    gen.add_argument(
+        "--density", type=float, default=1.0, help="Relationship edges per case"
+    )
+    gen.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+
+    ld = sub.add_parser("load", help="LOAD DATA LOCAL INFILE the shards")
+    ld.add_argument("--out", default="data")
+    ld.add_argument("--workers", type=int, default=4)
+    ld.add_argument("--no-truncate", action="store_true")
+    add_connection_args(ld)
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    if args.command == "generate":
+        counts = generate(args.out, args.scale, args.seed, args.density, args.workers)
+        _print_counts("Generated", counts, time.perf_counter() - start)
+    else:
+        try:
+            counts = load(
+                config_from_args(args), args.out, args.workers, not args.no_truncate
+            )
+        except pymysql.Error as e:
+            print(f"Load failed: {e}")
+            sys.exit(1)
+        _print_counts("Loaded", counts, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import atexit
+import collections
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import pymysql
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out before the timeout."""
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of PyMySQL connections.
+
+    Connections are validated on checkout (ping after idling, recycle after a
+    maximum age) and a thread that already holds a connection gets the same one
+    back, so nested DatabaseManager calls never deadlock the pool.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, str],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 10.0,
+        recycle: float = 1800.0,
+        ping_interval: float = 30.0,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size >= 1")
+        self.config = config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition()
+        self._idle = collections.deque()  # (connection, last_used)
+        self._created: Dict[int, float] = {}  # id(connection) -> creation time
+        self._size = 0
+        self._closed = False
+        self._local = threading.local()
+        self.waits = 0
+        self.wait_time = 0.0
+
+        for _ in range(min_size):
+            self._size += 1
+            self._idle.append((self._open(), time.monotonic()))
+
+    def _open(self):
+        """Opens a new physical connection for an already reserved slot."""
+        conn = pymysql.connect(
+            host=self.config["host"],
+            user=self.config["user"],
+            password=self.config["password"],
+            database=self.config["database"],
+            cursorclass=pymysql.cursors.DictCursor,
+            autocommit=True,
+        )
+        self._created[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn):
+        """Closes a physical connection and frees its slot."""
+        self._created.pop(id(conn), None)
+        self._size -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, conn, last_used: float) -> bool:
+        """Recycles old connections and pings ones that sat idle for a while."""
+        now = time.monotonic()
+        if now - self._created.get(id(conn), now) > self.recycle:
+            return False
+        if now - last_used > self.ping_interval:
+            try:
+                conn.ping(reconnect=False)
+            except pymysql.Error:
+                return False
+        return conn.open
+
+    def acquire(self):
+        """Checks out a connection, waiting up to `timeout` seconds for one."""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolTimeoutError("Connection pool is closed.")
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        # Reserve the slot, then handshake outside the lock
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"No connection available after {self.timeout:.1f}s "
+                            f"(max_size={self.max_size})."
+                        )
+                    self._cond.wait(remaining)
+
+            if conn is None:
+                break
+            # The connection is ours now; a ping must not stall other threads
+            if self._is_usable(conn, last_used):
+                self._record_wait(start)
+                return conn
+            with self._cond:
+                self._discard(conn)
+                self._cond.notify()
+
+        try:
+            conn = self._open()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self._record_wait(start)
+        return conn
+
+    def _record_wait(self, start: float):
+        with self._cond:
+            self.waits += 1
+            self.wait_time += time.monotonic() - start
+
+    def release(self, conn):
+        """Returns a connection to the pool, dropping it if it is broken."""
+        with self._cond:
+            if self._closed or not conn.open:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Borrows a connection for the current thread (re-entrant)."""
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self.acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self.release(conn)
+
+    def close(self):
+        """Closes every idle connection; checked-out ones close on release."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, float]:
+        """Returns a snapshot of pool occupancy and checkout wait time."""
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+                "checkouts": self.waits,
+                "avg_wait_ms": (
+                    (self.wait_time / self.waits * 1000) if self.waits else 0.0
+                ),
+            }
+
+
+# ==========================================
+#  PROCESS-WIDE POOL REGISTRY
+# ==========================================
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(config: Dict[str, str]) -> Tuple:
+    return (config["host"], config["user"], config["password"], config["database"])
+
+
+def get_pool(config: Dict[str, str], **pool_options) -> ConnectionPool:
+    """Returns the shared pool for `config`, creating it on first use."""
+    key = _pool_key(config)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(config, **pool_options)
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools(config: Optional[Dict[str, str]] = None):
+    """Closes the pool for `config`, or every pool in the process."""
+    with _pools_lock:
+        keys = [_pool_key(config)] if config else list(_pools)
+        for key in keys:
+            pool = _pools.pop(key, None)
+            if pool is not None:
+                pool.close()
+
+
+atexit.register(close_all_pools)
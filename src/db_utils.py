@@ -1,9 +1,112 @@
+from __future__ import annotations
+
+import argparse
+import contextvars
 import datetime
-from typing import Dict, Optional, Tuple
+import getpass
+import random
+import re
+import time
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-import pandas as pd
 import pymysql
 
+from change_feed import ChangeFeed, get_change_feed
+from db_pool import ConnectionPool, get_pool
+from graph_index import GraphIndex, NodeKey, get_graph_index
+from local_replica import LocalReplica, get_local_replica
+from metrics import REGISTRY, current_operation, operation
+from query_cache import ResultCache, get_result_cache
+from slow_queries import ROWS_EXAMINED_SQL, SlowQueryLog, get_slow_query_log, summarize
+from sql_logger import SQLLogWriter, get_sql_logger
+from transactions import (
+    Transaction,
+    active_transaction,
+    is_retryable,
+    set_active_transaction,
+)
+
+if TYPE_CHECKING:
+    # pandas (and columnar, which needs it) are imported on first use so
+    # tools that only stream rows, like the CLI, start quickly
+    import pandas as pd
+
+# Case_File plus every table whose rows cascade-delete with a case
+CASE_TABLES = (
+    "Case_File",
+    "Evidence_Log",
+    "Case_Update",
+    "Assigned_To",
+    "Targets",
+    "Records_Interview",
+)
+
+# Archive copy of each case table (same columns plus archived_at); see
+# archive_closed_cases()
+ARCHIVE_TABLES = {table: f"{table}_Archive" for table in CASE_TABLES}
+_CASE_TABLE_NAMES = re.compile(r"\b(" + "|".join(CASE_TABLES) + r")\b")
+
+# Full-text search input: boolean operators (a "-" only counts at the start of
+# a word), and words with inner hyphens such as evidence codes ("EV-999")
+_BOOLEAN_OPERATORS = re.compile(r'["+*~<>()@]|(?:^|\s)-')
+_HYPHENATED = re.compile(r"\b\w+(?:-\w+)+\b\*?")
+
+
+class _Captured(Exception):
+    """Stops a read operation once capture_query() has its result query."""
+
+
+class _Capture:
+    """Statements collected by capture_query()/capture_writes() instead of running."""
+
+    def __init__(self):
+        self.reads: List[Tuple[str, Optional[Tuple]]] = []
+        self.steps: List[Tuple[str, Any]] = []
+        self.tables: Optional[set] = set()
+
+    def add_writes(self, steps: List[Tuple[str, Any]], tables: Optional[Iterable[str]]):
+        self.steps.extend(steps)
+        if tables is None:
+            self.tables = None
+        elif self.tables is not None:
+            self.tables.update(tables)
+
+
+# Set while a capture is collecting statements instead of running them
+_capture: contextvars.ContextVar = contextvars.ContextVar("capture", default=None)
+
+
+def add_connection_args(parser: argparse.ArgumentParser):
+    """Adds the standard --host/--user/--password/--database options to a tool."""
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="detective")
+    parser.add_argument("--database", default="mini_world_db")
+    parser.add_argument("--password", default=None, help="Prompted for if omitted")
+
+
+def config_from_args(args: argparse.Namespace) -> Dict[str, str]:
+    """Builds a connection config from add_connection_args() options."""
+    password = args.password
+    if password is None:
+        password = getpass.getpass("Password [default: ******]: ") or "Team82"
+    return {
+        "host": args.host,
+        "user": args.user,
+        "password": password,
+        "database": args.database,
+    }
+
 
 class DatabaseManager:
     """
@@ -11,42 +114,87 @@ class DatabaseManager:
     Strictly avoids ORMs to meet Phase 4 requirements.
     """
 
-    def __init__(self, config: Dict[str, str], verbose: bool = False):
+    def __init__(
+        self,
+        config: Dict[str, str],
+        verbose: bool = False,
+        pool_options: Optional[Dict] = None,
+        log_file: Optional[str] = "sql_commands.log",
+        log_options: Optional[Dict] = None,
+        use_cache: bool = False,
+        cache_options: Optional[Dict] = None,
+        use_replica: bool = False,
+        replica_options: Optional[Dict] = None,
+        use_slow_log: bool = False,
+        slow_log_options: Optional[Dict] = None,
+    ):
         self.config = config
-        self.connection = None
-        self.log_file = "sql_commands.log"
+        self.pool: Optional[ConnectionPool] = None
+        self.pool_options = pool_options or {}
+        self.log_file = log_file
+        self.sql_log: Optional[SQLLogWriter] = (
+            get_sql_logger(log_file, **(log_options or {})) if log_file else None
+        )
         self.verbose = verbose
+        self._fulltext_available: Optional[bool] = None
+        self.cache: Optional[ResultCache] = (
+            get_result_cache(config, **(cache_options or {})) if use_cache else None
+        )
+        self.changes: ChangeFeed = get_change_feed(config)
+        self.graph: GraphIndex = get_graph_index(config)
+        self.replica: Optional[LocalReplica] = (
+            get_local_replica(config, **(replica_options or {}))
+            if use_replica
+            else None
+        )
+        self.slow_log: Optional[SlowQueryLog] = (
+            get_slow_query_log(config, **(slow_log_options or {}))
+            if use_slow_log
+            else None
+        )
+        self._case_columns: Dict[str, str] = {}  # case table -> its select list
 
     def connect(self):
-        """Establishes a connection to the MySQL database."""
+        """Attaches to the process-wide connection pool for this config.
+
+        Cheap to call repeatedly (e.g. on every Streamlit rerun): the pool and
+        its connections are created once per process and reused afterwards.
+        """
+        if self.pool is not None:
+            return True, "Connected successfully."
         try:
-            self.connection = pymysql.connect(
-                host=self.config["host"],
-                user=self.config["user"],
-                password=self.config["password"],
-                database=self.config["database"],
-                cursorclass=pymysql.cursors.DictCursor,
-                autocommit=True,
-            )
+            self.pool = get_pool(self.config, **self.pool_options)
             return True, "Connected successfully."
         except pymysql.Error as e:
             return False, f"Connection failed: {e}"
 
     def close(self):
-        """Closes the connection if open."""
-        if self.connection:
-            self.connection.close()
+        """Detaches from the shared pool (other users keep their connections)."""
+        self.pool = None
+
+    def _get_pool(self) -> ConnectionPool:
+        """Returns the pool, connecting lazily on first use."""
+        if self.pool is None:
+            success, msg = self.connect()
+            if not success:
+                raise Exception(msg)
+        return self.pool
+
+    def _in_transaction(self) -> Optional[Transaction]:
+        """The unit of work this thread has open on the pool, if any."""
+        return active_transaction(self.pool) if self.pool is not None else None
 
     def _log_query(self, cursor, query: str, params: Optional[Tuple]):
-        """Logs the executed SQL command to a file and optionally prints to console."""
+        """Queues the executed SQL command for the log writer and optionally prints it."""
+        if self.sql_log is None and not self.verbose:
+            return
         try:
             # mogrify returns the exact string that was executed (params substituted)
             executed_sql = cursor.mogrify(query, params)
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            # 1. Write to Log File
-            with open(self.log_file, "a") as f:
-                f.write(f"[{timestamp}] {executed_sql};\n")
+            # 1. Hand off to the background log writer (no disk I/O here)
+            if self.sql_log is not None:
+                self.sql_log.write(executed_sql)
 
             # 2. Print to Console if Verbose
             if self.verbose:
@@ -55,154 +203,1506 @@ class DatabaseManager:
         except Exception as e:
             print(f"Logging failed: {e}")
 
-    def execute_query(self, query: str, params: Optional[Tuple] = None) -> pd.DataFrame:
-        """Executes a SELECT query and returns results as a Pandas DataFrame."""
-        if not self.connection or not self.connection.open:
-            self.connect()
+    def execute_query(
+        self,
+        query: str,
+        params: Optional[Tuple] = None,
+        tables: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """Executes a SELECT query and returns results as a Pandas DataFrame.
+
+        Passing `tables` (the tables the query reads) makes the result
+        cacheable (use_cache=True) until a write touches one of them, and lets
+        the local replica (use_replica=True) answer it instead of the server.
+        Only writes made through this process invalidate the cache; changes
+        from other processes show up once the cached result's TTL expires.
+        """
+        capture = _capture.get()
+        if capture is not None and tables is not None:
+            capture.reads.append((query, params))
+            raise _Captured()
 
+        op = current_operation.get() or "execute_query"
+        key = None
+        # Inside a unit of work reads may see uncommitted rows: never cache them
+        if tables is not None and self.cache is not None and not self._in_transaction():
+            key = ResultCache.make_key(query, params)
+            cached = self.cache.get(key)
+            if cached is not None:
+                REGISTRY.record_cache_hit(op)
+                return cached
+            # A write landing while this read runs must keep it out of the cache
+            generation = self.cache.generation()
+
+        start = time.perf_counter()
+        # Reads that name their tables can be served by the local replica
+        if (
+            self.replica is not None
+            and tables is not None
+            and not self._in_transaction()
+        ):
+            served = self.replica.query(self, query, params, tables)
+            if served is not None:
+                from columnar import build_frame
+
+                frame = build_frame(*served)
+                REGISTRY.record(
+                    op,
+                    time.perf_counter() - start,
+                    rows=len(frame),
+                    nbytes=int(frame.memory_usage(index=False, deep=True).sum()),
+                )
+                if key is not None:
+                    self.cache.put(key, frame, tables, generation)
+                return frame
+
+        wait = 0.0
+        try:
+            with self._get_pool().connection() as conn:
+                wait = time.perf_counter() - start
+                # Tuple rows go straight into typed columns (no per-row dicts)
+                with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                    self._log_query(
+                        cursor, query, params
+                    )  # Log before or after execution
+                    cursor.execute(query, params)
+                    description, rows = cursor.description, cursor.fetchall()
+                    self._check_slow(conn, cursor, query, params, start + wait)
+            from columnar import build_frame
+
+            frame = build_frame(description, rows)
+        except pymysql.Error as e:
+            REGISTRY.record(op, time.perf_counter() - start, wait, error=True)
+            raise Exception(f"Query Error: {e}")
+        REGISTRY.record(
+            op,
+            time.perf_counter() - start,
+            wait,
+            rows=len(frame),
+            nbytes=int(frame.memory_usage(index=False, deep=True).sum()),
+        )
+
+        if key is not None:
+            self.cache.put(key, frame, tables, generation)
+        return frame
+
+    def fetch_value(self, query: str, params: Optional[Tuple] = None) -> Any:
+        """Returns the first column of the first row (None if there is none)."""
         try:
-            with self.connection.cursor() as cursor:
-                self._log_query(cursor, query, params)  # Log before or after execution
-                cursor.execute(query, params)
-                result = cursor.fetchall()
-                return pd.DataFrame(result)
+            with self._get_pool().connection() as conn:
+                with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                    self._log_query(cursor, query, params)
+                    cursor.execute(query, params)
+                    row = cursor.fetchone()
         except pymysql.Error as e:
             raise Exception(f"Query Error: {e}")
+        return row[0] if row else None
+
+    def execute_update(
+        self,
+        query: str,
+        params: Optional[Tuple] = None,
+        tables: Optional[Iterable[str]] = None,
+    ) -> str:
+        """Executes INSERT, UPDATE, or DELETE queries.
+
+        `tables` lists every table the statement modifies (including
+        ON DELETE CASCADE children); cached reads of those tables are dropped.
+        Without it the whole result cache is invalidated.
+        """
+        capture = _capture.get()
+        if capture is not None:
+            capture.add_writes([(query, params)], tables)
+            return "Success: 0 row(s) affected."
+
+        op = current_operation.get() or "execute_update"
+        start = time.perf_counter()
+        wait = 0.0
+        try:
+            with self._get_pool().connection() as conn:
+                wait = time.perf_counter() - start
+                with conn.cursor() as cursor:
+                    self._log_query(cursor, query, params)
+                    cursor.execute(query, params)
+                    rowcount = cursor.rowcount
+                    self._check_slow(conn, cursor, query, params, start + wait)
+            REGISTRY.record(op, time.perf_counter() - start, wait, rows=rowcount)
+        except pymysql.Error as e:
+            REGISTRY.record(op, time.perf_counter() - start, wait, error=True)
+            raise Exception(f"Update Error: {e}")
+        finally:
+            self._tables_changed(tables)
+        return f"Success: {rowcount} row(s) affected."
+
+    def execute_batch(
+        self,
+        query: str,
+        rows: Iterable[Tuple],
+        tables: Optional[Iterable[str]] = None,
+        chunk_size: int = 500,
+    ) -> Dict[str, Any]:
+        """Executes one INSERT/UPDATE/DELETE for many parameter rows.
+
+        Rows are sent with `executemany` (PyMySQL rewrites INSERT ... VALUES
+        into multi-row inserts) and committed once per chunk. If a chunk fails,
+        it is rolled back and replayed row by row so the good rows still land
+        and each bad row is reported as (row_index, error).
+        """
+        capture = _capture.get()
+        if capture is not None:
+            rows = [tuple(row) for row in rows]
+            capture.add_writes([(query, rows)], tables)
+            return {"rows": len(rows), "affected": 0, "errors": []}
+
+        op = current_operation.get() or "execute_batch"
+        result: Dict[str, Any] = {"rows": 0, "affected": 0, "errors": []}
+        start = time.perf_counter()
+        wait = 0.0
+        try:
+            with self._get_pool().connection() as conn:
+                wait = time.perf_counter() - start
+                chunk: List[Tuple] = []
+                for row in rows:
+                    chunk.append(tuple(row))
+                    if len(chunk) >= chunk_size:
+                        self._run_chunk(conn, query, chunk, result)
+                        chunk = []
+                if chunk:
+                    self._run_chunk(conn, query, chunk, result)
+            REGISTRY.record(
+                op, time.perf_counter() - start, wait, rows=result["affected"]
+            )
+        except pymysql.Error as e:
+            REGISTRY.record(op, time.perf_counter() - start, wait, error=True)
+            raise Exception(f"Update Error: {e}")
+        finally:
+            self._tables_changed(tables)
+        return result
 
-    def execute_update(self, query: str, params: Optional[Tuple] = None) -> str:
-        """Executes INSERT, UPDATE, or DELETE queries."""
-        if not self.connection or not self.connection.open:
-            self.connect()
+    def _run_chunk(self, conn, query: str, chunk: List[Tuple], result: Dict):
+        """Commits one chunk, falling back to per-row execution on error.
 
+        Only rows that were committed are logged, so the SQL log (and a replay
+        of it) never contains statements that were rolled back or failed.
+        """
+        start = result["rows"]
+        result["rows"] += len(chunk)
         try:
-            with self.connection.cursor() as cursor:
+            with self._atomic(conn):
+                with conn.cursor() as cursor:
+                    cursor.executemany(query, chunk)
+                    affected = cursor.rowcount
+            result["affected"] += affected
+            self._log_rows(conn, query, chunk)
+            return
+        except pymysql.Error:
+            pass
+
+        done: List[Tuple] = []
+        with self._atomic(conn):
+            with conn.cursor() as cursor:
+                for offset, params in enumerate(chunk):
+                    try:
+                        cursor.execute(query, params)
+                        result["affected"] += cursor.rowcount
+                        done.append(params)
+                    except pymysql.Error as e:
+                        result["errors"].append((start + offset, str(e)))
+        self._log_rows(conn, query, done)
+
+    def _log_rows(self, conn, query: str, rows: List[Tuple]):
+        with conn.cursor() as cursor:
+            for params in rows:
                 self._log_query(cursor, query, params)
-                cursor.execute(query, params)
-                return f"Success: {cursor.rowcount} row(s) affected."
+
+    def execute_transaction(
+        self,
+        steps: Iterable[Tuple[str, Optional[Tuple]]],
+        tables: Optional[Iterable[str]] = None,
+    ) -> List[int]:
+        """Runs several statements atomically (one commit); returns their rowcounts.
+
+        A step whose params is a list of tuples is sent with `executemany`.
+        Inside a unit of work (see transaction()) the steps run under a
+        savepoint and commit with the enclosing transaction.
+        """
+        capture = _capture.get()
+        if capture is not None:
+            steps = list(steps)
+            capture.add_writes(steps, tables)
+            return [0] * len(steps)
+
+        op = current_operation.get() or "execute_transaction"
+        start = time.perf_counter()
+        wait = 0.0
+        rowcounts: List[int] = []
+        try:
+            with self._get_pool().connection() as conn:
+                wait = time.perf_counter() - start
+                with self._atomic(conn), conn.cursor() as cursor:
+                    for query, params in steps:
+                        if isinstance(params, list):
+                            for row in params:
+                                self._log_query(cursor, query, row)
+                            cursor.executemany(query, params)
+                        else:
+                            self._log_query(cursor, query, params)
+                            step_start = time.perf_counter()
+                            cursor.execute(query, params)
+                            self._check_slow(conn, cursor, query, params, step_start)
+                        rowcounts.append(cursor.rowcount)
+            REGISTRY.record(op, time.perf_counter() - start, wait, rows=sum(rowcounts))
         except pymysql.Error as e:
+            REGISTRY.record(op, time.perf_counter() - start, wait, error=True)
             raise Exception(f"Update Error: {e}")
+        finally:
+            self._tables_changed(tables)
+        return rowcounts
+
+    @contextmanager
+    def _atomic(self, conn):
+        """BEGIN ... COMMIT, or a savepoint if a unit of work is already open."""
+        tx = self._in_transaction()
+        if tx is not None:
+            with tx.savepoint():
+                yield
+            return
+        conn.begin()
+        try:
+            yield
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def _check_slow(self, conn, cursor, query: str, params, started: float):
+        """Hands a statement that ran past the threshold to the slow-query log.
+
+        Rows examined/sent are read back from performance_schema on the same
+        connection; the EXPLAIN runs later on the recorder's thread.
+        """
+        seconds = time.perf_counter() - started
+        if self.slow_log is None or seconds * 1000 < self.slow_log.threshold_ms:
+            return
+        sql = cursor.mogrify(query, params)
+        examined = sent = None
+        try:
+            with conn.cursor(pymysql.cursors.Cursor) as stats:
+                stats.execute(ROWS_EXAMINED_SQL)
+                row = stats.fetchone()
+            if row:
+                examined, sent = int(row[0]), int(row[1])
+        except pymysql.Error:
+            pass  # performance_schema disabled or not readable
+        self.slow_log.record(
+            sql, seconds, current_operation.get(), examined, sent, self._explain_json
+        )
+
+    def _explain_json(self, sql: str) -> Optional[str]:
+        """EXPLAIN FORMAT=JSON for an already mogrified statement (not logged)."""
+        with self._get_pool().connection() as conn:
+            with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                cursor.execute("EXPLAIN FORMAT=JSON " + sql)
+                row = cursor.fetchone()
+        return row[0] if row else None
+
+    def slow_query_report(self) -> List[Dict[str, Any]]:
+        """Slow statements recorded in this process, grouped by fingerprint."""
+        return summarize(self.slow_log.entries()) if self.slow_log is not None else []
+
+    def _tables_changed(self, tables: Optional[Iterable[str]]):
+        """Drops dependent cached reads and publishes the write to the change feed."""
+        tx = self._in_transaction()
+        if tx is not None:
+            tx.touch(tables)  # deferred until the unit of work commits
+            return
+        tables = tuple(tables) if tables is not None else None
+        if self.cache is not None:
+            self.cache.invalidate(tables)
+        self.changes.publish(tables)
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Returns hit/miss statistics for the shared result cache."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def replica_stats(self) -> Dict[str, Any]:
+        """Returns local replica counters (empty when the replica is off)."""
+        return self.replica.stats() if self.replica is not None else {}
+
+    def clear_cache(self):
+        """Drops every cached read result."""
+        if self.cache is not None:
+            self.cache.invalidate()
+
+    def capture_query(self, call: Callable[[], Any]) -> Tuple[str, Optional[Tuple]]:
+        """Returns the (sql, params) of the result query a read operation runs.
+
+        The operation executes until it issues its result query (the one with
+        `tables=`), which is recorded instead of run, so callers such as the
+        exporter or the CLI can stream the same SQL instead of materializing it.
+        """
+        capture = _Capture()
+        token = _capture.set(capture)
+        try:
+            call()
+        except _Captured:
+            pass
+        finally:
+            _capture.reset(token)
+        if not capture.reads:
+            raise Exception("Query Error: the operation issued no result query.")
+        return capture.reads[-1]
+
+    def capture_writes(
+        self, call: Callable[[], Any]
+    ) -> Tuple[List[Tuple[str, Any]], Optional[set]]:
+        """Returns the (steps, tables) a write operation would run, without running it.
+
+        The steps can be replayed (possibly merged with other operations')
+        through execute_transaction; tables is None if a step was unscoped.
+        """
+        capture = _Capture()
+        token = _capture.set(capture)
+        try:
+            call()
+        finally:
+            _capture.reset(token)
+        return capture.steps, capture.tables
+
+    def export(
+        self,
+        destination,
+        table: Optional[str] = None,
+        operation_name: Optional[str] = None,
+        args: Tuple = (),
+        **options,
+    ) -> Dict[str, Any]:
+        """Streams a table or a read operation's result to a file (see export.py)."""
+        import export  # export.py builds on this module
+
+        if (table is None) == (operation_name is None):
+            raise ValueError("Pass exactly one of table= or operation_name=.")
+        if table is not None:
+            query, params = export.table_query(self, table)
+        else:
+            query, params = export.operation_query(self, operation_name, *args)
+        return export.export_query(self, query, params, destination, **options)
+
+    # ==========================================
+    #  STREAMING (Unbuffered server-side cursors)
+    # ==========================================
+
+    def _stream_batches(
+        self,
+        query: str,
+        params: Optional[Tuple],
+        batch_size: int,
+        cursor_class,
+        op: str,
+    ) -> Iterator[Tuple[Tuple, List[Any]]]:
+        """Yields (cursor description, rows) batches from an unbuffered cursor.
+
+        Uses a dedicated pool connection (not the thread's re-entrant one), so
+        other queries can run while the stream is open. If the consumer stops
+        early, the connection is closed instead of draining the remaining rows
+        and the pool replaces it. Metrics count the time spent executing and
+        fetching, not the time the consumer spends between batches.
+        """
+        op = current_operation.get() or op
+        start = time.perf_counter()
+        pool = self._get_pool()
+        conn = pool.acquire()
+        wait = elapsed = time.perf_counter() - start
+        cursor = None
+        exhausted = error = False
+        total = 0
+        try:
+            started = time.perf_counter()
+            cursor = conn.cursor(cursor_class)
+            self._log_query(cursor, query, params)
+            cursor.execute(query, params)
+            description = cursor.description or ()
+            fetched = False
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                elapsed += time.perf_counter() - started
+                if not rows:
+                    break
+                fetched = True
+                total += len(rows)
+                yield description, rows
+                started = time.perf_counter()
+            if not fetched:
+                yield description, []
+            exhausted = True
+        except pymysql.Error as e:
+            error = True
+            raise Exception(f"Query Error: {e}")
+        finally:
+            REGISTRY.record(op, elapsed, wait, rows=total, error=error)
+            try:
+                if exhausted and cursor is not None:
+                    cursor.close()
+                else:
+                    conn.close()
+            except Exception:
+                pass
+            pool.release(conn)
+
+    def iter_rows(
+        self, query: str, params: Optional[Tuple] = None, fetch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Streams a SELECT row by row (as dicts) in constant memory."""
+        for _, rows in self._stream_batches(
+            query, params, fetch_size, pymysql.cursors.SSDictCursor, "iter_rows"
+        ):
+            yield from rows
+
+    def iter_chunks(
+        self, query: str, params: Optional[Tuple] = None, chunksize: int = 10000
+    ) -> Iterator[pd.DataFrame]:
+        """Streams a SELECT as DataFrames of at most `chunksize` rows."""
+        from columnar import build_frame
+
+        for description, rows in self._stream_batches(
+            query, params, chunksize, pymysql.cursors.SSCursor, "iter_chunks"
+        ):
+            yield build_frame(description, rows)
+
+    def iter_batches(
+        self, query: str, params: Optional[Tuple] = None, batch_size: int = 1000
+    ) -> Iterator[Tuple[List[str], List[Tuple]]]:
+        """Streams a SELECT as (column names, tuple rows) batches, without pandas.
+
+        An empty result still yields one batch with the column names.
+        """
+        for description, rows in self._stream_batches(
+            query, params, batch_size, pymysql.cursors.SSCursor, "iter_batches"
+        ):
+            yield [col[0] for col in description], rows
 
     # ==========================================
     #  READ OPERATIONS (10 Required)
     # ==========================================
 
+    @operation
     def get_squad_roster(self, squad_name_filter: str) -> pd.DataFrame:
         """1. Join Detective and Squad to filter by squad name."""
         sql = """SELECT d.badge_no, d.first_name, d.last_name, d.rank, s.squad_name 
                  FROM Detective d JOIN Squad s ON d.squad_id = s.squad_id 
                  WHERE s.squad_name LIKE %s"""
-        return self.execute_query(sql, (f"%{squad_name_filter}%",))
+        return self.execute_query(
+            sql, (f"%{squad_name_filter}%",), tables=("Detective", "Squad")
+        )
 
+    @operation
     def get_case_load(self) -> pd.DataFrame:
-        """2. Aggregate count of cases per detective."""
-        sql = """SELECT d.first_name, d.last_name, COUNT(a.case_id) as active_cases 
-                 FROM Detective d LEFT JOIN Assigned_To a ON d.badge_no = a.badge_no 
-                 GROUP BY d.badge_no, d.first_name, d.last_name ORDER BY active_cases DESC"""
-        return self.execute_query(sql)
+        """2. Open/closed case count per detective (from the maintained summary)."""
+        sql = """SELECT d.first_name, d.last_name, COALESCE(l.open_cases, 0) as active_cases,
+                 COALESCE(l.closed_cases, 0) as closed_cases
+                 FROM Detective d LEFT JOIN Detective_Case_Load l ON d.badge_no = l.badge_no
+                 ORDER BY active_cases DESC"""
+        return self.execute_query(sql, tables=("Detective", "Detective_Case_Load"))
 
+    @operation
     def get_heist_winners(self) -> pd.DataFrame:
         """3. Join Halloween_Heist and Detective."""
         sql = """SELECT h.heist_year, h.objective_item, CONCAT(d.first_name, ' ', d.last_name) as winner 
                  FROM Halloween_Heist h LEFT JOIN Detective d ON h.winner_id = d.badge_no 
                  ORDER BY h.heist_year DESC"""
-        return self.execute_query(sql)
+        return self.execute_query(sql, tables=("Halloween_Heist", "Detective"))
+
+    @operation
+    def search_evidence(
+        self,
+        keyword: str,
+        mode: str = "auto",
+        page: int = 1,
+        page_size: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> pd.DataFrame:
+        """4. Search Evidence Log by description.
+
+        mode="fulltext" uses the FULLTEXT index (MATCH ... AGAINST in boolean
+        mode: +must, -exclude, "exact phrase", prefix*) ranked by relevance;
+        mode="substring" is the original LIKE '%keyword%' scan; mode="auto"
+        uses full-text when the index exists and falls back otherwise. The mode
+        actually used is stored in `frame.attrs["search_mode"]`.
+        `include_archived` also searches archived cases (see with_archived()).
+        """
+        if mode not in ("auto", "fulltext", "substring"):
+            raise ValueError("mode must be 'auto', 'fulltext' or 'substring'")
+        use_fulltext = mode == "fulltext" or (
+            mode == "auto" and bool(keyword.strip()) and self._has_fulltext_index()
+        )
+
+        if use_fulltext:
+            sql = """SELECT e.evidence_tag, e.description, c.case_title,
+                     MATCH(e.description) AGAINST (%s IN BOOLEAN MODE) AS relevance
+                     FROM Evidence_Log e JOIN Case_File c ON e.case_id = c.case_id
+                     WHERE MATCH(e.description) AGAINST (%s IN BOOLEAN MODE)"""
+            term = self._to_boolean_query(keyword) if mode == "auto" else keyword
+            params: Tuple = (term, term)
+        else:
+            sql = """SELECT e.evidence_tag, e.description, c.case_title FROM Evidence_Log e 
+                     JOIN Case_File c ON e.case_id = c.case_id WHERE e.description LIKE %s"""
+            params = (f"%{keyword}%",)
+        sql, params, tables = self.with_archived(
+            sql, params, ("Evidence_Log", "Case_File"), include_archived
+        )
+
+        if use_fulltext:
+            sql += " ORDER BY relevance DESC"
+        if page_size:
+            sql += " LIMIT %s OFFSET %s"
+            params += (page_size, (max(page, 1) - 1) * page_size)
 
-    def search_evidence(self, keyword: str) -> pd.DataFrame:
-        """4. Search Evidence Log by description."""
-        sql = """SELECT e.evidence_tag, e.description, c.case_title FROM Evidence_Log e 
-                 JOIN Case_File c ON e.case_id = c.case_id WHERE e.description LIKE %s"""
-        return self.execute_query(sql, (f"%{keyword}%",))
+        frame = self.execute_query(sql, params, tables=tables)
+        frame.attrs["search_mode"] = "fulltext" if use_fulltext else "substring"
+        return frame
 
+    @staticmethod
+    def _to_boolean_query(keyword: str) -> str:
+        """Turns plain words into required prefix terms ("key ring" -> "+key* +ring*").
+
+        Input that already uses boolean syntax (quotes or operators) is kept.
+        Hyphenated words are searched as phrases ("EV-999" -> '+"EV-999"'), as
+        MySQL would otherwise read the hyphen as "exclude what follows".
+        """
+        if not _BOOLEAN_OPERATORS.search(keyword):
+            return " ".join(
+                f'+"{word}"' if "-" in word else f"+{word}*" for word in keyword.split()
+            )
+        # Quote hyphenated words outside the phrases the user already quoted
+        parts = re.split(r'("[^"]*")', keyword)
+        return "".join(
+            part if i % 2 else _HYPHENATED.sub(lambda m: f'"{m[0].rstrip("*")}"', part)
+            for i, part in enumerate(parts)
+        )
+
+    def _has_fulltext_index(self) -> bool:
+        """Checks once per manager whether Evidence_Log.description has a FULLTEXT index."""
+        if self._fulltext_available is None:
+            sql = """SELECT COUNT(*) AS n FROM information_schema.STATISTICS
+                     WHERE table_schema = DATABASE() AND table_name = 'Evidence_Log'
+                     AND column_name = 'description' AND index_type = 'FULLTEXT'"""
+            try:
+                self._fulltext_available = bool(self.fetch_value(sql))
+            except Exception:
+                return False
+        return self._fulltext_available
+
+    @operation
     def get_perpetrator_network(self) -> pd.DataFrame:
         """5. List perpetrators and their known associates."""
         sql = """SELECT p.primary_alias, poi.name, a.associate_name FROM Perpetrator p 
                  JOIN Person_Of_Interest poi ON p.person_id = poi.person_id 
                  LEFT JOIN Perpetrator_Known_Associate a ON p.perp_id = a.perp_id"""
-        return self.execute_query(sql)
+        return self.execute_query(
+            sql,
+            tables=("Perpetrator", "Person_Of_Interest", "Perpetrator_Known_Associate"),
+        )
 
+    @operation
     def get_unsolved_cases(self) -> pd.DataFrame:
         """6. Filter Cases that are not Closed."""
         sql = "SELECT * FROM Case_File WHERE status != 'Closed'"
-        return self.execute_query(sql)
+        return self.execute_query(sql, tables=("Case_File",))
 
+    @operation
     def get_resource_custody(self) -> pd.DataFrame:
         """7. Show who has custody of which resource."""
         sql = """SELECT r.asset_tag, r.item_name, CONCAT(d.first_name, ' ', d.last_name) as holder 
                  FROM Precinct_Resource r LEFT JOIN Custodian_Of c ON r.asset_tag = c.asset_tag 
                  LEFT JOIN Detective d ON c.badge_no = d.badge_no"""
-        return self.execute_query(sql)
+        return self.execute_query(
+            sql, tables=("Precinct_Resource", "Custodian_Of", "Detective")
+        )
 
+    @operation
     def get_betting_history(self) -> pd.DataFrame:
         """8. Show bets and outcomes."""
         sql = """SELECT b.bet_timestamp, b.stake, b.outcome, CONCAT(d1.first_name, ' ', d1.last_name) as challenger,
                  CONCAT(d2.first_name, ' ', d2.last_name) as defendant
                  FROM Bet_Ledger b JOIN Detective d1 ON b.challenger_id = d1.badge_no
                  JOIN Detective d2 ON b.defendant_id = d2.badge_no"""
-        return self.execute_query(sql)
+        return self.execute_query(sql, tables=("Bet_Ledger", "Detective"))
 
-    def get_interview_logs(self) -> pd.DataFrame:
+    @operation
+    def get_interview_logs(self, include_archived: bool = False) -> pd.DataFrame:
         """9. See who interviewed whom."""
         sql = """SELECT r.case_id, CONCAT(d.first_name, ' ', d.last_name) as detective, p.primary_alias as perp
                  FROM Records_Interview r JOIN Detective d ON r.badge_no = d.badge_no
                  JOIN Perpetrator p ON r.perp_id = p.perp_id"""
-        return self.execute_query(sql)
+        sql, params, tables = self.with_archived(
+            sql,
+            None,
+            ("Records_Interview", "Detective", "Perpetrator"),
+            include_archived,
+        )
+        return self.execute_query(sql, params, tables=tables)
 
+    @operation
     def get_detective_specializations(self) -> pd.DataFrame:
         """10. List specializations."""
         sql = """SELECT d.first_name, d.last_name, s.specialization 
                  FROM Detective d JOIN Detective_Specialization s ON d.badge_no = s.badge_no"""
-        return self.execute_query(sql)
+        return self.execute_query(sql, tables=("Detective", "Detective_Specialization"))
 
     # ==========================================
     #  WRITE OPERATIONS (10 Required)
     # ==========================================
 
+    @operation
     def insert_evidence(self, case_id: int, tag: str, desc: str, loc: str, badge: int):
         """1. INSERT Evidence."""
         sql = "INSERT INTO Evidence_Log (case_id, evidence_tag, description, logged_by_id, storage_location) VALUES (%s, %s, %s, %s, %s)"
-        return self.execute_update(sql, (case_id, tag, desc, badge, loc))
+        return self.execute_update(
+            sql, (case_id, tag, desc, badge, loc), tables=("Evidence_Log",)
+        )
 
+    @operation
     def update_case_status(self, case_id: int, new_status: str):
         """2. UPDATE Case Status."""
         sql = "UPDATE Case_File SET status = %s WHERE case_id = %s"
-        return self.execute_update(sql, (new_status, case_id))
+        # Move the case between open/closed for every assigned detective,
+        # computed against the old status before it is overwritten.
+        summary_sql = """UPDATE Detective_Case_Load l
+                 JOIN Assigned_To a ON a.badge_no = l.badge_no
+                 JOIN Case_File c ON c.case_id = a.case_id
+                 SET l.open_cases = l.open_cases + (%s != 'Closed') - (COALESCE(c.status, '') != 'Closed'),
+                     l.closed_cases = l.closed_cases + (%s = 'Closed') - (COALESCE(c.status, '') = 'Closed')
+                 WHERE a.case_id = %s"""
+        rowcounts = self.execute_transaction(
+            [
+                (summary_sql, (new_status, new_status, case_id)),
+                (sql, (new_status, case_id)),
+            ],
+            tables=("Case_File", "Detective_Case_Load"),
+        )
+        return f"Success: {rowcounts[-1]} row(s) affected."
 
+    @operation
     def delete_resource(self, asset_tag: str):
         """3. DELETE Resource."""
         sql = "DELETE FROM Precinct_Resource WHERE asset_tag = %s"
-        return self.execute_update(sql, (asset_tag,))
+        return self.execute_update(
+            sql, (asset_tag,), tables=("Precinct_Resource", "Custodian_Of")
+        )
 
+    @operation
     def create_new_case(self, case_id: int, title: str):
         """4. INSERT New Case."""
+        # An archived case keeps its id; reusing it would block its archiving
+        archived_sql = "SELECT COUNT(*) FROM Case_File_Archive WHERE case_id = %s"
+        if self.fetch_value(archived_sql, (case_id,)):
+            raise Exception(
+                f"Update Error: case {case_id} is archived; restore it or use another id."
+            )
         sql = "INSERT INTO Case_File (case_id, case_title, status) VALUES (%s, %s, 'Open')"
-        return self.execute_update(sql, (case_id, title))
+        return self.execute_update(sql, (case_id, title), tables=("Case_File",))
 
+    @operation
     def assign_detective(self, badge_no: int, case_id: int):
         """5. INSERT Assignment."""
         sql = "INSERT INTO Assigned_To (badge_no, case_id) VALUES (%s, %s)"
-        return self.execute_update(sql, (badge_no, case_id))
+        rowcounts = self.execute_transaction(
+            [
+                (sql, (badge_no, case_id)),
+                (self._CASE_LOAD_ADD, (badge_no, case_id)),
+            ],
+            tables=("Assigned_To", "Detective_Case_Load"),
+        )
+        return f"Success: {rowcounts[0]} row(s) affected."
 
+    @operation
     def add_person_of_interest(self, person_id: int, name: str, p_type: str):
         """6. INSERT Person Of Interest (Superclass)."""
         sql = "INSERT INTO Person_Of_Interest (person_id, name, poi_type) VALUES (%s, %s, %s)"
-        return self.execute_update(sql, (person_id, name, p_type))
+        return self.execute_update(
+            sql, (person_id, name, p_type), tables=("Person_Of_Interest",)
+        )
 
+    @operation
     def add_perpetrator_details(self, perp_id: int, person_id: int, alias: str):
         """7. INSERT Perpetrator (Subclass)."""
         sql = "INSERT INTO Perpetrator (perp_id, person_id, primary_alias) VALUES (%s, %s, %s)"
-        return self.execute_update(sql, (perp_id, person_id, alias))
+        return self.execute_update(
+            sql, (perp_id, person_id, alias), tables=("Perpetrator",)
+        )
 
+    @operation
     def promote_detective(self, badge_no: int, new_rank: str):
         """8. UPDATE Detective Rank."""
         sql = "UPDATE Detective SET `rank` = %s WHERE badge_no = %s"
-        return self.execute_update(sql, (new_rank, badge_no))
+        return self.execute_update(sql, (new_rank, badge_no), tables=("Detective",))
 
+    @operation
     def transfer_detective(self, badge_no: int, new_squad_id: int):
         """9. UPDATE Detective Squad."""
         sql = "UPDATE Detective SET squad_id = %s WHERE badge_no = %s"
-        return self.execute_update(sql, (new_squad_id, badge_no))
+        return self.execute_update(sql, (new_squad_id, badge_no), tables=("Detective",))
 
+    @operation
     def delete_evidence(self, evidence_tag: str):
         """10. DELETE Evidence Log."""
         sql = "DELETE FROM Evidence_Log WHERE evidence_tag = %s"
-        return self.execute_update(sql, (evidence_tag,))
+        return self.execute_update(sql, (evidence_tag,), tables=("Evidence_Log",))
+
+    # ==========================================
+    #  BATCH WRITE OPERATIONS
+    # ==========================================
+
+    @operation
+    def insert_evidence_batch(
+        self, rows: Iterable[Tuple[int, str, str, str, int]], chunk_size: int = 500
+    ) -> Dict[str, Any]:
+        """Bulk INSERT Evidence; rows are (case_id, tag, desc, loc, badge)."""
+        sql = "INSERT INTO Evidence_Log (case_id, evidence_tag, description, logged_by_id, storage_location) VALUES (%s, %s, %s, %s, %s)"
+        params = ((c, t, d, b, l) for c, t, d, l, b in rows)
+        return self.execute_batch(sql, params, ("Evidence_Log",), chunk_size)
+
+    @operation
+    def create_new_case_batch(
+        self, rows: Iterable[Tuple[int, str]], chunk_size: int = 500
+    ) -> Dict[str, Any]:
+        """Bulk INSERT New Cases; rows are (case_id, title)."""
+        sql = "INSERT INTO Case_File (case_id, case_title, status) VALUES (%s, %s, 'Open')"
+        return self.execute_batch(sql, rows, ("Case_File",), chunk_size)
+
+    @operation
+    def assign_detective_batch(
+        self, rows: Iterable[Tuple[int, int]], chunk_size: int = 500
+    ) -> Dict[str, Any]:
+        """Bulk INSERT Assignments; rows are (badge_no, case_id)."""
+        sql = "INSERT INTO Assigned_To (badge_no, case_id) VALUES (%s, %s)"
+        rows = [tuple(r) for r in rows]
+        result = self.execute_batch(sql, rows, ("Assigned_To",), chunk_size)
+        self.refresh_case_load({badge for badge, _ in rows})
+        return result
+
+    @operation
+    def add_person_of_interest_batch(
+        self, rows: Iterable[Tuple[int, str, str]], chunk_size: int = 500
+    ) -> Dict[str, Any]:
+        """Bulk INSERT Persons Of Interest; rows are (person_id, name, p_type)."""
+        sql = "INSERT INTO Person_Of_Interest (person_id, name, poi_type) VALUES (%s, %s, %s)"
+        return self.execute_batch(sql, rows, ("Person_Of_Interest",), chunk_size)
+
+    # ==========================================
+    #  UNITS OF WORK (Multi-step transactions)
+    # ==========================================
+
+    @contextmanager
+    def transaction(self) -> Iterator[Transaction]:
+        """Groups every call made in the block into a single commit.
+
+        All DatabaseManager calls from this thread inside the block share one
+        pooled connection; any exception rolls everything back. Nested use
+        joins the outer transaction as a savepoint. Streaming reads
+        (iter_rows/iter_chunks) use their own connection and do not see the
+        uncommitted changes.
+        """
+        pool = self._get_pool()
+        with pool.connection() as conn:
+            outer = active_transaction(pool)
+            if outer is not None:
+                with outer.savepoint():
+                    yield outer
+                return
+
+            tx = Transaction(conn)
+            set_active_transaction(pool, tx)
+            try:
+                conn.begin()
+                try:
+                    yield tx
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            finally:
+                set_active_transaction(pool, None)
+            if tx.tables is None or tx.tables:
+                self._tables_changed(tx.tables)
+
+    def run_in_transaction(
+        self,
+        work: Callable[[Transaction], Any],
+        retries: int = 3,
+        backoff: float = 0.05,
+    ) -> Any:
+        """Runs `work(tx)` as one unit of work, retrying it on deadlock.
+
+        Deadlocks and lock-wait timeouts roll the transaction back, so `work`
+        is simply run again after an exponential, jittered backoff (up to
+        `retries` times). Inside an already open transaction it just joins it.
+        """
+        if self._in_transaction() is not None:
+            with self.transaction() as tx:
+                return work(tx)
+        for attempt in range(retries + 1):
+            try:
+                with self.transaction() as tx:
+                    return work(tx)
+            except Exception as e:
+                if attempt >= retries or not is_retryable(e):
+                    raise
+                time.sleep(backoff * (2**attempt) * random.uniform(0.5, 1.5))
+
+    @operation
+    def open_case_with_team(
+        self,
+        case_id: int,
+        title: str,
+        badge_nos: Iterable[int],
+        evidence: Iterable[Tuple[str, str, str, int]] = (),
+    ) -> str:
+        """Creates a case, assigns its detectives and logs its evidence in one commit.
+
+        `evidence` rows are (tag, desc, loc, badge).
+        """
+        badge_nos, evidence = list(badge_nos), list(evidence)
+
+        def work(tx: Transaction):
+            self.create_new_case(case_id, title)
+            for badge_no in badge_nos:
+                self.assign_detective(badge_no, case_id)
+            for tag, desc, loc, badge in evidence:
+                self.insert_evidence(case_id, tag, desc, loc, badge)
+
+        self.run_in_transaction(work)
+        return (
+            f"Success: case {case_id} opened with {len(badge_nos)} detective(s) "
+            f"and {len(evidence)} evidence item(s)."
+        )
+
+    @operation
+    def register_perpetrator(
+        self,
+        person_id: int,
+        name: str,
+        perp_id: int,
+        alias: str,
+        associates: Iterable[str] = (),
+    ) -> str:
+        """Adds a person of interest, their perpetrator record and known associates atomically."""
+        associates = list(associates)
+        sql = "INSERT INTO Perpetrator_Known_Associate (perp_id, associate_name) VALUES (%s, %s)"
+
+        def work(tx: Transaction):
+            self.add_person_of_interest(person_id, name, "Perpetrator")
+            self.add_perpetrator_details(perp_id, person_id, alias)
+            if associates:
+                self.execute_transaction(
+                    [(sql, [(perp_id, a) for a in associates])],
+                    tables=("Perpetrator_Known_Associate",),
+                )
+
+        self.run_in_transaction(work)
+        return f"Success: perpetrator {perp_id} registered with {len(associates)} associate(s)."
+
+    # ==========================================
+    #  CASE-LOAD SUMMARY (Detective_Case_Load)
+    # ==========================================
+
+    # Adds one (just inserted) assignment to a detective's counts;
+    # params are (badge_no, case_id)
+    _CASE_LOAD_ADD = """INSERT INTO Detective_Case_Load (badge_no, open_cases, closed_cases)
+        SELECT a.badge_no, COALESCE(c.status, '') != 'Closed',
+               COALESCE(c.status, '') = 'Closed'
+        FROM Assigned_To a JOIN Case_File c ON c.case_id = a.case_id
+        WHERE a.badge_no = %s AND a.case_id = %s
+        ON DUPLICATE KEY UPDATE open_cases = open_cases + VALUES(open_cases),
+                                closed_cases = closed_cases + VALUES(closed_cases)"""
+
+    _CASE_LOAD_RECOUNT = """INSERT INTO Detective_Case_Load (badge_no, open_cases, closed_cases)
+        SELECT d.badge_no,
+               COALESCE(SUM(a.case_id IS NOT NULL AND COALESCE(c.status, '') != 'Closed'), 0),
+               COALESCE(SUM(COALESCE(c.status, '') = 'Closed'), 0)
+        FROM Detective d
+        LEFT JOIN Assigned_To a ON a.badge_no = d.badge_no
+        LEFT JOIN Case_File c ON c.case_id = a.case_id
+        {where}
+        GROUP BY d.badge_no
+        ON DUPLICATE KEY UPDATE open_cases = VALUES(open_cases),
+                                closed_cases = VALUES(closed_cases)"""
+
+    # Takes cases (about to be deleted or unassigned) out of their detectives'
+    # counts; {cases} is a list of %s placeholders
+    _CASE_LOAD_REMOVE = """UPDATE Detective_Case_Load l
+        JOIN Assigned_To a ON a.badge_no = l.badge_no
+        JOIN Case_File c ON c.case_id = a.case_id
+        SET l.open_cases = l.open_cases - (COALESCE(c.status, '') != 'Closed'),
+            l.closed_cases = l.closed_cases - (COALESCE(c.status, '') = 'Closed')
+        WHERE a.case_id IN ({cases})"""
+
+    @operation
+    def unassign_detective(self, badge_no: int, case_id: int):
+        """DELETE Assignment (keeps the case-load summary in step)."""
+        summary_sql = self._CASE_LOAD_REMOVE.format(cases="%s") + " AND a.badge_no = %s"
+        sql = "DELETE FROM Assigned_To WHERE badge_no = %s AND case_id = %s"
+        rowcounts = self.execute_transaction(
+            [
+                (summary_sql, (case_id, badge_no)),
+                (sql, (badge_no, case_id)),
+            ],
+            tables=("Assigned_To", "Detective_Case_Load"),
+        )
+        return f"Success: {rowcounts[-1]} row(s) affected."
+
+    @operation
+    def delete_case(self, case_id: int):
+        """DELETE Case File (cascades to its evidence, updates and assignments)."""
+        summary_sql = self._CASE_LOAD_REMOVE.format(cases="%s")
+        sql = "DELETE FROM Case_File WHERE case_id = %s"
+        rowcounts = self.execute_transaction(
+            [(summary_sql, (case_id,)), (sql, (case_id,))],
+            tables=CASE_TABLES + ("Detective_Case_Load",),
+        )
+        return f"Success: {rowcounts[-1]} row(s) affected."
+
+    def refresh_case_load(self, badge_nos: Iterable[int]) -> int:
+        """Recounts the summary rows of the given detectives from Assigned_To."""
+        badge_nos = sorted(set(badge_nos))
+        for i in range(0, len(badge_nos), 1000):
+            chunk = tuple(badge_nos[i : i + 1000])
+            where = "WHERE d.badge_no IN (" + ", ".join(["%s"] * len(chunk)) + ")"
+            self.execute_update(
+                self._CASE_LOAD_RECOUNT.format(where=where),
+                chunk,
+                tables=("Detective_Case_Load",),
+            )
+        return len(badge_nos)
+
+    def rebuild_case_load(self) -> str:
+        """Recomputes the whole summary in one transaction."""
+        self.execute_transaction(
+            [
+                ("DELETE FROM Detective_Case_Load", None),
+                (self._CASE_LOAD_RECOUNT.format(where=""), None),
+            ],
+            tables=("Detective_Case_Load",),
+        )
+        count = self.fetch_value("SELECT COUNT(*) FROM Detective_Case_Load")
+        return f"Success: rebuilt case load for {int(count)} detective(s)."
+
+    def verify_case_load(self) -> pd.DataFrame:
+        """Returns detectives whose summary disagrees with Assigned_To (empty if OK)."""
+        sql = """SELECT t.badge_no, t.open_cases AS expected_open, COALESCE(l.open_cases, 0) AS actual_open,
+                        t.closed_cases AS expected_closed, COALESCE(l.closed_cases, 0) AS actual_closed
+                 FROM (SELECT d.badge_no,
+                              COALESCE(SUM(a.case_id IS NOT NULL AND COALESCE(c.status, '') != 'Closed'), 0) AS open_cases,
+                              COALESCE(SUM(COALESCE(c.status, '') = 'Closed'), 0) AS closed_cases
+                       FROM Detective d
+                       LEFT JOIN Assigned_To a ON a.badge_no = d.badge_no
+                       LEFT JOIN Case_File c ON c.case_id = a.case_id
+                       GROUP BY d.badge_no) t
+                 LEFT JOIN Detective_Case_Load l ON l.badge_no = t.badge_no
+                 WHERE t.open_cases != COALESCE(l.open_cases, 0)
+                    OR t.closed_cases != COALESCE(l.closed_cases, 0)"""
+        return self.execute_query(sql)
+
+    # ==========================================
+    #  CASE ARCHIVAL (closed cases -> *_Archive tables)
+    # ==========================================
+
+    # Case columns that reference a detective with ON DELETE SET NULL
+    _DETACHED_REFS = {"Evidence_Log": "logged_by_id", "Case_Update": "detective_id"}
+
+    def _archive_columns(self, table: str) -> str:
+        """The live columns of a case table, as a quoted select list."""
+        columns = self._case_columns.get(table)
+        if columns is None:
+            sql = """SELECT column_name FROM information_schema.COLUMNS
+                     WHERE table_schema = DATABASE() AND table_name = %s
+                     ORDER BY ordinal_position"""
+            names = self.execute_query(sql, (table,)).iloc[:, 0]
+            columns = ", ".join(f"`{name}`" for name in names)
+            self._case_columns[table] = columns
+        return columns
+
+    def with_archived(
+        self,
+        sql: str,
+        params: Optional[Tuple],
+        tables: Tuple[str, ...],
+        include_archived: bool = True,
+    ) -> Tuple[str, Optional[Tuple], Tuple[str, ...]]:
+        """Extends a read over the case tables to archived cases.
+
+        The query is repeated against the *_Archive tables and the two results
+        are combined with UNION ALL, with an extra boolean `archived` column.
+        An archived case has all its rows archived, so joins between case
+        tables stay within one side. ORDER BY/LIMIT belong after the union.
+        Returns (sql, params, tables) unchanged if `include_archived` is false.
+        """
+        if not include_archived:
+            return sql, params, tables
+        archived = _CASE_TABLE_NAMES.sub(lambda m: ARCHIVE_TABLES[m.group(1)], sql)
+        union = (
+            f"SELECT live.*, FALSE AS archived FROM ({sql}) live UNION ALL "
+            f"SELECT arch.*, TRUE AS archived FROM ({archived}) arch"
+        )
+        tables += tuple(ARCHIVE_TABLES[t] for t in tables if t in ARCHIVE_TABLES)
+        return union, (params * 2 if params else params), tables
+
+    @operation
+    def archive_closed_cases(
+        self,
+        batch_size: int = 100,
+        idle_days: Optional[int] = None,
+        max_batches: Optional[int] = None,
+        pause: float = 0.1,
+    ) -> str:
+        """Moves closed cases and all their rows into the archive tables.
+
+        Works through the closed cases in case_id order, `batch_size` at a
+        time. Each batch is one short transaction that locks only its own
+        cases: it copies their rows to the archive, takes them out of the
+        case-load summary and deletes the Case_File rows (the cascade removes
+        the rest). Batches are retried on deadlock, with a `pause` between
+        them for other traffic. A stopped run loses nothing: committed batches
+        are done and the next run picks up the remaining closed cases.
+        `idle_days` skips cases updated more recently than that. Cases whose
+        id is already in the archive (an archived id that was reused) are
+        skipped and listed in the result instead of failing the batch.
+        """
+        find_sql = "SELECT c.case_id FROM Case_File c WHERE c.status = 'Closed' AND c.case_id > %s"
+        find_params: Tuple = ()
+        if idle_days is not None:
+            find_sql += """ AND NOT EXISTS (SELECT 1 FROM Case_Update u
+                            WHERE u.case_id = c.case_id AND u.update_timestamp >= %s)"""
+            cutoff = datetime.datetime.now() - datetime.timedelta(days=idle_days)
+            find_params = (cutoff,)
+        find_sql += " ORDER BY c.case_id LIMIT %s"
+        tables = CASE_TABLES + tuple(ARCHIVE_TABLES.values()) + ("Detective_Case_Load",)
+        # Copy by name: the archive tables may order their columns differently
+        columns = {table: self._archive_columns(table) for table in CASE_TABLES}
+
+        def work(tx: Transaction, ids: Tuple) -> Tuple[int, int, List[int]]:
+            marks = ", ".join(["%s"] * len(ids))
+            # Lock the batch and drop cases reopened since they were picked
+            locked = self.execute_query(
+                f"""SELECT case_id FROM Case_File WHERE case_id IN ({marks})
+                    AND status = 'Closed' FOR UPDATE""",
+                ids,
+            ).iloc[:, 0]
+            ids = tuple(int(case_id) for case_id in locked)
+            if not ids:
+                return 0, 0, []
+            marks = ", ".join(["%s"] * len(ids))
+            taken = self.execute_query(
+                f"SELECT case_id FROM Case_File_Archive WHERE case_id IN ({marks})",
+                ids,
+            ).iloc[:, 0]
+            conflicts = sorted(int(case_id) for case_id in taken)
+            ids = tuple(case_id for case_id in ids if case_id not in conflicts)
+            if not ids:
+                return 0, 0, conflicts
+            marks = ", ".join(["%s"] * len(ids))
+            steps = [
+                (
+                    f"INSERT INTO {ARCHIVE_TABLES[table]} ({columns[table]}, archived_at) "
+                    f"SELECT {columns[table]}, NOW() FROM {table} "
+                    f"WHERE case_id IN ({marks})",
+                    ids,
+                )
+                for table in CASE_TABLES
+            ]
+            steps.append((self._CASE_LOAD_REMOVE.format(cases=marks), ids))
+            steps.append((f"DELETE FROM Case_File WHERE case_id IN ({marks})", ids))
+            rowcounts = self.execute_transaction(steps, tables=tables)
+            return len(ids), sum(rowcounts[: len(CASE_TABLES)]), conflicts
+
+        after, cases, rows, batches = -1, 0, 0, 0
+        skipped: List[int] = []
+        while max_batches is None or batches < max_batches:
+            found = self.execute_query(find_sql, (after,) + find_params + (batch_size,))
+            if found.empty:
+                break
+            ids = tuple(int(case_id) for case_id in found.iloc[:, 0])
+            moved, copied, conflicts = self.run_in_transaction(lambda tx: work(tx, ids))
+            skipped.extend(conflicts)
+            after, cases, rows, batches = (
+                ids[-1],
+                cases + moved,
+                rows + copied,
+                batches + 1,
+            )
+            if len(ids) < batch_size:
+                break
+            time.sleep(pause)
+        message = (
+            f"Success: archived {cases} case(s), {rows} row(s) in {batches} batch(es)."
+        )
+        if skipped:
+            message += (
+                f" Skipped {len(skipped)} case(s) whose id is already archived: "
+                + ", ".join(str(case_id) for case_id in skipped)
+            )
+        return message
+
+    @operation
+    def restore_case(self, case_id: int) -> str:
+        """Moves an archived case and its rows back into the live tables.
+
+        Rows that point at a detective or perpetrator deleted since archiving
+        get what the foreign keys would have done: references to detectives
+        from evidence and updates are cleared, and assignments, targets and
+        interviews are dropped.
+        """
+        tables = CASE_TABLES + tuple(ARCHIVE_TABLES.values()) + ("Detective_Case_Load",)
+
+        def work(tx: Transaction) -> int:
+            archived = self.fetch_value(
+                "SELECT COUNT(*) FROM Case_File_Archive WHERE case_id = %s FOR UPDATE",
+                (case_id,),
+            )
+            if not archived:
+                raise ValueError(f"Case {case_id} is not archived.")
+            steps = []
+            for table, column in self._DETACHED_REFS.items():
+                steps.append(
+                    (
+                        f"""UPDATE {ARCHIVE_TABLES[table]} t
+                            LEFT JOIN Detective d ON d.badge_no = t.{column}
+                            SET t.{column} = NULL
+                            WHERE t.case_id = %s AND d.badge_no IS NULL""",
+                        (case_id,),
+                    )
+                )
+            for table in CASE_TABLES:
+                columns = self._archive_columns(table)
+                # IGNORE skips rows whose detective/perpetrator is gone
+                ignore = (
+                    "" if table in ("Case_File", *self._DETACHED_REFS) else "IGNORE "
+                )
+                steps.append(
+                    (
+                        f"INSERT {ignore}INTO {table} ({columns}) SELECT {columns} "
+                        f"FROM {ARCHIVE_TABLES[table]} WHERE case_id = %s",
+                        (case_id,),
+                    )
+                )
+            for table in reversed(CASE_TABLES):
+                steps.append(
+                    (
+                        f"DELETE FROM {ARCHIVE_TABLES[table]} WHERE case_id = %s",
+                        (case_id,),
+                    )
+                )
+            rowcounts = self.execute_transaction(steps, tables=tables)
+            badges = self.execute_query(
+                "SELECT badge_no FROM Assigned_To WHERE case_id = %s", (case_id,)
+            ).iloc[:, 0]
+            self.refresh_case_load(int(badge) for badge in badges)
+            first = len(self._DETACHED_REFS)
+            return sum(rowcounts[first : first + len(CASE_TABLES)])
+
+        rows = self.run_in_transaction(work)
+        return f"Success: case {case_id} restored ({rows} row(s))."
+
+    @operation
+    def get_archived_cases(self) -> pd.DataFrame:
+        """Archived cases, most recently archived first."""
+        sql = """SELECT case_id, case_title, status, archived_at
+                 FROM Case_File_Archive ORDER BY archived_at DESC, case_id"""
+        return self.execute_query(sql, tables=("Case_File_Archive",))
+
+    # ==========================================
+    #  TIME-BUCKETED ANALYTICS (Case_Update, Bet_Ledger)
+    # ==========================================
+
+    # Bucket name -> SQL expression over a DATE column
+    _BUCKETS = {"day": "{col}", "week": "{col} - INTERVAL WEEKDAY({col}) DAY"}
+
+    # Daily rollups rebuilt from a given day onwards; params are (day,) per %s
+    _ACTIVITY_ROLLUP = """INSERT INTO Detective_Activity_Daily (day, badge_no, case_updates, bets)
+        SELECT day, badge_no, SUM(updates), SUM(bets) FROM (
+            SELECT DATE(update_timestamp) AS day, detective_id AS badge_no,
+                   COUNT(*) AS updates, 0 AS bets
+            FROM Case_Update WHERE update_timestamp >= %s AND detective_id IS NOT NULL
+            GROUP BY day, badge_no
+            UNION ALL
+            SELECT DATE(bet_timestamp), challenger_id, 0, COUNT(*)
+            FROM Bet_Ledger WHERE bet_timestamp >= %s AND challenger_id IS NOT NULL
+            GROUP BY 1, 2
+            UNION ALL
+            SELECT DATE(bet_timestamp), defendant_id, 0, COUNT(*)
+            FROM Bet_Ledger WHERE bet_timestamp >= %s
+            GROUP BY 1, 2
+        ) a GROUP BY day, badge_no
+        ON DUPLICATE KEY UPDATE case_updates = VALUES(case_updates), bets = VALUES(bets)"""
+
+    _BET_ROLLUP = """INSERT INTO Bet_Daily (day, bets, settled, won)
+        SELECT DATE(bet_timestamp), COUNT(*),
+               SUM(outcome LIKE '%%Won%%' OR outcome LIKE '%%Lost%%'),
+               SUM(outcome LIKE '%%Won%%')
+        FROM Bet_Ledger WHERE bet_timestamp >= %s GROUP BY 1
+        ON DUPLICATE KEY UPDATE bets = VALUES(bets), settled = VALUES(settled),
+                                won = VALUES(won)"""
+
+    _BUCKET_TABLES = ("Detective_Activity_Daily", "Bet_Daily")
+
+    # Named server lock held while the rollups are rewritten
+    _BUCKETS_LOCK = "dna_activity_buckets"
+
+    def refresh_activity_buckets(self, full: bool = False, wait: float = 0) -> str:
+        """Brings the daily rollups up to date, appending only new buckets.
+
+        Run it from a scheduled job (src/rollups.py) or an explicit action;
+        the analytics reads never write. Each rollup is re-aggregated from its
+        newest (possibly still partial) day onwards and upserted, a short range
+        scan on the timestamp indexes that is safe to repeat. Rows inserted
+        with older timestamps, or removed by delete_case(), are only picked up
+        by a `full` rebuild. A server-side GET_LOCK lets one session refresh
+        at a time; others wait up to `wait` seconds and then skip.
+        """
+        with self._get_pool().connection():
+            if not self.fetch_value(
+                "SELECT GET_LOCK(%s, %s)", (self._BUCKETS_LOCK, wait)
+            ):
+                return "Skipped: the rollups are being refreshed by another session."
+            try:
+                steps, rollups = [], []
+                for table, rollup, repeat in (
+                    ("Detective_Activity_Daily", self._ACTIVITY_ROLLUP, 3),
+                    ("Bet_Daily", self._BET_ROLLUP, 1),
+                ):
+                    if full:
+                        since = datetime.date.min.replace(year=1000)
+                        steps.append((f"DELETE FROM {table}", None))
+                    else:
+                        since = self.fetch_value(f"SELECT MAX(day) FROM {table}")
+                        since = since or datetime.date.min.replace(year=1000)
+                    rollups.append(len(steps))
+                    steps.append((rollup, (since,) * repeat))
+                rowcounts = self.execute_transaction(steps, tables=self._BUCKET_TABLES)
+            finally:
+                self.fetch_value("SELECT RELEASE_LOCK(%s)", (self._BUCKETS_LOCK,))
+        written = sum(rowcounts[i] for i in rollups)
+        return f"Success: {written} bucket row(s) written."
+
+    def _range_filter(self, column: str, start, end) -> Tuple[str, Tuple]:
+        """WHERE clause for start <= column < end (either bound may be None)."""
+        clauses, params = [], ()
+        if start is not None:
+            clauses.append(f"{column} >= %s")
+            params += (start,)
+        if end is not None:
+            clauses.append(f"{column} < %s")
+            params += (end,)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _bucket_expr(self, bucket: str, column: str) -> str:
+        if bucket not in self._BUCKETS:
+            raise ValueError(f"bucket must be one of: {', '.join(self._BUCKETS)}")
+        return self._BUCKETS[bucket].format(col=column)
+
+    @operation
+    def get_detective_activity(
+        self,
+        start=None,
+        end=None,
+        bucket: str = "day",
+        badge_no: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Case updates written and bets taken per detective per day or week.
+
+        `start`/`end` (dates or datetimes, end exclusive) limit the range.
+        """
+        expr = self._bucket_expr(bucket, "a.day")
+        where, params = self._range_filter("a.day", start, end)
+        if badge_no is not None:
+            where += (" AND" if where else " WHERE") + " a.badge_no = %s"
+            params += (badge_no,)
+        sql = f"""SELECT {expr} AS bucket, a.badge_no,
+                  CONCAT(d.first_name, ' ', d.last_name) AS detective,
+                  SUM(a.case_updates) AS case_updates, SUM(a.bets) AS bets
+                  FROM Detective_Activity_Daily a JOIN Detective d ON d.badge_no = a.badge_no
+                  {where}
+                  GROUP BY bucket, a.badge_no, d.first_name, d.last_name
+                  ORDER BY bucket, a.badge_no"""
+        return self.execute_query(
+            sql, params, tables=("Detective_Activity_Daily", "Detective")
+        )
+
+    @operation
+    def get_bet_win_rates(
+        self, start=None, end=None, window_days: int = 30
+    ) -> pd.DataFrame:
+        """Daily bets with the win rate over a sliding `window_days` window.
+
+        A bet is settled once its outcome says Won or Lost; the window rate is
+        won / settled over the `window_days` days ending on each row's day.
+        """
+        window_days = max(int(window_days), 1)
+        if isinstance(start, str):
+            start = datetime.date.fromisoformat(start[:10])
+        # Read back far enough that the first rows have a full window
+        lead_in = (
+            start - datetime.timedelta(days=window_days - 1)
+            if isinstance(start, datetime.date)
+            else start
+        )
+        where, params = self._range_filter("day", lead_in, end)
+        outer, outer_params = self._range_filter("day", start, None)
+        sql = f"""SELECT * FROM (
+                    SELECT day, bets, settled, won,
+                           SUM(settled) OVER w AS window_settled,
+                           SUM(won) OVER w AS window_won,
+                           CAST(SUM(won) OVER w / NULLIF(SUM(settled) OVER w, 0) AS DOUBLE)
+                               AS win_rate
+                    FROM Bet_Daily{where}
+                    WINDOW w AS (ORDER BY day
+                                 RANGE BETWEEN INTERVAL {window_days - 1} DAY PRECEDING
+                                 AND CURRENT ROW)
+                  ) r{outer} ORDER BY day"""
+        return self.execute_query(sql, params + outer_params, tables=("Bet_Daily",))
+
+    @operation
+    def get_case_update_velocity(
+        self, start=None, end=None, bucket: str = "week"
+    ) -> pd.DataFrame:
+        """Case updates per bucket, cases touched and mean hours between a case's updates.
+
+        Computed on the server straight from Case_Update over the requested
+        range (a range scan on idx_update_time).
+        """
+        expr = self._bucket_expr(bucket, "DATE(update_timestamp)")
+        where, params = self._range_filter("update_timestamp", start, end)
+        sql = f"""SELECT bucket, COUNT(*) AS updates, COUNT(DISTINCT case_id) AS cases,
+                  CAST(AVG(gap) / 3600 AS DOUBLE) AS avg_hours_between_updates
+                  FROM (SELECT case_id, {expr} AS bucket,
+                               TIMESTAMPDIFF(SECOND, LAG(update_timestamp) OVER (
+                                   PARTITION BY case_id ORDER BY update_timestamp),
+                                   update_timestamp) AS gap
+                        FROM Case_Update{where}) u
+                  GROUP BY bucket ORDER BY bucket"""
+        return self.execute_query(sql, params, tables=("Case_Update",))
+
+    # ==========================================
+    #  CRIMINAL NETWORK (In-memory graph index)
+    # ==========================================
+
+    # Node type -> (SQL returning (id, label) pairs, id column)
+    _NETWORK_LABELS = {
+        "perp": (
+            """SELECT p.perp_id, CONCAT(COALESCE(p.primary_alias, '?'), ' (', poi.name, ')')
+               FROM Perpetrator p JOIN Person_Of_Interest poi ON p.person_id = poi.person_id""",
+            "p.perp_id",
+        ),
+        "case": ("SELECT case_id, case_title FROM Case_File", "case_id"),
+        "detective": (
+            "SELECT badge_no, CONCAT(first_name, ' ', last_name) FROM Detective",
+            "badge_no",
+        ),
+    }
+
+    def network_index(self, max_age: float = 300.0) -> GraphIndex:
+        """Returns the shared graph index, building or refreshing it first if stale.
+
+        Writes made through any DatabaseManager in this process re-diff only
+        the edge tables they touched; writes from other processes are picked
+        up by a full re-diff once the index is older than `max_age` seconds.
+        """
+        index = self.graph
+        with index.lock:
+            sequence, changed = self.changes.changes_since(index.sequence)
+            if index.sequence < 0:
+                index.build(self, sequence)
+            elif time.time() - index.verified_at > max_age:
+                index.refresh(self, None, sequence)
+            elif changed is None or changed:
+                index.refresh(self, changed, sequence)
+        return index
+
+    def _network_frame(self, nodes: List[NodeKey], **extra) -> pd.DataFrame:
+        """Builds a DataFrame of nodes with human-readable labels."""
+        import pandas as pd
+
+        labels: Dict[NodeKey, str] = {}
+        for node_type, (sql, id_col) in self._NETWORK_LABELS.items():
+            ids = sorted({node_id for kind, node_id in nodes if kind == node_type})
+            for i in range(0, len(ids), 1000):
+                chunk = tuple(ids[i : i + 1000])
+                where = f" WHERE {id_col} IN (" + ", ".join(["%s"] * len(chunk)) + ")"
+                frame = self.execute_query(sql + where, chunk)
+                for node_id, label in frame.itertuples(index=False, name=None):
+                    labels[(node_type, node_id)] = label
+        return pd.DataFrame(
+            {
+                "node_type": [kind for kind, _ in nodes],
+                "node_id": [node_id for _, node_id in nodes],
+                "label": [labels.get(n, n[1]) for n in nodes],
+                **extra,
+            }
+        )
+
+    @operation
+    def get_network_neighborhood(
+        self, node_type: str, node_id: Any, hops: int = 2, limit: int = 1000
+    ) -> pd.DataFrame:
+        """Everything within `hops` links of a perp, case, detective or associate."""
+        try:
+            found = self.network_index().k_hop((node_type, node_id), hops, limit)
+        except KeyError as e:
+            raise Exception(f"Query Error: {e.args[0]}")
+        found.sort(key=lambda item: (item[1], item[0][0], str(item[0][1])))
+        return self._network_frame([n for n, _ in found], hops=[h for _, h in found])
+
+    @operation
+    def get_network_path(
+        self, source: NodeKey, target: NodeKey, max_hops: int = 12
+    ) -> pd.DataFrame:
+        """Shortest chain of links between two nodes (empty if unconnected)."""
+        try:
+            path = self.network_index().shortest_path(source, target, max_hops)
+        except KeyError as e:
+            raise Exception(f"Query Error: {e.args[0]}")
+        return self._network_frame(path, step=list(range(len(path))))
+
+    @operation
+    def get_network_components(self, min_size: int = 2) -> pd.DataFrame:
+        """Connected groups of the network, largest first, with their makeup."""
+        import pandas as pd
+
+        index = self.network_index()
+        with index.lock:
+            labels = index.components()
+            keys = list(index.keys)
+        groups: Dict[int, List[NodeKey]] = {}
+        for node, root in enumerate(labels):
+            groups.setdefault(root, []).append(keys[node])
+        rows = []
+        for members in groups.values():
+            if len(members) < min_size:
+                continue
+            kinds = [kind for kind, _ in members]
+            rows.append(
+                {
+                    "size": len(members),
+                    "perps": kinds.count("perp"),
+                    "cases": kinds.count("case"),
+                    "detectives": kinds.count("detective"),
+                    "associates": kinds.count("associate"),
+                    "sample_cases": ", ".join(
+                        str(node_id)
+                        for kind, node_id in members[:200]
+                        if kind == "case"
+                    )[:80],
+                }
+            )
+        rows.sort(key=lambda r: -r["size"])
+        return pd.DataFrame(
+            rows,
+            columns=[
+                "size",
+                "perps",
+                "cases",
+                "detectives",
+                "associates",
+                "sample_cases",
+            ],
+        )
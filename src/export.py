@@ -0,0 +1,235 @@
+import argparse
+import bz2
+import gzip
+import io
+import lzma
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import pandas as pd
+
+from db_utils import DatabaseManager, add_connection_args, config_from_args
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+
+# Stream compression for the text formats (Parquet compresses per column)
+_OPENERS: Dict[str, Callable] = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+# Read operations that can be exported -> the arguments they take
+EXPORTABLE_OPERATIONS = {
+    "get_squad_roster": ("squad_name",),
+    "get_case_load": (),
+    "get_heist_winners": (),
+    "search_evidence": ("keyword",),
+    "get_perpetrator_network": (),
+    "get_unsolved_cases": (),
+    "get_resource_custody": (),
+    "get_betting_history": (),
+    "get_interview_logs": (),
+    "get_detective_specializations": (),
+}
+
+
+def infer_format(path: str) -> Tuple[str, Optional[str]]:
+    """Guesses (format, compression) from a file name like cases.csv.gz."""
+    name = path.lower()
+    compression = None
+    for ext, kind in _EXTENSIONS.items():
+        if name.endswith(ext):
+            compression, name = kind, name[: -len(ext)]
+    for fmt in EXPORT_FORMATS:
+        if name.endswith("." + fmt) or (fmt == "jsonl" and name.endswith(".json")):
+            return fmt, compression
+    return "csv", compression
+
+
+def table_query(db: DatabaseManager, table: str) -> Tuple[str, None]:
+    """Returns the SELECT for a whole table (the name is checked against the schema)."""
+    tables = set(db.execute_query("SHOW TABLES").iloc[:, 0])
+    if table not in tables:
+        raise ValueError(f"Unknown table '{table}'.")
+    return f"SELECT * FROM `{table}`", None
+
+
+def operation_query(db: DatabaseManager, name: str, *args) -> Tuple[str, Any]:
+    """Returns the SQL a read operation would run, without running it."""
+    if name not in EXPORTABLE_OPERATIONS:
+        raise ValueError(
+            f"Unknown read operation '{name}'. "
+            f"Use one of: {', '.join(EXPORTABLE_OPERATIONS)}"
+        )
+    expected = EXPORTABLE_OPERATIONS[name]
+    if len(args) != len(expected):
+        raise ValueError(f"{name} takes {len(expected)} argument(s): {expected}")
+    return db.capture_query(lambda: getattr(db, name)(*args))
+
+
+def _open_binary(destination: Union[str, io.IOBase], compression: Optional[str]):
+    if compression is not None and compression not in _OPENERS:
+        raise ValueError(f"Unsupported compression '{compression}'.")
+    if isinstance(destination, str):
+        if compression:
+            return _OPENERS[compression](destination, "wb")
+        return open(destination, "wb")
+    if compression:
+        return _OPENERS[compression](destination, "wb")
+    return destination
+
+
+def _write_text(chunks: Iterator[pd.DataFrame], fmt: str, out, progress) -> int:
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    rows = 0
+    try:
+        for chunk in chunks:
+            if fmt == "csv":
+                chunk.to_csv(text, header=rows == 0, index=False)
+            elif len(chunk):
+                # pandas >= 2 ends JSON Lines output with a newline
+                chunk.to_json(text, orient="records", lines=True, date_format="iso")
+            rows += len(chunk)
+            progress(rows)
+        text.flush()
+    finally:
+        text.detach()
+    return rows
+
+
+def _write_parquet(
+    chunks: Iterator[pd.DataFrame], out, compression: Optional[str], progress
+) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Parquet export requires pyarrow (pip install pyarrow).")
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            # Plain strings keep every chunk on one schema (category codes vary)
+            for col in chunk.select_dtypes("category"):
+                chunk[col] = chunk[col].astype(object)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = pa.schema(
+                    [
+                        f.with_type(pa.string()) if pa.types.is_null(f.type) else f
+                        for f in table.schema
+                    ]
+                )
+                writer = pq.ParquetWriter(
+                    out, schema, compression=compression or "snappy"
+                )
+            writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+            progress(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def export_query(
+    db: DatabaseManager,
+    query: str,
+    params: Optional[Tuple],
+    destination: Union[str, io.IOBase],
+    fmt: Optional[str] = None,
+    compression: Optional[str] = None,
+    chunk_size: int = 10000,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Streams a SELECT into a CSV, JSON Lines or Parquet file.
+
+    Rows come from an unbuffered cursor `chunk_size` at a time and each chunk
+    is written before the next is fetched, so memory stays flat however large
+    the result is. `destination` is a path or a binary stream; for paths the
+    format and compression default to what the file name says.
+    """
+    if isinstance(destination, str):
+        guessed_fmt, guessed_compression = infer_format(destination)
+        fmt = fmt or guessed_fmt
+        compression = compression or guessed_compression
+    fmt = fmt or "csv"
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unknown format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    start = time.perf_counter()
+    progress = on_progress or (lambda rows: None)
+    chunks = db.iter_chunks(query, params, chunksize=chunk_size)
+    if fmt == "parquet":
+        # Parquet compresses column pages itself (snappy, gzip, zstd, ...)
+        rows = _write_parquet(chunks, destination, compression, progress)
+    else:
+        out = _open_binary(destination, compression)
+        try:
+            rows = _write_text(chunks, fmt, out, progress)
+        finally:
+            if out is not destination:
+                out.close()
+    return {
+        "rows": rows,
+        "format": fmt,
+        "compression": compression,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Export a table or read operation to CSV, JSON Lines or Parquet."
+    )
+    add_connection_args(parser)
+    sub = parser.add_subparsers(dest="source", required=True)
+    tbl = sub.add_parser("table", help="Export a whole table")
+    tbl.add_argument("name")
+    op = sub.add_parser("operation", help="Export a read operation's result")
+    op.add_argument("name", choices=list(EXPORTABLE_OPERATIONS))
+    op.add_argument("args", nargs="*", help="Operation arguments, e.g. a squad name")
+    for p in (tbl, op):
+        p.add_argument("output", help="File name; the extension picks the format")
+        p.add_argument("--format", choices=EXPORT_FORMATS, default=None)
+        p.add_argument(
+            "--compression",
+            default=None,
+            help="gzip/bz2/xz for text formats; snappy/gzip/zstd for Parquet",
+        )
+        p.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(config_from_args(args), log_file=None, use_cache=False)
+    success, msg = db.connect()
+    if not success:
+        print(msg)
+        sys.exit(1)
+
+    if args.source == "table":
+        query, params = table_query(db, args.name)
+    else:
+        query, params = operation_query(db, args.name, *args.args)
+
+    summary = export_query(
+        db,
+        query,
+        params,
+        args.output,
+        fmt=args.format,
+        compression=args.compression,
+        chunk_size=args.chunk_size,
+        on_progress=lambda n: print(f"\r{n} rows written...", end="", flush=True),
+    )
+    print(
+        f"\rExported {summary['rows']} row(s) to {args.output} "
+        f"({summary['format']}, {summary['compression'] or 'uncompressed'}) "
+        f"in {summary['seconds']:.1f}s."
+    )
+
+
+if __name__ == "__main__":
+    main()
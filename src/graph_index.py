@@ -0,0 +1,315 @@
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+NodeKey = Tuple[
+    str, Any
+]  # ("perp", 1), ("case", 101), ("detective", 9903), ("associate", "name")
+
+# Edge table -> [(SQL returning (left_id, right_id) pairs, left type, right type)]
+EDGE_SOURCES: Dict[str, List[Tuple[str, str, str]]] = {
+    "Targets": [("SELECT perp_id, case_id FROM Targets", "perp", "case")],
+    "Records_Interview": [
+        (
+            "SELECT DISTINCT badge_no, perp_id FROM Records_Interview",
+            "detective",
+            "perp",
+        ),
+        (
+            "SELECT DISTINCT badge_no, case_id FROM Records_Interview",
+            "detective",
+            "case",
+        ),
+    ],
+    "Perpetrator_Known_Associate": [
+        (
+            "SELECT perp_id, associate_name FROM Perpetrator_Known_Associate",
+            "perp",
+            "associate",
+        ),
+    ],
+}
+
+# Overlay size (as a fraction of CSR edges) that triggers a compaction
+COMPACT_RATIO = 0.1
+
+
+def _encode(u: int, v: int) -> int:
+    """Packs an undirected edge into one int with the smaller node first."""
+    if u > v:
+        u, v = v, u
+    return (u << 32) | v
+
+
+def _decode(edge: int) -> Tuple[int, int]:
+    return edge >> 32, edge & 0xFFFFFFFF
+
+
+class GraphIndex:
+    """
+    In-memory index of the criminal network.
+
+    Nodes are perpetrators, cases, detectives and named associates; edges come
+    from Targets, Records_Interview and Perpetrator_Known_Associate. Adjacency
+    is stored in CSR form (an offsets array plus one flat neighbor array), and
+    each edge table keeps a sorted array of packed edges. A refresh re-reads
+    only the edge tables that changed, diffs them against the stored arrays
+    and applies the difference to a small add/remove overlay, which is folded
+    back into the CSR arrays once it grows past COMPACT_RATIO.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.keys: List[NodeKey] = []
+        self.ids: Dict[NodeKey, int] = {}
+        self.offsets = array("q", [0])
+        self.neighbors_flat = array("q")
+        self.table_edges: Dict[str, array] = {}
+        self.added: Dict[int, Set[int]] = {}
+        self.removed: Set[int] = set()
+        self.overlay_size = 0
+        self.sequence = -1
+        self.verified_at = 0.0  # last time every edge table was (re)read
+
+    # ------------------------------------------
+    #  Building & refreshing
+    # ------------------------------------------
+
+    def _node(self, key: NodeKey) -> int:
+        node = self.ids.get(key)
+        if node is None:
+            node = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+        return node
+
+    def _load_table(self, db, table: str) -> array:
+        """Reads one edge table as a sorted array of packed edges."""
+        edges = set()
+        for sql, left, right in EDGE_SOURCES[table]:
+            for a, b in self._rows(db, sql):
+                edges.add(_encode(self._node((left, a)), self._node((right, b))))
+        return array("q", sorted(edges))
+
+    @staticmethod
+    def _rows(db, sql: str) -> Iterator[Tuple]:
+        for chunk in db.iter_chunks(sql, chunksize=50000):
+            yield from chunk.itertuples(index=False, name=None)
+
+    def build(self, db, sequence: int = 0):
+        """Loads every edge table and builds the CSR arrays from scratch."""
+        with self.lock:
+            self._reset()
+            for table in EDGE_SOURCES:
+                self.table_edges[table] = self._load_table(db, table)
+            self._compact()
+            self.sequence = sequence
+            self.verified_at = time.time()
+
+    def refresh(self, db, changed: Optional[Set[str]], sequence: int) -> List[str]:
+        """Re-diffs the changed edge tables (all of them if `changed` is None)."""
+        with self.lock:
+            tables = [
+                t for t in EDGE_SOURCES if changed is None or t.lower() in changed
+            ]
+            for table in tables:
+                old = self.table_edges.get(table, array("q"))
+                new = self._load_table(db, table)
+                for edge in self._difference(new, old):
+                    self._add_edge(edge)
+                for edge in self._difference(old, new):
+                    self._remove_edge(edge)
+                self.table_edges[table] = new
+            if self.overlay_size > COMPACT_RATIO * max(
+                len(self.neighbors_flat) // 2, 1000
+            ):
+                self._compact()
+            self.sequence = sequence
+            if changed is None:
+                self.verified_at = time.time()
+            return tables
+
+    @staticmethod
+    def _difference(a: array, b: array) -> Iterator[int]:
+        """Yields items of sorted array `a` that are not in sorted array `b`."""
+        j, nb = 0, len(b)
+        for x in a:
+            while j < nb and b[j] < x:
+                j += 1
+            if j >= nb or b[j] != x:
+                yield x
+
+    def _all_edges(self) -> Iterator[int]:
+        # Edge tables connect different node-type pairs, so they never overlap
+        for table_edges in self.table_edges.values():
+            yield from table_edges
+
+    def _add_edge(self, edge: int):
+        if edge in self.removed:
+            self.removed.discard(edge)
+        else:
+            u, v = _decode(edge)
+            self.added.setdefault(u, set()).add(v)
+            self.added.setdefault(v, set()).add(u)
+        self.overlay_size += 1
+
+    def _remove_edge(self, edge: int):
+        u, v = _decode(edge)
+        if v in self.added.get(u, ()):
+            self.added[u].discard(v)
+            self.added[v].discard(u)
+        else:
+            self.removed.add(edge)
+        self.overlay_size += 1
+
+    def _compact(self):
+        """Folds the overlay back into fresh CSR arrays."""
+        n = len(self.keys)
+        degree = array("q", bytes(8 * (n + 1)))
+        for edge in self._all_edges():
+            u, v = _decode(edge)
+            degree[u + 1] += 1
+            degree[v + 1] += 1
+        for i in range(n):
+            degree[i + 1] += degree[i]
+        offsets = array("q", degree)
+        fill = array("q", degree[:-1]) if n else array("q")
+        flat = array("q", bytes(8 * offsets[-1]))
+        for edge in self._all_edges():
+            u, v = _decode(edge)
+            flat[fill[u]] = v
+            fill[u] += 1
+            flat[fill[v]] = u
+            fill[v] += 1
+        self.offsets, self.neighbors_flat = offsets, flat
+        self.added, self.removed, self.overlay_size = {}, set(), 0
+
+    # ------------------------------------------
+    #  Queries
+    # ------------------------------------------
+
+    def neighbors(self, u: int) -> Iterator[int]:
+        if u + 1 < len(self.offsets):
+            start, end = self.offsets[u], self.offsets[u + 1]
+            if self.removed:
+                for v in self.neighbors_flat[start:end]:
+                    if _encode(u, v) not in self.removed:
+                        yield v
+            else:
+                yield from self.neighbors_flat[start:end]
+        yield from self.added.get(u, ())
+
+    def lookup(self, key: NodeKey) -> int:
+        node = self.ids.get(key)
+        if node is None:
+            raise KeyError(f"{key[0]} {key[1]} is not part of the network")
+        return node
+
+    def k_hop(
+        self, key: NodeKey, k: int, limit: int = 1000
+    ) -> List[Tuple[NodeKey, int]]:
+        """Breadth-first neighborhood: [(node, hops)] up to `k` hops away."""
+        with self.lock:
+            start = self.lookup(key)
+            seen = {start: 0}
+            queue = deque([start])
+            while queue and len(seen) < limit:
+                u = queue.popleft()
+                if seen[u] >= k:
+                    continue
+                for v in self.neighbors(u):
+                    if v not in seen:
+                        seen[v] = seen[u] + 1
+                        queue.append(v)
+                        if len(seen) >= limit:
+                            break
+            return [(self.keys[n], hops) for n, hops in seen.items()]
+
+    def shortest_path(
+        self, source: NodeKey, target: NodeKey, max_hops: int = 12
+    ) -> List[NodeKey]:
+        """Unweighted shortest path (bidirectional BFS); [] if none within max_hops."""
+        with self.lock:
+            s, t = self.lookup(source), self.lookup(target)
+            if s == t:
+                return [source]
+            parents = [{s: None}, {t: None}]
+            frontiers = [[s], [t]]
+            for _ in range(max_hops):
+                side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+                nxt = []
+                for u in frontiers[side]:
+                    for v in self.neighbors(u):
+                        if v in parents[side]:
+                            continue
+                        parents[side][v] = u
+                        if v in parents[1 - side]:
+                            return self._join_path(parents, v)
+                        nxt.append(v)
+                if not nxt:
+                    return []
+                frontiers[side] = nxt
+            return []
+
+    def _join_path(
+        self, parents: List[Dict[int, Optional[int]]], meet: int
+    ) -> List[NodeKey]:
+        left, node = [], meet
+        while node is not None:
+            left.append(node)
+            node = parents[0][node]
+        right, node = [], parents[1][meet]
+        while node is not None:
+            right.append(node)
+            node = parents[1][node]
+        return [self.keys[n] for n in reversed(left)] + [self.keys[n] for n in right]
+
+    def components(self) -> array:
+        """Labels every node with a connected-component id (smallest node index)."""
+        with self.lock:
+            n = len(self.keys)
+            label = array("q", [-1]) * n
+            for root in range(n):
+                if label[root] != -1:
+                    continue
+                label[root] = root
+                stack = [root]
+                while stack:
+                    u = stack.pop()
+                    for v in self.neighbors(u):
+                        if label[v] == -1:
+                            label[v] = root
+                            stack.append(v)
+            return label
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "nodes": len(self.keys),
+                "edges": sum(len(t) for t in self.table_edges.values()),
+                "overlay": self.overlay_size,
+                "verified_at": self.verified_at,
+                "sequence": self.sequence,
+            }
+
+
+# ==========================================
+#  PROCESS-WIDE INDEX REGISTRY
+# ==========================================
+
+_indexes: Dict[Tuple, GraphIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_graph_index(config: Dict[str, str]) -> GraphIndex:
+    """Returns the index shared by every DatabaseManager on the same database."""
+    key = (config["host"], config["database"])
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = GraphIndex()
+        return index
@@ -0,0 +1,305 @@
+import datetime
+import decimal
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymysql.constants import FIELD_TYPE
+
+# Declared SQLite column types whose values are turned back into Python objects
+sqlite3.register_converter(
+    "MYSQL_DATETIME", lambda b: datetime.datetime.fromisoformat(b.decode())
+)
+sqlite3.register_converter(
+    "MYSQL_DATE", lambda b: datetime.date.fromisoformat(b.decode())
+)
+sqlite3.register_converter("MYSQL_DECIMAL", lambda b: decimal.Decimal(b.decode()))
+
+# information_schema DATA_TYPE -> SQLite column declaration
+_INTEGER = {"tinyint", "smallint", "mediumint", "int", "bigint", "year"}
+_REAL = {"float", "double"}
+_CONVERTED = {
+    "decimal": "MYSQL_DECIMAL",
+    "datetime": "MYSQL_DATETIME",
+    "timestamp": "MYSQL_DATETIME",
+    "date": "MYSQL_DATE",
+}
+
+# loaded_at value of a copy that must be reloaded before its next read
+STALE = float("-inf")
+
+# Python value type -> MySQL type code reported to columnar.build_frame
+_RESULT_TYPES = (
+    (bool, FIELD_TYPE.TINY),
+    (int, FIELD_TYPE.LONGLONG),
+    (float, FIELD_TYPE.DOUBLE),
+    (datetime.datetime, FIELD_TYPE.DATETIME),
+)
+
+# Small, frequently read tables copied by default; reads that touch any other
+# table (the large case tables, archives, rollups) go to the server
+REPLICATED_TABLES = (
+    "Squad",
+    "Detective",
+    "Detective_Specialization",
+    "Detective_Case_Load",
+    "Halloween_Heist",
+    "Precinct_Resource",
+    "Custodian_Of",
+    "Person_Of_Interest",
+    "Perpetrator",
+    "Perpetrator_Known_Associate",
+)
+
+_COLUMNS_SQL = """SELECT c.table_name, c.column_name, c.data_type, c.column_key
+                  FROM information_schema.COLUMNS c JOIN information_schema.TABLES t
+                  ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+                  WHERE c.table_schema = DATABASE() AND t.table_type = 'BASE TABLE'
+                  AND c.table_name IN ({tables})
+                  ORDER BY c.table_name, c.ordinal_position"""
+
+
+def _declaration(data_type: str) -> str:
+    data_type = data_type.lower()
+    if data_type in _INTEGER:
+        return "INTEGER"
+    if data_type in _REAL:
+        return "REAL"
+    if data_type in _CONVERTED:
+        return _CONVERTED[data_type]
+    # MySQL's default *_ci collations compare text case-insensitively
+    return "TEXT COLLATE NOCASE"
+
+
+def _to_sqlite(value: Any) -> Any:
+    """Stores values SQLite has no type for as text (read back by the converters)."""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(" ")
+    if isinstance(value, (datetime.date, decimal.Decimal, datetime.timedelta)):
+        return str(value)
+    return value
+
+
+def _mysql_concat(*args):
+    """MySQL CONCAT(): NULL if any argument is NULL."""
+    if any(a is None for a in args):
+        return None
+    return "".join(str(a) for a in args)
+
+
+def _describe(names: List[str], rows: List[Tuple]) -> List[Tuple]:
+    """A DB-API style description with type codes inferred from the values."""
+    description = []
+    for i, name in enumerate(names):
+        sample = next((row[i] for row in rows if row[i] is not None), None)
+        type_code = next(
+            (code for kind, code in _RESULT_TYPES if isinstance(sample, kind)), None
+        )
+        description.append((name, type_code, None, None, None, None, None))
+    return description
+
+
+class LocalReplica:
+    """
+    Embedded SQLite copy of a few small, hot tables for serving reads locally.
+
+    Only the tables in `tables` are copied, each on its first read. A copy
+    is reloaded when the change feed reports a write to it from this process,
+    and otherwise once it is older than `max_staleness` seconds, which bounds
+    how long writes from other processes stay invisible. Reloads fetch from the
+    server without holding the replica lock, so reads of other tables continue
+    meanwhile; only the final swap into SQLite is serialised. Queries over any
+    other table, or SQL the SQLite dialect cannot run (e.g. MATCH ... AGAINST),
+    are reported as unservable and the caller falls back to the server.
+    """
+
+    def __init__(
+        self,
+        max_staleness: float = 30.0,
+        batch_size: int = 5000,
+        tables: Iterable[str] = REPLICATED_TABLES,
+    ):
+        self.max_staleness = max_staleness
+        self.batch_size = batch_size
+        self.allowed = {t.lower() for t in tables}
+        self.lock = threading.RLock()  # guards the SQLite connection and state
+        self.conn = sqlite3.connect(
+            ":memory:",
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None,  # transactions are opened explicitly in _load()
+        )
+        self.conn.create_function("CONCAT", -1, _mysql_concat)
+        self.names: Dict[str, str] = {}  # lower-case name -> table name
+        self.loaded_at: Dict[str, float] = {}  # lower-case name -> load time
+        # Bumped whenever a copy is marked stale, so a reload that overlapped
+        # a write does not mark its (possibly older) rows as fresh
+        self.versions: Dict[str, int] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._snapshot_lock = threading.Lock()
+        self.sequence = -1
+        self.hits = 0
+        self.fallbacks = 0
+        self.reloads = 0
+
+    # ------------------------------------------
+    #  Loading
+    # ------------------------------------------
+
+    def snapshot(self, db, sequence: int):
+        """Creates the (empty) copies of the replicated tables; rows load on first read."""
+        if not self.allowed:
+            return
+        sql = _COLUMNS_SQL.format(tables=", ".join(["%s"] * len(self.allowed)))
+        schema: Dict[str, List[Tuple[str, str, str]]] = {}
+        for _, rows in db.iter_batches(sql, tuple(sorted(self.allowed))):
+            for table, column, data_type, key in rows:
+                schema.setdefault(table, []).append((column, data_type, key))
+        with self.lock:
+            for table in list(self.names.values()):
+                self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            self.names.clear()
+            self.loaded_at.clear()
+            for table, columns in schema.items():
+                self._create(table, columns)
+                self.loaded_at[table.lower()] = STALE
+                self.versions[table.lower()] = self.versions.get(table.lower(), 0) + 1
+                self._load_locks.setdefault(table.lower(), threading.Lock())
+            self.sequence = sequence
+
+    def _create(self, table: str, columns: List[Tuple[str, str, str]]):
+        defs = [f'"{name}" {_declaration(data_type)}' for name, data_type, _ in columns]
+        keys = [f'"{name}"' for name, _, key in columns if key == "PRI"]
+        if keys:
+            defs.append(f"PRIMARY KEY ({', '.join(keys)})")
+        self.conn.execute(f'CREATE TABLE "{table}" ({", ".join(defs)})')
+        self.names[table.lower()] = table
+
+    def _load(self, db, key: str):
+        """Replaces the copy of one table with the server's current rows."""
+        with self.lock:
+            table = self.names[key]
+            version = self.versions[key]
+        rows: List[Tuple] = []
+        marks = ""
+        for columns, batch in db.iter_batches(
+            f"SELECT * FROM `{table}`", batch_size=self.batch_size
+        ):
+            marks = ", ".join("?" * len(columns))
+            rows.extend(tuple(_to_sqlite(v) for v in row) for row in batch)
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.execute(f'DELETE FROM "{table}"')
+                if rows:
+                    self.conn.executemany(
+                        f'INSERT INTO "{table}" VALUES ({marks})', rows
+                    )
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            if self.versions[key] == version:
+                self.loaded_at[key] = time.monotonic()
+            self.reloads += 1
+
+    def _mark_stale(self, keys: Iterable[str]):
+        for key in keys:
+            if key in self.loaded_at:
+                self.loaded_at[key] = STALE
+                self.versions[key] += 1
+
+    def _is_stale(self, key: str) -> bool:
+        return time.monotonic() - self.loaded_at[key] > self.max_staleness
+
+    def sync(self, db, tables: Iterable[str]):
+        """Reloads the given tables if a write touched them or they are too old.
+
+        At most one thread reloads a given table; others needing it wait for
+        that load instead of starting their own.
+        """
+        with self.lock:
+            sequence, changed = db.changes.changes_since(self.sequence)
+            self._mark_stale(self.loaded_at if changed is None else changed)
+            self.sequence = sequence
+            stale = [t.lower() for t in tables if self._is_stale(t.lower())]
+        for key in stale:
+            with self._load_locks[key]:
+                with self.lock:
+                    if not self._is_stale(key):
+                        continue  # another thread just reloaded it
+                self._load(db, key)
+
+    # ------------------------------------------
+    #  Reading
+    # ------------------------------------------
+
+    def query(
+        self, db, sql: str, params: Optional[Tuple], tables: Iterable[str]
+    ) -> Optional[Tuple[List[Tuple], List[Tuple]]]:
+        """Runs a read against the copy; returns (description, rows) or None.
+
+        None means the query cannot be served locally (a table that is not
+        replicated, or SQL that SQLite does not understand).
+        """
+        tables = tuple(tables)
+        if any(t.lower() not in self.allowed for t in tables):
+            with self.lock:
+                self.fallbacks += 1
+            return None
+        if self.sequence < 0:
+            with self._snapshot_lock:
+                if self.sequence < 0:
+                    self.snapshot(db, db.changes.sequence)
+        with self.lock:
+            if any(t.lower() not in self.names for t in tables):
+                self.fallbacks += 1
+                return None
+        self.sync(db, tables)
+        with self.lock:
+            # PyMySQL "format" placeholders -> SQLite "qmark" placeholders
+            local_sql = sql.replace("%s", "?").replace("%%", "%")
+            try:
+                cursor = self.conn.execute(
+                    local_sql, tuple(_to_sqlite(p) for p in params or ())
+                )
+                rows = cursor.fetchall()
+            except sqlite3.Error:
+                self.fallbacks += 1
+                return None
+            self.hits += 1
+        names = [col[0] for col in cursor.description]
+        return _describe(names, rows), rows
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/fallback counters and the age of the oldest table copy."""
+        with self.lock:
+            now = time.monotonic()
+            ages = [now - t for t in self.loaded_at.values() if t != STALE]
+            return {
+                "tables": len(self.names),
+                "hits": self.hits,
+                "fallbacks": self.fallbacks,
+                "reloads": self.reloads,
+                "max_age": max(ages) if ages else 0.0,
+            }
+
+    def invalidate(self):
+        """Forces every table to be reloaded on its next read."""
+        with self.lock:
+            self._mark_stale(list(self.loaded_at))
+
+
+_replicas: Dict[Tuple, LocalReplica] = {}
+_replicas_lock = threading.Lock()
+
+
+def get_local_replica(config: Dict[str, str], **options) -> LocalReplica:
+    """Returns the replica shared by every DatabaseManager on the same database."""
+    key = (config["host"], config["database"])
+    with _replicas_lock:
+        replica = _replicas.get(key)
+        if replica is None:
+            replica = _replicas[key] = LocalReplica(**options)
+        return replica
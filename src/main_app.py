@@ -1,8 +1,21 @@
+import asyncio
+import datetime
 import os
+import tempfile
+import time
 
+import pandas as pd
 import streamlit as st
 
+from async_db import AsyncDatabaseManager
+from bulk_import import IMPORT_KINDS, import_csv
 from db_utils import DatabaseManager
+from export import EXPORT_FORMATS, EXPORTABLE_OPERATIONS
+from local_replica import get_local_replica
+from metrics import REGISTRY, start_metrics_server
+from query_cache import get_result_cache
+from sql_logger import get_log_reader
+from table_pages import FILTER_OPS, TablePager, table_schema
 
 # Page Configuration
 st.set_page_config(
@@ -26,6 +39,20 @@ st.markdown(
 )
 
 
+# Optional Prometheus scrape endpoint (e.g. DNA_METRICS_PORT=9108)
+if os.environ.get("DNA_METRICS_PORT"):
+    start_metrics_server(int(os.environ["DNA_METRICS_PORT"]))
+
+# Dashboard activity-log filters: time range -> hours back (None = all)
+LOG_WINDOWS = {
+    "All": None,
+    "Last hour": 1,
+    "Last 24 hours": 24,
+    "Last 7 days": 24 * 7,
+}
+LOG_KINDS = ["SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "ALTER", "DROP"]
+
+
 def main():
     # ==========================================
     # Sidebar: Connection & Navigation
@@ -48,12 +75,66 @@ def main():
                 "password": db_pass,
                 "database": db_name,
             }
-            st.session_state.db_manager = DatabaseManager(config)
+            st.session_state.db_manager = DatabaseManager(config, use_slow_log=True)
+
+        with st.expander("Result Cache"):
+            use_cache = st.checkbox(
+                "Cache read results",
+                help="Repeated reads are answered from memory. Writes made in this "
+                "app clear the affected results; writes from other processes (CLI, "
+                "cron jobs, other app workers) only show up once the TTL expires.",
+            )
+            cache_ttl = st.number_input("TTL (s)", min_value=1, value=30, step=5)
+            manager = st.session_state.db_manager
+            if use_cache:
+                manager.cache = get_result_cache(manager.config)
+                manager.cache.ttl = float(cache_ttl)
+                stats = manager.cache_stats()
+                st.caption(
+                    f"Hits: {stats['hits']} | Misses: {stats['misses']} | "
+                    f"Hit rate: {stats['hit_rate']:.0%} | Entries: {stats['entries']}"
+                )
+                if st.button("Clear Cache"):
+                    manager.clear_cache()
+            else:
+                manager.cache = None
+
+        with st.expander("Local Replica"):
+            use_replica = st.checkbox(
+                "Serve reads from a local copy",
+                help="Reads of small, hot tables run against an in-memory SQLite "
+                "copy, refreshed after writes made here and when older than the limit.",
+            )
+            max_staleness = st.number_input(
+                "Max staleness (s)", min_value=1, value=30, step=5
+            )
+            manager = st.session_state.db_manager
+            if use_replica:
+                manager.replica = get_local_replica(manager.config)
+                manager.replica.max_staleness = float(max_staleness)
+                stats = manager.replica_stats()
+                st.caption(
+                    f"Tables: {stats['tables']} | Local reads: {stats['hits']} | "
+                    f"Server fallbacks: {stats['fallbacks']} | "
+                    f"Oldest copy: {stats['max_age']:.0f}s"
+                )
+            else:
+                manager.replica = None
 
         st.markdown("---")
         nav_option = st.radio(
             "Navigation",
-            ["Dashboard", "Queries (Read)", "Updates (Write)", "Table Inspector"],
+            [
+                "Dashboard",
+                "Queries (Read)",
+                "Updates (Write)",
+                "Table Inspector",
+                "Criminal Network",
+                "Activity Trends",
+                "Case Archive",
+                "Performance",
+                "Slow Queries",
+            ],
         )
 
     # ==========================================
@@ -79,24 +160,104 @@ def main():
         with col2:
             st.warning("✏️ **Updates**: 10 Operations available.")
 
-        st.subheader("Recent Activity Log")
-        st.caption("Showing executed SQL queries (Chronological Order)")
+        # Load the summaries concurrently over the shared pool
+        adb = st.session_state.get("async_db")
+        if adb is None or adb.db is not db:
+            if adb is not None:
+                adb.close()
+            adb = st.session_state.async_db = AsyncDatabaseManager.from_manager(db)
+
+        async def load_summaries():
+            return await adb.gather(
+                {
+                    "open": adb.get_unsolved_cases(timeout=10),
+                    "load": adb.get_case_load(timeout=10),
+                    "heist": adb.get_heist_winners(timeout=10),
+                    "bets": adb.get_betting_history(timeout=10),
+                }
+            )
 
-        if os.path.exists("sql_commands.log"):
-            try:
-                with open("sql_commands.log", "r") as f:
-                    lines = f.readlines()
+        start = time.perf_counter()
+        summaries = asyncio.run(load_summaries())
+        elapsed = (time.perf_counter() - start) * 1000
+
+        m1, m2, m3, m4 = st.columns(4)
+        for column, key, label in (
+            (m1, "open", "Open Cases"),
+            (m2, "load", "Detectives"),
+            (m3, "heist", "Heist Wins"),
+            (m4, "bets", "Bets Placed"),
+        ):
+            value = summaries[key]
+            if isinstance(value, Exception):
+                column.metric(label, "n/a")
+                column.caption(f"⚠️ {value}")
+            else:
+                column.metric(label, len(value))
+        st.caption(f"Summaries loaded concurrently in {elapsed:.0f} ms")
+
+        if not isinstance(summaries["load"], Exception):
+            with st.expander("Detective Case Load"):
+                st.dataframe(summaries["load"], use_container_width=True)
 
-                if lines:
-                    # Display lines in original chronological order
-                    log_content = "".join(lines)
-                    st.code(log_content, language="sql")
-                else:
-                    st.info("Log file is empty.")
-            except Exception as e:
-                st.error(f"Error reading log file: {e}")
-        else:
+        st.subheader("Recent Activity Log")
+        st.caption("Executed SQL, newest first")
+
+        reader = get_log_reader(db.log_file or "sql_commands.log")
+        try:
+            reader.refresh()
+        except OSError as e:
+            st.error(f"Error reading log file: {e}")
+        if not len(reader):
             st.info("No logs found yet.")
+        else:
+            c1, c2, c3, c4 = st.columns(4)
+            window = c1.selectbox("Time range", list(LOG_WINDOWS))
+            kinds = c2.multiselect("Statement type", LOG_KINDS)
+            table = c3.text_input("Table").strip()
+            page_size = c4.selectbox("Entries/page", [25, 50, 100, 250])
+            hours = LOG_WINDOWS[window]
+            since = (
+                datetime.datetime.now() - datetime.timedelta(hours=hours)
+                if hours
+                else None
+            )
+
+            # Cursor of each visited page; reset whenever the filters change
+            key = (window, tuple(kinds), table, page_size)
+            if st.session_state.get("log_filter") != key:
+                st.session_state.log_filter = key
+                st.session_state.log_cursors = [None]
+            cursors = st.session_state.log_cursors
+            entries, cursor = reader.page(
+                cursors[-1],
+                page_size,
+                since=since,
+                kinds=kinds,
+                table=table or None,
+            )
+
+            p1, p2, p3 = st.columns([1, 1, 4])
+            if p1.button("◀ Newer", disabled=len(cursors) == 1):
+                cursors.pop()
+                st.rerun()
+            if p2.button("Older ▶", disabled=cursor is None):
+                cursors.append(cursor)
+                st.rerun()
+            p3.caption(
+                f"Page {len(cursors)} · {len(reader):,} entries in the log "
+                f"({reader.size / 1024 / 1024:.1f} MB)"
+            )
+            if entries:
+                st.code(
+                    "\n".join(
+                        f"[{e['timestamp']:%Y-%m-%d %H:%M:%S}] {e['sql']};"
+                        for e in entries
+                    ),
+                    language="sql",
+                )
+            else:
+                st.info("No log entries match these filters.")
 
     # ==========================================
     # PAGE: Queries (Read)
@@ -134,8 +295,23 @@ def main():
                     st.dataframe(db.get_heist_winners())
             elif "4." in query_type:
                 k = st.text_input("Keyword:", "")
+                c1, c2, c3 = st.columns(3)
+                with c1:
+                    mode = st.radio(
+                        "Search Mode",
+                        ["auto", "fulltext", "substring"],
+                        horizontal=True,
+                    )
+                with c2:
+                    page = st.number_input("Page", min_value=1, value=1)
+                with c3:
+                    archived = st.checkbox("Include archived cases")
                 if st.button("Run"):
-                    st.dataframe(db.search_evidence(k))
+                    result = db.search_evidence(
+                        k, mode=mode, page=page, page_size=50, include_archived=archived
+                    )
+                    st.caption(f"Search mode used: {result.attrs['search_mode']}")
+                    st.dataframe(result)
             elif "5." in query_type:
                 if st.button("Run"):
                     st.dataframe(db.get_perpetrator_network())
@@ -149,8 +325,9 @@ def main():
                 if st.button("Run"):
                     st.dataframe(db.get_betting_history())
             elif "9." in query_type:
+                archived = st.checkbox("Include archived cases")
                 if st.button("Run"):
-                    st.dataframe(db.get_interview_logs())
+                    st.dataframe(db.get_interview_logs(include_archived=archived))
             elif "10." in query_type:
                 if st.button("Run"):
                     st.dataframe(db.get_detective_specializations())
@@ -249,6 +426,32 @@ def main():
         except Exception as e:
             st.error(f"Operation Failed: {e}")
 
+        st.markdown("---")
+        st.subheader("Bulk Import (CSV)")
+        kind = st.selectbox("Import Type", list(IMPORT_KINDS))
+        st.caption("Required columns: " + ", ".join(IMPORT_KINDS[kind][0]))
+        upload = st.file_uploader("CSV File", type=["csv"])
+        if upload is not None and st.button("Import"):
+            try:
+                progress = st.empty()
+                summary = import_csv(
+                    db,
+                    upload,
+                    kind,
+                    on_progress=lambda n: progress.caption(f"{n} rows processed..."),
+                )
+                st.success(
+                    f"Imported {summary['loaded']} row(s), "
+                    f"{len(summary['errors'])} error(s)."
+                )
+                if summary["errors"]:
+                    st.dataframe(
+                        [{"line": l, "error": e} for l, e in summary["errors"]],
+                        use_container_width=True,
+                    )
+            except Exception as e:
+                st.error(f"Import Failed: {e}")
+
     # ==========================================
     # PAGE: Table Inspector
     # ==========================================
@@ -259,9 +462,394 @@ def main():
         tables = db.execute_query("SHOW TABLES")
         if not tables.empty:
             t = st.selectbox("Table", tables.iloc[:, 0].tolist())
+            try:
+                columns = table_schema(db, t)["columns"]
+                c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+                shown = c1.multiselect("Columns", columns, default=columns)
+                sort = c2.selectbox("Sort by", ["(primary key)"] + columns)
+                descending = c3.checkbox("Descending")
+                page_size = c4.selectbox("Rows/page", [25, 50, 100, 250], index=1)
+                f1, f2, f3 = st.columns([2, 1, 2])
+                filter_col = f1.selectbox("Filter column", ["(none)"] + columns)
+                filter_op = f2.selectbox("Operator", list(FILTER_OPS))
+                filter_value = f3.text_input("Value")
+                filters = (
+                    [(filter_col, filter_op, filter_value)]
+                    if filter_col != "(none)"
+                    else []
+                )
+
+                # One pager per view; changing any option starts a new one at page 1
+                view = (
+                    t,
+                    tuple(shown),
+                    sort,
+                    descending,
+                    page_size,
+                    tuple(filters),
+                )
+                reload = st.button("Reload", help="Re-read the table from page 1")
+                if st.session_state.get("pager_view") != view or reload:
+                    if st.session_state.get("pager") is not None:
+                        st.session_state.pager.close()
+                    st.session_state.pager = TablePager(
+                        db,
+                        t,
+                        columns=shown or None,
+                        sort=None if sort == "(primary key)" else sort,
+                        descending=descending,
+                        filters=filters,
+                        page_size=page_size,
+                    )
+                    st.session_state.pager_view = view
+                    st.session_state.page_no = 0
+                pager = st.session_state.pager
+
+                n = st.session_state.page_no
+                p1, p2, p3 = st.columns([1, 1, 4])
+                if p1.button("◀ Prev", disabled=n == 0):
+                    n = st.session_state.page_no = n - 1
+                if p2.button("Next ▶", disabled=not pager.has_next(n)):
+                    n = st.session_state.page_no = n + 1
+                start = time.perf_counter()
+                page = pager.page(n)
+                elapsed = (time.perf_counter() - start) * 1000
+                estimate = pager.estimated_count()
+                p3.caption(
+                    f"Page {n + 1} · rows {n * page_size + 1}-{n * page_size + len(page)} "
+                    f"of ~{estimate if estimate is not None else '?'} · {elapsed:.0f} ms"
+                )
+                st.dataframe(page, use_container_width=True)
+                if st.button("Exact row count"):
+                    st.caption(f"{pager.exact_count()} row(s) match.")
+            except Exception as e:
+                st.error(f"Table Query Failed: {e}")
+
+        with st.expander("Export"):
+            source = st.radio("Source", ["Table", "Read operation"], horizontal=True)
+            op_args: tuple = ()
+            if source == "Table":
+                if tables.empty:
+                    st.info("No tables to export.")
+                    return
+                export_table = st.selectbox(
+                    "Table to export", tables.iloc[:, 0].tolist(), key="export_table"
+                )
+                export_op, base = None, export_table
+            else:
+                export_op = st.selectbox("Operation", list(EXPORTABLE_OPERATIONS))
+                op_args = tuple(
+                    st.text_input(arg.replace("_", " ").title(), key=f"export_{arg}")
+                    for arg in EXPORTABLE_OPERATIONS[export_op]
+                )
+                export_table, base = None, export_op
+            c1, c2 = st.columns(2)
+            fmt = c1.selectbox("Format", EXPORT_FORMATS)
+            compression = c2.selectbox(
+                "Compression",
+                ["none", "zstd", "snappy"] if fmt == "parquet" else ["none", "gzip"],
+            )
+            if st.button("Prepare Export"):
+                suffix = {"gzip": ".gz"}.get(compression, "")
+                path = os.path.join(
+                    tempfile.mkdtemp(prefix="dna-export-"), f"{base}.{fmt}{suffix}"
+                )
+                progress = st.empty()
+                try:
+                    summary = db.export(
+                        path,
+                        table=export_table,
+                        operation_name=export_op,
+                        args=op_args,
+                        fmt=fmt,
+                        compression=None if compression == "none" else compression,
+                        on_progress=lambda n: progress.caption(f"{n} rows written..."),
+                    )
+                    progress.caption(
+                        f"{summary['rows']} rows written in {summary['seconds']:.1f}s "
+                        f"({os.path.getsize(path) / 1e6:.1f} MB)."
+                    )
+                    st.session_state.export_path = path
+                except Exception as e:
+                    st.error(f"Export Failed: {e}")
+            path = st.session_state.get("export_path")
+            if path and os.path.exists(path):
+                with open(path, "rb") as f:
+                    st.download_button(
+                        f"Download {os.path.basename(path)}",
+                        f,
+                        file_name=os.path.basename(path),
+                    )
+
+    # ==========================================
+    # PAGE: Criminal Network
+    # ==========================================
+    elif nav_option == "Criminal Network":
+        st.markdown(
+            '<div class="main-header">🕸️ Criminal Network</div>',
+            unsafe_allow_html=True,
+        )
+        node_types = ["perp", "case", "detective", "associate"]
+
+        def node_input(prefix: str, key: str):
+            c1, c2 = st.columns([1, 2])
+            kind = c1.selectbox(f"{prefix} Type", node_types, key=f"{key}_type")
+            raw = c2.text_input(f"{prefix} ID / Name", key=f"{key}_id")
+            node_id = raw.strip() if kind == "associate" else None
+            if kind != "associate" and raw.strip():
+                try:
+                    node_id = int(raw)
+                except ValueError:
+                    st.error(f"{prefix} ID must be a number.")
+            return kind, node_id
+
+        tab1, tab2, tab3 = st.tabs(["Neighborhood", "Shortest Path", "Components"])
+        try:
+            with tab1:
+                kind, node_id = node_input("Node", "hood")
+                hops = st.slider("Hops", 1, 5, 2)
+                if node_id and st.button("Explore"):
+                    start = time.perf_counter()
+                    result = db.get_network_neighborhood(kind, node_id, hops)
+                    st.caption(
+                        f"{len(result)} node(s) in {(time.perf_counter() - start) * 1000:.1f} ms"
+                    )
+                    st.dataframe(result, use_container_width=True)
+            with tab2:
+                source = node_input("From", "src")
+                target = node_input("To", "dst")
+                if source[1] and target[1] and st.button("Find Path"):
+                    result = db.get_network_path(source, target)
+                    if result.empty:
+                        st.info("No connection found.")
+                    else:
+                        st.dataframe(result, use_container_width=True)
+            with tab3:
+                min_size = st.number_input("Minimum group size", 2, value=3)
+                st.dataframe(
+                    db.get_network_components(int(min_size)), use_container_width=True
+                )
+        except Exception as e:
+            st.error(f"Network Query Failed: {e}")
+
+        stats = db.graph.stats()
+        st.caption(
+            f"Index: {stats['nodes']} nodes, {stats['edges']} links, "
+            f"{stats['overlay']} pending overlay change(s)."
+        )
+
+    # ==========================================
+    # PAGE: Activity Trends
+    # ==========================================
+    elif nav_option == "Activity Trends":
+        st.markdown(
+            '<div class="main-header">📅 Activity Trends</div>',
+            unsafe_allow_html=True,
+        )
+        c1, c2, c3 = st.columns(3)
+        today = datetime.date.today()
+        start = c1.date_input("From", today - datetime.timedelta(days=365))
+        end = c2.date_input("Until (exclusive)", today + datetime.timedelta(days=1))
+        bucket = c3.selectbox("Bucket", ["day", "week"], index=1)
+
+        tab1, tab2, tab3 = st.tabs(
+            ["Detective Activity", "Bet Win Rate", "Case Velocity"]
+        )
+        try:
+            with tab1:
+                activity = db.get_detective_activity(start, end, bucket)
+                if activity.empty:
+                    st.info("No activity in this range.")
+                else:
+                    st.line_chart(
+                        activity.pivot_table(
+                            index="bucket",
+                            columns="detective",
+                            values="case_updates",
+                            aggfunc="sum",
+                            observed=True,
+                        )
+                    )
+                    st.dataframe(activity, use_container_width=True)
+            with tab2:
+                window = st.slider("Window (days)", 7, 180, 30)
+                rates = db.get_bet_win_rates(start, end, window)
+                if rates.empty:
+                    st.info("No bets in this range.")
+                else:
+                    st.line_chart(rates.set_index("day")[["win_rate"]])
+                    st.dataframe(rates, use_container_width=True)
+            with tab3:
+                velocity = db.get_case_update_velocity(start, end, bucket)
+                if velocity.empty:
+                    st.info("No case updates in this range.")
+                else:
+                    st.bar_chart(velocity.set_index("bucket")[["updates", "cases"]])
+                    st.dataframe(velocity, use_container_width=True)
+        except Exception as e:
+            st.error(f"Analytics Query Failed: {e}")
+
+        st.caption(
+            "Activity and win rates read the daily rollups, which are kept current "
+            "by `src/rollups.py` (run it from cron or with --every)."
+        )
+        r1, r2 = st.columns(2)
+        if r1.button("Refresh daily rollups"):
+            st.success(db.refresh_activity_buckets())
+        if r2.button("Rebuild daily rollups"):
+            st.success(db.refresh_activity_buckets(full=True, wait=10))
+
+    # ==========================================
+    # PAGE: Performance
+    # ==========================================
+    elif nav_option == "Performance":
+        st.markdown(
+            '<div class="main-header">📈 Performance</div>', unsafe_allow_html=True
+        )
+        st.caption("Per-operation metrics collected by this server process.")
+
+        stats = pd.DataFrame(REGISTRY.snapshot())
+        if stats.empty:
+            st.info("No queries recorded yet. Run a few operations first.")
+        else:
+            stats = stats.set_index("operation")
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Total Calls", int(stats["calls"].sum()))
+            c2.metric("Errors", int(stats["errors"].sum()))
+            c3.metric("Cache Hits", int(stats["cache_hits"].sum()))
+
+            st.subheader("Latency Percentiles (ms)")
+            st.bar_chart(stats[["p50_ms", "p95_ms", "p99_ms"]])
+            st.subheader("Rows & Connection Wait")
+            st.bar_chart(stats[["rows"]])
+            st.bar_chart(stats[["avg_wait_ms"]])
+            st.dataframe(stats.round(2), use_container_width=True)
+
+        pool = db.pool.stats() if db.pool is not None else {}
+        if pool:
+            st.caption(
+                f"Pool: {pool['in_use']}/{pool['size']} in use "
+                f"(max {pool['max_size']}), avg checkout wait {pool['avg_wait_ms']:.2f} ms"
+            )
+
+        with st.expander("Prometheus Exporter"):
+            port = st.number_input("Port", 1024, 65535, 9108)
+            if st.button("Start /metrics endpoint"):
+                try:
+                    bound = start_metrics_server(int(port))
+                    st.success(f"Serving http://127.0.0.1:{bound}/metrics")
+                except OSError as e:
+                    st.error(f"Could not start exporter: {e}")
+            if st.button("Reset Metrics"):
+                REGISTRY.reset()
+
+        if st.checkbox("Live refresh (2s)"):
+            time.sleep(2)
+            st.rerun()
+
+    # ==========================================
+    # PAGE: Case Archive
+    # ==========================================
+    elif nav_option == "Case Archive":
+        st.markdown(
+            '<div class="main-header">🗄️ Case Archive</div>', unsafe_allow_html=True
+        )
+        st.caption(
+            "Closed cases and their evidence, updates, assignments, targets and "
+            "interviews move to the *_Archive tables in small batches."
+        )
+        c1, c2, c3 = st.columns(3)
+        batch_size = c1.number_input("Cases per batch", 1, 10000, 100)
+        idle_days = c2.number_input(
+            "Idle for at least (days)", 0, 36500, 0, help="0 archives every closed case"
+        )
+        max_batches = c3.number_input("Max batches (0 = all)", 0, 100000, 0)
+        if st.button("Archive Closed Cases"):
+            try:
+                with st.spinner("Archiving..."):
+                    st.success(
+                        db.archive_closed_cases(
+                            batch_size=int(batch_size),
+                            idle_days=int(idle_days) or None,
+                            max_batches=int(max_batches) or None,
+                        )
+                    )
+            except Exception as e:
+                st.error(f"Archiving failed: {e}")
+
+        st.subheader("Archived Cases")
+        try:
+            archived = db.get_archived_cases()
+            st.dataframe(archived, use_container_width=True)
+            if not archived.empty:
+                cid = st.selectbox("Case to restore", archived["case_id"].tolist())
+                if st.button("Restore Case"):
+                    st.success(db.restore_case(int(cid)))
+        except Exception as e:
+            st.error(f"Error: {e}")
+
+    # ==========================================
+    # PAGE: Slow Queries
+    # ==========================================
+    elif nav_option == "Slow Queries":
+        st.markdown(
+            '<div class="main-header">🐢 Slow Queries</div>', unsafe_allow_html=True
+        )
+        if db.slow_log is None:
+            st.info("Slow-query recording is disabled for this connection.")
+            return
+        threshold = st.number_input(
+            "Threshold (ms)",
+            min_value=1,
+            value=int(db.slow_log.threshold_ms),
+            step=50,
+            help="Statements slower than this are recorded with their EXPLAIN plan.",
+        )
+        db.slow_log.threshold_ms = float(threshold)
+
+        groups = db.slow_query_report()
+        if not groups:
+            st.info("No slow statements recorded by this server process yet.")
+        else:
+            st.caption(
+                f"{sum(g['count'] for g in groups)} slow statement(s) in "
+                f"{len(groups)} group(s), slowest total time first."
+            )
             st.dataframe(
-                db.execute_query(f"SELECT * FROM {t}"), use_container_width=True
+                pd.DataFrame(groups)[
+                    [
+                        "count",
+                        "total_ms",
+                        "avg_ms",
+                        "max_ms",
+                        "max_rows_examined",
+                        "fingerprint",
+                    ]
+                ],
+                use_container_width=True,
             )
+            for group in groups[:20]:
+                title = f"{group['count']}x, avg {group['avg_ms']:.0f} ms: {group['fingerprint'][:80]}"
+                with st.expander(title):
+                    st.code(group["sample_sql"], language="sql")
+                    st.caption(f"Operations: {', '.join(group['operations']) or '-'}")
+                    for issue in group["issues"]:
+                        st.warning(issue)
+                    for recommendation in group["recommendations"]:
+                        st.info(recommendation)
+                    latest = next(
+                        (
+                            e
+                            for e in reversed(db.slow_log.entries())
+                            if e["fingerprint"] == group["fingerprint"]
+                            and e["plan"] is not None
+                        ),
+                        None,
+                    )
+                    if latest is not None:
+                        st.json(latest["plan"], expanded=False)
+        if st.button("Clear Slow Queries"):
+            db.slow_log.clear()
 
 
 if __name__ == "__main__":
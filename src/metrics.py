@@ -0,0 +1,244 @@
+import bisect
+import contextvars
+import functools
+import threading
+from typing import Dict, List, Sequence
+
+# Latency bucket upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Name of the DatabaseManager operation currently running in this context
+current_operation: contextvars.ContextVar = contextvars.ContextVar(
+    "current_operation", default=None
+)
+
+
+def operation(func):
+    """Labels every query issued inside `func` with the method's name."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = current_operation.set(func.__name__)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+
+    return wrapper
+
+
+class Histogram:
+    """Cumulative-bucket histogram with interpolated percentiles."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        """Estimates the q-th percentile (0-100) by linear interpolation."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * ((rank - seen) / n)
+            seen += n
+        return self.buckets[-1]
+
+
+class OperationStats:
+    """Counters for one DatabaseManager operation."""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.wait = Histogram()
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.rows = 0
+        self.bytes = 0
+
+
+class MetricsRegistry:
+    """Thread-safe, process-wide store of per-operation query metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops: Dict[str, OperationStats] = {}
+
+    def _get(self, op: str) -> OperationStats:
+        stats = self._ops.get(op)
+        if stats is None:
+            stats = self._ops[op] = OperationStats()
+        return stats
+
+    def record(
+        self,
+        op: str,
+        seconds: float,
+        wait: float = 0.0,
+        rows: int = 0,
+        nbytes: int = 0,
+        error: bool = False,
+    ):
+        with self._lock:
+            stats = self._get(op)
+            stats.calls += 1
+            stats.latency.observe(seconds)
+            stats.wait.observe(wait)
+            stats.rows += rows
+            stats.bytes += nbytes
+            if error:
+                stats.errors += 1
+
+    def record_cache_hit(self, op: str):
+        with self._lock:
+            self._get(op).cache_hits += 1
+
+    def snapshot(self) -> List[Dict]:
+        """Returns one summary dict per operation (latencies in ms)."""
+        with self._lock:
+            out = []
+            for op, s in sorted(self._ops.items()):
+                out.append(
+                    {
+                        "operation": op,
+                        "calls": s.calls,
+                        "errors": s.errors,
+                        "cache_hits": s.cache_hits,
+                        "p50_ms": s.latency.percentile(50) * 1000,
+                        "p95_ms": s.latency.percentile(95) * 1000,
+                        "p99_ms": s.latency.percentile(99) * 1000,
+                        "avg_wait_ms": (
+                            (s.wait.total / s.wait.count * 1000)
+                            if s.wait.count
+                            else 0.0
+                        ),
+                        "rows": s.rows,
+                        "bytes": s.bytes,
+                    }
+                )
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._ops.clear()
+
+    def render_prometheus(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            ops = sorted(self._ops.items())
+            for name, attr, help_text in (
+                ("dna_query_duration_seconds", "latency", "Query execution time."),
+                (
+                    "dna_connection_wait_seconds",
+                    "wait",
+                    "Time waiting for a pooled connection.",
+                ),
+            ):
+                header(name, "histogram", help_text)
+                for op, s in ops:
+                    hist = getattr(s, attr)
+                    cumulative = 0
+                    for bound, n in zip(hist.buckets, hist.counts):
+                        cumulative += n
+                        lines.append(
+                            f'{name}_bucket{{operation="{op}",le="{bound}"}} {cumulative}'
+                        )
+                    lines.append(
+                        f'{name}_bucket{{operation="{op}",le="+Inf"}} {hist.count}'
+                    )
+                    lines.append(f'{name}_sum{{operation="{op}"}} {hist.total}')
+                    lines.append(f'{name}_count{{operation="{op}"}} {hist.count}')
+
+            for name, attr, help_text in (
+                ("dna_query_errors_total", "errors", "Queries that raised an error."),
+                (
+                    "dna_query_cache_hits_total",
+                    "cache_hits",
+                    "Reads served from the result cache.",
+                ),
+                ("dna_query_rows_total", "rows", "Rows returned or affected."),
+                ("dna_query_bytes_total", "bytes", "Approximate bytes of result data."),
+            ):
+                header(name, "counter", help_text)
+                for op, s in ops:
+                    lines.append(f'{name}{{operation="{op}"}} {getattr(s, attr)}')
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ==========================================
+#  PROMETHEUS SCRAPE ENDPOINT
+# ==========================================
+
+# http.server is only imported when the exporter is started
+_server = None
+_server_lock = threading.Lock()
+
+
+def _handler_class():
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = REGISTRY.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def start_metrics_server(port: int = 9108, host: str = "127.0.0.1") -> int:
+    """Serves /metrics from a daemon thread (once per process). Returns the port."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            from http.server import ThreadingHTTPServer
+
+            _server = ThreadingHTTPServer((host, port), _handler_class())
+            threading.Thread(
+                target=_server.serve_forever, name="metrics-server", daemon=True
+            ).start()
+        return _server.server_address[1]
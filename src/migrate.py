@@ -0,0 +1,215 @@
+import argparse
+import glob
+import hashlib
+import importlib.util
+import os
+import sys
+from typing import Dict, List, Optional
+
+from db_utils import DatabaseManager, add_connection_args, config_from_args
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+
+# ==========================================
+#  HELPERS FOR MIGRATION FILES
+# ==========================================
+
+
+def index_exists(db: DatabaseManager, table: str, name: str) -> bool:
+    """Checks information_schema for an index by name."""
+    sql = """SELECT COUNT(*) AS n FROM information_schema.STATISTICS
+             WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s"""
+    return bool(db.execute_query(sql, (table, name)).iloc[0, 0])
+
+
+def ensure_index(
+    db: DatabaseManager, table: str, name: str, columns: str, kind: str = "INDEX"
+) -> bool:
+    """Adds an index online if it is missing. Returns True if it was created.
+
+    Secondary indexes are built with ALGORITHM=INPLACE, LOCK=NONE so reads and
+    writes continue during the build; FULLTEXT indexes cannot be built
+    lock-free and use the server default.
+    """
+    if index_exists(db, table, name):
+        print(f"  = {table}.{name} already present")
+        return False
+    if kind.upper() == "FULLTEXT":
+        sql = f"ALTER TABLE {table} ADD FULLTEXT INDEX {name} ({columns})"
+    else:
+        sql = f"ALTER TABLE {table} ADD {kind} {name} ({columns}), ALGORITHM=INPLACE, LOCK=NONE"
+    db.execute_update(sql)
+    print(f"  + {table}.{name} ({columns})")
+    return True
+
+
+# ==========================================
+#  RUNNER
+# ==========================================
+
+
+class Migration:
+    """One file in migrations/, named NNNN_description.py."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.version = int(self.filename.split("_", 1)[0])
+        with open(path, "rb") as f:
+            self.checksum = hashlib.sha256(f.read()).hexdigest()[:16]
+        spec = importlib.util.spec_from_file_location(
+            f"migration_{self.version:04d}", path
+        )
+        self.module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.module)
+        self.description = getattr(self.module, "DESCRIPTION", self.filename)
+        self.explain_checks: List[str] = getattr(self.module, "EXPLAIN_CHECKS", [])
+
+
+class MigrationRunner:
+    """
+    Applies ordered migrations to an existing database and records them in
+    the schema_migrations version table. Every migration must be idempotent,
+    so re-running one that was interrupted half way is safe.
+    """
+
+    def __init__(self, db: DatabaseManager, directory: str = MIGRATIONS_DIR):
+        self.db = db
+        self.directory = directory
+
+    def _ensure_version_table(self):
+        self.db.execute_update(
+            """CREATE TABLE IF NOT EXISTS schema_migrations (
+                   version INT PRIMARY KEY,
+                   name VARCHAR(255) NOT NULL,
+                   checksum CHAR(16) NOT NULL,
+                   applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+               )""",
+            tables=("schema_migrations",),
+        )
+
+    def discover(self) -> List[Migration]:
+        paths = sorted(glob.glob(os.path.join(self.directory, "[0-9]*_*.py")))
+        migrations = [Migration(p) for p in paths]
+        versions = [m.version for m in migrations]
+        if len(versions) != len(set(versions)):
+            raise Exception("Duplicate migration version numbers in migrations/")
+        return migrations
+
+    def applied(self) -> Dict[int, str]:
+        """Returns {version: checksum} of already applied migrations."""
+        self._ensure_version_table()
+        rows = self.db.execute_query("SELECT version, checksum FROM schema_migrations")
+        if rows.empty:
+            return {}
+        return dict(zip(rows["version"].astype(int), rows["checksum"]))
+
+    def status(self) -> List[Dict]:
+        applied = self.applied()
+        report = []
+        for m in self.discover():
+            state = "pending"
+            if m.version in applied:
+                state = "applied" if applied[m.version] == m.checksum else "modified"
+            report.append({"version": m.version, "file": m.filename, "state": state})
+        return report
+
+    def explain(self, sql: str) -> List[Dict]:
+        """Returns the per-table access plan (type, key, rows, Extra)."""
+        plan = self.db.execute_query("EXPLAIN " + sql)
+        cols = [c for c in ("table", "type", "key", "rows", "Extra") if c in plan]
+        return plan[cols].to_dict("records")
+
+    def migrate(
+        self, target: Optional[int] = None, dry_run: bool = False, explain: bool = True
+    ) -> List[int]:
+        """Applies pending migrations up to `target` (inclusive), in order."""
+        applied = self.applied()
+        done = []
+        for m in self.discover():
+            if m.version in applied or (target is not None and m.version > target):
+                continue
+            print(f"[{m.version:04d}] {m.description}")
+            if dry_run:
+                continue
+
+            before = (
+                [self._safe_explain(q) for q in m.explain_checks] if explain else []
+            )
+            m.module.up(self.db)
+            self.db.execute_update(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                (m.version, m.filename, m.checksum),
+                tables=("schema_migrations",),
+            )
+            if explain:
+                for sql, old in zip(m.explain_checks, before):
+                    self._print_plan_diff(sql, old, self._safe_explain(sql))
+            done.append(m.version)
+        return done
+
+    def _safe_explain(self, sql: str) -> List[Dict]:
+        try:
+            return self.explain(sql)
+        except Exception as e:
+            return [
+                {
+                    "table": "-",
+                    "type": "error",
+                    "key": None,
+                    "rows": None,
+                    "Extra": str(e),
+                }
+            ]
+
+    @staticmethod
+    def _print_plan_diff(sql: str, before: List[Dict], after: List[Dict]):
+        print("  EXPLAIN " + " ".join(sql.split())[:90])
+        for old, new in zip(before, after):
+            print(
+                f"    {new.get('table')}: type {old.get('type')} -> {new.get('type')}, "
+                f"key {old.get('key')} -> {new.get('key')}, "
+                f"rows {old.get('rows')} -> {new.get('rows')}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Apply schema migrations to mini_world_db."
+    )
+    add_connection_args(parser)
+    parser.add_argument(
+        "--status", action="store_true", help="List migrations and exit"
+    )
+    parser.add_argument(
+        "--target", type=int, default=None, help="Stop after this version"
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--no-explain", action="store_true")
+    args = parser.parse_args()
+
+    db = DatabaseManager(config_from_args(args))
+    success, msg = db.connect()
+    if not success:
+        print(msg)
+        sys.exit(1)
+
+    runner = MigrationRunner(db)
+    if args.status:
+        for row in runner.status():
+            print(f"{row['version']:04d}  {row['state']:<8}  {row['file']}")
+        return
+
+    done = runner.migrate(
+        args.target, dry_run=args.dry_run, explain=not args.no_explain
+    )
+    print(
+        f"Applied {len(done)} migration(s)."
+        if not args.dry_run
+        else "Dry run complete."
+    )
+
+
+if __name__ == "__main__":
+    main()
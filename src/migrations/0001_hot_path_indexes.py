@@ -0,0 +1,44 @@
+"""Secondary/covering indexes for the joins and filters of the ten read operations."""
+
+from migrate import ensure_index
+
+DESCRIPTION = "Add indexes for the hot read paths"
+
+# (table, index name, columns)
+INDEXES = [
+    # 1. get_squad_roster: filter on squad_name, join back on squad_id
+    ("Squad", "idx_squad_name", "squad_name, squad_id"),
+    ("Detective", "idx_detective_squad", "squad_id, badge_no"),
+    # 2. get_case_load / assignments by case
+    ("Assigned_To", "idx_assigned_case", "case_id, badge_no"),
+    # 3. get_heist_winners
+    ("Halloween_Heist", "idx_heist_winner", "winner_id"),
+    # 5. get_perpetrator_network
+    ("Perpetrator", "idx_perp_person", "person_id, perp_id"),
+    # 6. get_unsolved_cases: filter on status
+    ("Case_File", "idx_case_status", "status"),
+    # 7. get_resource_custody: join Custodian_Of on asset_tag
+    ("Custodian_Of", "idx_custodian_asset", "asset_tag, badge_no"),
+    # 8. get_betting_history: join on challenger_id
+    ("Bet_Ledger", "idx_bet_challenger", "challenger_id"),
+    # 9. get_interview_logs: join on perp_id
+    ("Records_Interview", "idx_interview_perp", "perp_id, badge_no"),
+]
+
+# Representative statements whose plans are compared before/after.
+EXPLAIN_CHECKS = [
+    "SELECT * FROM Case_File WHERE status != 'Closed'",
+    """SELECT d.badge_no, s.squad_name FROM Detective d
+       JOIN Squad s ON d.squad_id = s.squad_id WHERE s.squad_name LIKE '%99%'""",
+    """SELECT r.asset_tag, c.badge_no FROM Precinct_Resource r
+       LEFT JOIN Custodian_Of c ON r.asset_tag = c.asset_tag""",
+    """SELECT b.bet_timestamp FROM Bet_Ledger b
+       JOIN Detective d1 ON b.challenger_id = d1.badge_no""",
+    """SELECT r.case_id, p.primary_alias FROM Records_Interview r
+       JOIN Perpetrator p ON r.perp_id = p.perp_id""",
+]
+
+
+def up(db):
+    for table, name, columns in INDEXES:
+        ensure_index(db, table, name, columns)
@@ -0,0 +1,16 @@
+"""FULLTEXT index used by search_evidence(mode="fulltext") on existing databases."""
+
+from migrate import ensure_index
+
+DESCRIPTION = "Add FULLTEXT index on Evidence_Log.description"
+
+EXPLAIN_CHECKS = [
+    """SELECT evidence_tag FROM Evidence_Log
+       WHERE MATCH(description) AGAINST ('+key*' IN BOOLEAN MODE)""",
+]
+
+
+def up(db):
+    ensure_index(
+        db, "Evidence_Log", "ft_evidence_description", "description", "FULLTEXT"
+    )
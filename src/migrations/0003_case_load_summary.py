@@ -0,0 +1,18 @@
+"""Maintained per-detective open/closed case counts read by get_case_load()."""
+
+DESCRIPTION = "Create and backfill the Detective_Case_Load summary"
+
+EXPLAIN_CHECKS = [
+    """SELECT d.first_name, COALESCE(l.open_cases, 0) AS active_cases
+       FROM Detective d LEFT JOIN Detective_Case_Load l ON d.badge_no = l.badge_no""",
+]
+
+
+def up(db):
+    db.execute_update("""CREATE TABLE IF NOT EXISTS Detective_Case_Load (
+               badge_no INT PRIMARY KEY,
+               open_cases INT NOT NULL DEFAULT 0,
+               closed_cases INT NOT NULL DEFAULT 0,
+               FOREIGN KEY (badge_no) REFERENCES Detective(badge_no) ON DELETE CASCADE
+           )""")
+    print("  " + db.rebuild_case_load())
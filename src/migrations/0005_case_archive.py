@@ -0,0 +1,30 @@
+"""Archive tables that closed cases and their dependent rows are moved into."""
+
+from db_utils import ARCHIVE_TABLES
+from migrate import ensure_index
+
+DESCRIPTION = "Create the *_Archive tables for archived closed cases"
+
+EXPLAIN_CHECKS = [
+    "SELECT case_id FROM Case_File WHERE status = 'Closed' AND case_id > 0 ORDER BY case_id LIMIT 100",
+    "SELECT case_id, archived_at FROM Case_File_Archive ORDER BY archived_at DESC",
+]
+
+
+def up(db):
+    for table, archive in ARCHIVE_TABLES.items():
+        # LIKE copies the columns and indexes (not the foreign keys); the
+        # archiver copies rows by column name, so the column order is free
+        db.execute_update(f"CREATE TABLE IF NOT EXISTS {archive} LIKE {table}")
+        has_column = db.fetch_value(
+            """SELECT COUNT(*) FROM information_schema.COLUMNS
+               WHERE table_schema = DATABASE() AND table_name = %s
+               AND column_name = 'archived_at'""",
+            (archive,),
+        )
+        if not has_column:
+            db.execute_update(
+                f"ALTER TABLE {archive} ADD COLUMN archived_at DATETIME NOT NULL"
+            )
+            print(f"  + {archive}")
+    ensure_index(db, "Case_File_Archive", "idx_archived_at", "archived_at")
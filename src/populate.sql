@@ -143,4 +143,18 @@ INSERT INTO Documents_Heist_Participation (badge_no, heist_year, role) VALUES
 (9904, 2013, 'Distraction'),
 (9905, 2014, 'Participant');
 
+-- ==========================================
+-- Summary Tables (derived from the rows above)
+-- ==========================================
+
+-- Table: Detective_Case_Load
+INSERT INTO Detective_Case_Load (badge_no, open_cases, closed_cases)
+SELECT d.badge_no,
+       COALESCE(SUM(a.case_id IS NOT NULL AND COALESCE(c.status, '') != 'Closed'), 0),
+       COALESCE(SUM(COALESCE(c.status, '') = 'Closed'), 0)
+FROM Detective d
+LEFT JOIN Assigned_To a ON a.badge_no = d.badge_no
+LEFT JOIN Case_File c ON c.case_id = a.case_id
+GROUP BY d.badge_no;
+
 -- END
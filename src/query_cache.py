@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ResultCache:
+    """
+    In-process LRU/TTL cache of read-query results.
+
+    Entries are keyed by (sql, params) and tagged with the tables the query
+    reads, so a write can drop exactly the entries that depend on the tables it
+    touched. Eviction is least-recently-used, bounded by both `max_entries` and
+    an approximate `max_bytes` memory cap; entries older than `ttl` seconds are
+    treated as misses. Invalidation only sees writes made in this process:
+    rows changed by other processes can be served stale for up to `ttl`.
+
+    Every invalidation advances a generation counter. A reader takes
+    generation() before querying and passes it to put(); if one of its tables
+    was invalidated in the meantime the (possibly pre-write) result is dropped.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 300.0,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        # key -> (frame, tables, expires_at, nbytes)
+        self._entries: OrderedDict = OrderedDict()
+        self._by_table: Dict[str, Set[Hashable]] = {}
+        self._generation = 0
+        # table -> generation of its last invalidation ("" for invalidate())
+        self._invalidated_at: Dict[str, int] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query: str, params: Optional[Tuple]) -> Hashable:
+        return (" ".join(query.split()), tuple(params) if params is not None else None)
+
+    def get(self, key: Hashable) -> Optional["pd.DataFrame"]:
+        """Returns a copy of the cached frame, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            frame, _, expires_at, _ = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return frame.copy()
+
+    def generation(self) -> int:
+        """The current invalidation generation, to pass to put()."""
+        with self._lock:
+            return self._generation
+
+    def put(
+        self,
+        key: Hashable,
+        frame: "pd.DataFrame",
+        tables: Iterable[str],
+        generation: Optional[int] = None,
+    ):
+        """Stores a result tagged with the tables it was read from.
+
+        With `generation` (from generation() before the read), the result is
+        not stored if any of `tables` has been invalidated since.
+        """
+        nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes:
+            return
+        tables = frozenset(t.lower() for t in tables)
+        with self._lock:
+            if generation is not None and any(
+                self._invalidated_at.get(t, -1) > generation for t in (*tables, "")
+            ):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (
+                frame.copy(),
+                tables,
+                time.monotonic() + self.ttl,
+                nbytes,
+            )
+            self._bytes += nbytes
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tables: Optional[Iterable[str]] = None) -> int:
+        """Drops entries that read any of `tables` (all entries if None)."""
+        with self._lock:
+            self._generation += 1
+            if tables is None:
+                keys = list(self._entries)
+                self._invalidated_at[""] = self._generation
+            else:
+                keys = set()
+                for table in tables:
+                    keys |= self._by_table.get(table.lower(), set())
+                    self._invalidated_at[table.lower()] = self._generation
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def _remove(self, key: Hashable):
+        _, tables, _, nbytes = self._entries.pop(key)
+        self._bytes -= nbytes
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def stats(self) -> Dict[str, float]:
+        """Returns hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# ==========================================
+#  PROCESS-WIDE CACHE REGISTRY
+# ==========================================
+
+_caches: Dict[Tuple, ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(config: Dict[str, str], **options) -> ResultCache:
+    """Returns the cache shared by every DatabaseManager on the same database."""
+    key = (config["host"], config["database"])
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = ResultCache(**options)
+            _caches[key] = cache
+        return cache
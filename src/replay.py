@@ -0,0 +1,268 @@
+"""
+Workload replay from sql_commands.log.
+
+Parses the statements DatabaseManager logged (one "[timestamp] sql;" entry
+each, possibly spanning several lines), re-runs them against a target
+database with concurrent workers, either on the original schedule, N times
+faster, or as fast as possible, and reports latency percentiles and errors
+per statement fingerprint.
+
+    uv run python src/replay.py sql_commands.log --workers 8 --speed 4
+    uv run python src/replay.py sql_commands.log.1 sql_commands.log --reads-only --speed 0
+"""
+
+import argparse
+import datetime
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pymysql
+
+from bench import percentile
+from db_pool import get_pool
+from db_utils import add_connection_args, config_from_args
+from slow_queries import fingerprint
+
+_ENTRY = re.compile(r"^\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] ?(.*)$", re.S)
+_READ_KEYWORDS = ("select", "show", "explain", "describe", "desc", "with")
+
+# A logged statement: (timestamp, sql without the trailing ";")
+Statement = Tuple[datetime.datetime, str]
+
+
+def parse_log(paths: Iterable[str]) -> Iterator[Statement]:
+    """Yields logged statements in file order (give rotated files oldest first)."""
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            current: Optional[List] = None
+            for line in f:
+                match = _ENTRY.match(line)
+                if match:
+                    if current is not None:
+                        yield _finish(current)
+                    ts = datetime.datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
+                    current = [ts, match.group(2)]
+                elif current is not None:
+                    current[1] += line  # continuation of a multi-line statement
+            if current is not None:
+                yield _finish(current)
+
+
+def _finish(entry: List) -> Statement:
+    sql = entry[1].rstrip()
+    if sql.endswith(";"):
+        sql = sql[:-1].rstrip()
+    return entry[0], sql
+
+
+def is_read(sql: str) -> bool:
+    words = sql.lstrip(" (\n\t").split(None, 1)
+    return bool(words) and words[0].lower() in _READ_KEYWORDS
+
+
+class Replayer:
+    """
+    Runs logged statements against a target database.
+
+    A dispatcher releases each statement at its original offset from the
+    first one divided by `speed` (`speed=0` sends them as fast as the workers
+    take them) onto a queue drained by `workers` threads, each with its own
+    pooled connection. Statements run independently with autocommit, so
+    multi-statement transactions from the original run are not regrouped.
+    """
+
+    def __init__(self, config: Dict[str, str], workers: int = 4, speed: float = 1.0):
+        self.workers = max(workers, 1)
+        self.speed = speed
+        self.pool = get_pool(config, max_size=self.workers + 1)
+        self._lock = threading.Lock()
+        self._results: Dict[str, Dict] = {}
+        self.max_lag = 0.0
+
+    def _record(self, sql: str, seconds: float, error: Optional[Exception]):
+        key = fingerprint(sql)
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                result = self._results[key] = {
+                    "fingerprint": key,
+                    "kind": "read" if is_read(sql) else "write",
+                    "latencies": [],
+                    "errors": 0,
+                    "first_error": None,
+                }
+            if error is None:
+                result["latencies"].append(seconds * 1000)
+            else:
+                result["errors"] += 1
+                if result["first_error"] is None:
+                    result["first_error"] = f"{error} [{sql[:120]}]"
+
+    def _worker(self, jobs: "queue.Queue"):
+        try:
+            with self.pool.connection() as conn:
+                self._drain(jobs, conn)
+        except pymysql.Error as e:
+            # No connection for this worker: keep taking jobs so the
+            # dispatcher never blocks, and count them as failed
+            self._drain(jobs, None, e)
+
+    def _drain(self, jobs: "queue.Queue", conn, failure: Optional[Exception] = None):
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            due, sql = job
+            if due is not None:
+                lag = time.perf_counter() - due
+                with self._lock:
+                    self.max_lag = max(self.max_lag, lag)
+            start = time.perf_counter()
+            error = failure
+            if conn is not None:
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute(sql)
+                        cursor.fetchall()
+                except pymysql.Error as e:
+                    error = e
+            self._record(sql, time.perf_counter() - start, error)
+
+    def run(self, statements: Iterable[Statement]) -> Dict:
+        """Replays `statements` and returns the report (see report())."""
+        jobs: "queue.Queue" = queue.Queue(maxsize=self.workers * 4)
+        threads = [
+            threading.Thread(target=self._worker, args=(jobs,), daemon=True)
+            for _ in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        wall = time.perf_counter()
+        first: Optional[datetime.datetime] = None
+        sent = 0
+        try:
+            for ts, sql in statements:
+                due = None
+                if self.speed > 0:
+                    first = first or ts
+                    due = wall + (ts - first).total_seconds() / self.speed
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                jobs.put((due, sql))
+                sent += 1
+        finally:
+            for _ in threads:
+                jobs.put(None)
+            for thread in threads:
+                thread.join()
+        return self.report(sent, time.perf_counter() - wall)
+
+    def report(self, sent: int, wall: float) -> Dict:
+        rows = []
+        for result in self._results.values():
+            ms = sorted(result["latencies"])
+            rows.append(
+                {
+                    "fingerprint": result["fingerprint"],
+                    "kind": result["kind"],
+                    "count": len(ms) + result["errors"],
+                    "errors": result["errors"],
+                    "p50_ms": percentile(ms, 50),
+                    "p95_ms": percentile(ms, 95),
+                    "p99_ms": percentile(ms, 99),
+                    "max_ms": ms[-1] if ms else 0.0,
+                    "total_ms": sum(ms),
+                    "first_error": result["first_error"],
+                }
+            )
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return {
+            "statements": sent,
+            "errors": sum(r["errors"] for r in rows),
+            "seconds": wall,
+            "throughput_ops": sent / wall if wall else 0.0,
+            "max_lag_ms": self.max_lag * 1000,
+            "fingerprints": rows,
+        }
+
+
+def print_report(report: Dict, top: int = 20):
+    print(
+        f"Replayed {report['statements']} statement(s) in {report['seconds']:.1f}s "
+        f"({report['throughput_ops']:.1f}/s), {report['errors']} error(s), "
+        f"max schedule lag {report['max_lag_ms']:.0f} ms"
+    )
+    print(
+        f"\n{'count':>7}{'err':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  fingerprint"
+    )
+    for r in report["fingerprints"][:top]:
+        print(
+            f"{r['count']:>7}{r['errors']:>6}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+            f"{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}  {r['fingerprint'][:90]}"
+        )
+        if r["first_error"]:
+            print(f"{'':>13}! {r['first_error'][:160]}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Replay a sql_commands.log workload against a database."
+    )
+    add_connection_args(parser)
+    parser.add_argument("logs", nargs="+", help="Log files, oldest first")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="1 = original timing, 4 = four times faster, 0 = as fast as possible",
+    )
+    parser.add_argument("--reads-only", action="store_true", help="Skip writes")
+    parser.add_argument("--since", help="Only statements at/after this time (ISO)")
+    parser.add_argument("--until", help="Only statements before this time (ISO)")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after N")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--save", help="Write the report JSON here")
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.logs if not os.path.exists(path)]
+    if missing:
+        parser.error(f"Log file(s) not found: {', '.join(missing)}")
+    since = datetime.datetime.fromisoformat(args.since) if args.since else None
+    until = datetime.datetime.fromisoformat(args.until) if args.until else None
+
+    def selected() -> Iterator[Statement]:
+        count = 0
+        for ts, sql in parse_log(args.logs):
+            if (since and ts < since) or (until and ts >= until):
+                continue
+            if args.reads_only and not is_read(sql):
+                continue
+            if args.limit is not None and count >= args.limit:
+                return
+            count += 1
+            yield ts, sql
+
+    try:
+        replayer = Replayer(config_from_args(args), args.workers, args.speed)
+    except pymysql.Error as e:
+        print(f"Connection failed: {e}")
+        sys.exit(1)
+    report = replayer.run(selected())
+    print_report(report, args.top)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved report to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
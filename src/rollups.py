@@ -0,0 +1,55 @@
+"""
+Scheduled refresh of the daily activity/bet rollups behind the analytics reads.
+
+The analytics operations only read Detective_Activity_Daily and Bet_Daily;
+run this from cron (or with --every) to keep them current.
+
+    uv run python src/rollups.py                # append new buckets once
+    uv run python src/rollups.py --every 60     # keep refreshing every minute
+    uv run python src/rollups.py --full         # rebuild from scratch
+"""
+
+import argparse
+import sys
+import time
+
+from db_utils import DatabaseManager, add_connection_args, config_from_args
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Refresh the daily activity and bet rollups."
+    )
+    add_connection_args(parser)
+    parser.add_argument("--full", action="store_true", help="Rebuild every bucket")
+    parser.add_argument(
+        "--every", type=float, default=None, help="Repeat every N seconds"
+    )
+    parser.add_argument(
+        "--wait",
+        type=float,
+        default=10.0,
+        help="Seconds to wait for a refresh already running elsewhere",
+    )
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(config_from_args(args), use_cache=False)
+    success, msg = db.connect()
+    if not success:
+        print(msg)
+        sys.exit(1)
+
+    while True:
+        try:
+            print(db.refresh_activity_buckets(full=args.full, wait=args.wait))
+        except Exception as e:
+            print(e)
+            if args.every is None:
+                sys.exit(1)
+        if args.every is None:
+            return
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,8 @@ USE mini_world_db;
 CREATE TABLE Squad (
     squad_id INT PRIMARY KEY,
     squad_name VARCHAR(100) NOT NULL,
-    shift VARCHAR(50)
+    shift VARCHAR(50),
+    INDEX idx_squad_name (squad_name, squad_id) -- get_squad_roster filter
 );
 
 -- Table: Detective
@@ -19,6 +20,7 @@ CREATE TABLE Detective (
     last_name VARCHAR(100) NOT NULL,
     `rank` VARCHAR(100), -- Backticks added to fix reserved keyword error
     squad_id INT,
+    INDEX idx_detective_squad (squad_id, badge_no), -- roster join
     FOREIGN KEY (squad_id) REFERENCES Squad(squad_id) ON DELETE SET NULL
 );
 
@@ -26,7 +28,8 @@ CREATE TABLE Detective (
 CREATE TABLE Case_File (
     case_id INT PRIMARY KEY,
     case_title VARCHAR(255) NOT NULL,
-    status VARCHAR(50) DEFAULT 'Open'
+    status VARCHAR(50) DEFAULT 'Open',
+    INDEX idx_case_status (status) -- unsolved cases
 );
 
 -- Table: Precinct_Resource
@@ -40,6 +43,7 @@ CREATE TABLE Halloween_Heist (
     heist_year INT PRIMARY KEY,
     objective_item VARCHAR(255),
     winner_id INT,
+    INDEX idx_heist_winner (winner_id), -- get_heist_winners
     FOREIGN KEY (winner_id) REFERENCES Detective(badge_no) ON DELETE SET NULL
 );
 
@@ -57,6 +61,7 @@ CREATE TABLE Perpetrator (
     perp_id INT PRIMARY KEY,
     person_id INT NOT NULL,
     primary_alias VARCHAR(255),
+    INDEX idx_perp_person (person_id, perp_id), -- get_perpetrator_network
     FOREIGN KEY (person_id) REFERENCES Person_Of_Interest(person_id) ON DELETE CASCADE
 );
 
@@ -94,6 +99,7 @@ CREATE TABLE Evidence_Log (
     logged_by_id INT,
     storage_location VARCHAR(255),
     PRIMARY KEY (case_id, evidence_tag),
+    FULLTEXT INDEX ft_evidence_description (description), -- MATCH ... AGAINST search
     FOREIGN KEY (case_id) REFERENCES Case_File(case_id) ON DELETE CASCADE,
     FOREIGN KEY (logged_by_id) REFERENCES Detective(badge_no) ON DELETE SET NULL
 );
@@ -105,6 +111,7 @@ CREATE TABLE Case_Update (
     entry_text TEXT,
     detective_id INT,
     PRIMARY KEY (case_id, update_timestamp),
+    INDEX idx_update_time (update_timestamp), -- time-range analytics
     FOREIGN KEY (case_id) REFERENCES Case_File(case_id) ON DELETE CASCADE,
     FOREIGN KEY (detective_id) REFERENCES Detective(badge_no) ON DELETE SET NULL
 );
@@ -117,6 +124,8 @@ CREATE TABLE Bet_Ledger (
     stake VARCHAR(255),
     outcome VARCHAR(255),
     PRIMARY KEY (defendant_id, bet_timestamp),
+    INDEX idx_bet_time (bet_timestamp), -- time-range analytics
+    INDEX idx_bet_challenger (challenger_id), -- get_betting_history
     FOREIGN KEY (defendant_id) REFERENCES Detective(badge_no) ON DELETE CASCADE,
     FOREIGN KEY (challenger_id) REFERENCES Detective(badge_no) ON DELETE CASCADE
 );
@@ -128,6 +137,7 @@ CREATE TABLE Assigned_To (
     badge_no INT,
     case_id INT,
     PRIMARY KEY (badge_no, case_id),
+    INDEX idx_assigned_case (case_id, badge_no), -- assignments by case
     FOREIGN KEY (badge_no) REFERENCES Detective(badge_no) ON DELETE CASCADE,
     FOREIGN KEY (case_id) REFERENCES Case_File(case_id) ON DELETE CASCADE
 );
@@ -146,6 +156,7 @@ CREATE TABLE Custodian_Of (
     badge_no INT,
     asset_tag VARCHAR(50),
     PRIMARY KEY (badge_no, asset_tag),
+    INDEX idx_custodian_asset (asset_tag, badge_no), -- get_resource_custody
     FOREIGN KEY (badge_no) REFERENCES Detective(badge_no) ON DELETE CASCADE,
     FOREIGN KEY (asset_tag) REFERENCES Precinct_Resource(asset_tag) ON DELETE CASCADE
 );
@@ -156,6 +167,7 @@ CREATE TABLE Records_Interview (
     perp_id INT,
     case_id INT,
     PRIMARY KEY (badge_no, perp_id, case_id),
+    INDEX idx_interview_perp (perp_id, badge_no), -- get_interview_logs
     FOREIGN KEY (badge_no) REFERENCES Detective(badge_no) ON DELETE CASCADE,
     FOREIGN KEY (perp_id) REFERENCES Perpetrator(perp_id) ON DELETE CASCADE,
     FOREIGN KEY (case_id) REFERENCES Case_File(case_id) ON DELETE CASCADE
@@ -170,4 +182,49 @@ CREATE TABLE Documents_Heist_Participation (
     FOREIGN KEY (badge_no) REFERENCES Detective(badge_no) ON DELETE CASCADE,
     FOREIGN KEY (heist_year) REFERENCES Halloween_Heist(heist_year) ON DELETE CASCADE
 );
+
+-- 7. Create Summary Tables (maintained by db_utils.py)
+
+-- Table: Detective_Case_Load (open/closed assignment counts per detective)
+CREATE TABLE Detective_Case_Load (
+    badge_no INT PRIMARY KEY,
+    open_cases INT NOT NULL DEFAULT 0,
+    closed_cases INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (badge_no) REFERENCES Detective(badge_no) ON DELETE CASCADE
+);
+
+-- Table: Detective_Activity_Daily (case updates written and bets taken per detective per day)
+CREATE TABLE Detective_Activity_Daily (
+    day DATE,
+    badge_no INT,
+    case_updates INT NOT NULL DEFAULT 0,
+    bets INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, badge_no),
+    FOREIGN KEY (badge_no) REFERENCES Detective(badge_no) ON DELETE CASCADE
+);
+
+-- Table: Bet_Daily (bets placed, settled and won per day)
+CREATE TABLE Bet_Daily (
+    day DATE PRIMARY KEY,
+    bets INT NOT NULL DEFAULT 0,
+    settled INT NOT NULL DEFAULT 0,
+    won INT NOT NULL DEFAULT 0
+);
+
+-- 8. Create Archive Tables (closed cases moved out by db_utils.archive_closed_cases)
+-- Same columns and indexes as the live tables, no foreign keys, plus archived_at
+
+CREATE TABLE Case_File_Archive LIKE Case_File;
+ALTER TABLE Case_File_Archive ADD COLUMN archived_at DATETIME NOT NULL,
+    ADD INDEX idx_archived_at (archived_at);
+CREATE TABLE Evidence_Log_Archive LIKE Evidence_Log;
+ALTER TABLE Evidence_Log_Archive ADD COLUMN archived_at DATETIME NOT NULL;
+CREATE TABLE Case_Update_Archive LIKE Case_Update;
+ALTER TABLE Case_Update_Archive ADD COLUMN archived_at DATETIME NOT NULL;
+CREATE TABLE Assigned_To_Archive LIKE Assigned_To;
+ALTER TABLE Assigned_To_Archive ADD COLUMN archived_at DATETIME NOT NULL;
+CREATE TABLE Targets_Archive LIKE Targets;
+ALTER TABLE Targets_Archive ADD COLUMN archived_at DATETIME NOT NULL;
+CREATE TABLE Records_Interview_Archive LIKE Records_Interview;
+ALTER TABLE Records_Interview_Archive ADD COLUMN archived_at DATETIME NOT NULL;
  -- END
@@ -0,0 +1,403 @@
+import argparse
+import datetime
+import json
+import queue
+import re
+import sys
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Statements EXPLAIN accepts
+_EXPLAINABLE = ("select", "insert", "update", "delete", "replace", "with", "table")
+
+_FINGERPRINT_RULES = [
+    (re.compile(r"/\*.*?\*/", re.S), " "),  # comments
+    (re.compile(r"--[^\n]*"), " "),
+    (re.compile(r"'(?:[^'\\]|\\.|'')*'"), "?"),  # string literals
+    (re.compile(r'"(?:[^"\\]|\\.)*"'), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),  # numbers
+    (re.compile(r"\b(in\s*)\([?,\s]*\)", re.I), r"\1(?+)"),  # IN lists
+    (
+        re.compile(r"\b(values\s*)\([?,\s]*\)(?:\s*,\s*\([?,\s]*\))*", re.I),
+        r"\1(?+)",
+    ),  # multi-row VALUES
+    (re.compile(r"\s+"), " "),
+]
+
+# FROM/JOIN <table> [AS] <alias>
+_TABLE_REF = re.compile(
+    r"\b(?:FROM|JOIN|UPDATE|INTO)\s+`?(\w+)`?"
+    r"(?:\s+(?:AS\s+)?(?!(?:ON|WHERE|JOIN|LEFT|RIGHT|INNER|CROSS|GROUP|ORDER|LIMIT|SET|"
+    r"USING|VALUES|SELECT|HAVING|WINDOW|UNION)\b)`?(\w+)`?)?",
+    re.I,
+)
+# `db`.`alias`.`column` as printed in attached_condition
+_CONDITION_COLUMN = re.compile(r"`\w+`\.`(\w+)`\.`(\w+)`")
+_LEADING_WILDCARD = re.compile(r"`\w+`\.`(\w+)`\.`(\w+)` like '%", re.I)
+_CLAUSE = r"\b{}\s+(.+?)(?:\bLIMIT\b|\bHAVING\b|\bORDER BY\b|\bWINDOW\b|\)|$)"
+_ORDER_BY = re.compile(_CLAUSE.format("ORDER BY"), re.I | re.S)
+_GROUP_BY = re.compile(_CLAUSE.format("GROUP BY"), re.I | re.S)
+
+# Read back the rows examined/sent of the statement this connection just ran
+ROWS_EXAMINED_SQL = """SELECT ROWS_EXAMINED, ROWS_SENT
+    FROM performance_schema.events_statements_history
+    WHERE THREAD_ID = PS_CURRENT_THREAD_ID() ORDER BY EVENT_ID DESC LIMIT 1"""
+
+
+def fingerprint(sql: str) -> str:
+    """Normalizes a statement so runs with different literals group together."""
+    for pattern, replacement in _FINGERPRINT_RULES:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip().lower()
+
+
+def is_explainable(sql: str) -> bool:
+    words = sql.lstrip(" (\n\t").split(None, 1)
+    return bool(words) and words[0].lower() in _EXPLAINABLE
+
+
+# ==========================================
+#  PLAN ANALYSIS
+# ==========================================
+
+
+def _aliases(sql: str) -> Dict[str, str]:
+    """Maps every alias (and table name) in the statement to its table."""
+    aliases: Dict[str, str] = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        aliases[table.lower()] = table
+        if alias:
+            aliases[alias.lower()] = table
+    return aliases
+
+
+def _walk(node: Any) -> Iterable[Tuple[str, Any]]:
+    """Yields every (key, value) pair of a JSON plan, depth first."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield key, value
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+
+
+def _clause_columns(pattern: re.Pattern, sql: str) -> List[str]:
+    match = pattern.search(" ".join(sql.split()))
+    if not match:
+        return []
+    columns = []
+    for part in match.group(1).split(","):
+        name = part.strip().split()[0] if part.strip() else ""
+        name = name.split(".")[-1].strip("`")
+        if re.fullmatch(r"\w+", name) and not name.isdigit():
+            columns.append(name)
+    return columns
+
+
+def _index_ddl(table: str, columns: List[str]) -> str:
+    name = f"idx_{table.lower()}_{'_'.join(c.lower() for c in columns)}"[:64]
+    return f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"
+
+
+def analyze_plan(plan: Dict, sql: str) -> Tuple[List[str], List[str]]:
+    """Returns (issues, recommendations) for an EXPLAIN FORMAT=JSON plan.
+
+    Flags full table and index scans, filesorts and temporary tables, and
+    suggests an index built from the columns the plan filters, joins, sorts
+    or groups on. Suggestions are starting points: check them with EXPLAIN.
+    """
+    issues: List[str] = []
+    recommendations: List[str] = []
+    aliases = _aliases(sql)
+    single_table = len(set(aliases.values())) == 1
+
+    def recommend(text: str):
+        if text not in recommendations:
+            recommendations.append(text)
+
+    for key, value in _walk(plan):
+        if key == "table" and isinstance(value, dict) and "access_type" in value:
+            alias = value.get("table_name", "?")
+            table = aliases.get(alias.lower(), alias)
+            rows = value.get("rows_examined_per_scan")
+            access = value["access_type"]
+            condition = value.get("attached_condition", "")
+            if access == "ALL":
+                issues.append(f"full table scan on {table} (~{rows} rows per scan)")
+                # A B-tree index cannot serve LIKE '%...'
+                wildcard = set(_LEADING_WILDCARD.findall(condition))
+                if wildcard:
+                    recommend(
+                        f"LIKE with a leading wildcard on {table} cannot use an "
+                        "index; consider a FULLTEXT index and MATCH ... AGAINST"
+                    )
+                columns = []
+                for match in _CONDITION_COLUMN.findall(condition):
+                    col_alias, column = match
+                    if (
+                        col_alias.lower() == alias.lower()
+                        and column not in columns
+                        and match not in wildcard
+                    ):
+                        columns.append(column)
+                if columns:
+                    recommend(_index_ddl(table, columns))
+                elif not condition:
+                    recommend(
+                        f"{table} is read without any filter; add a WHERE/LIMIT "
+                        "or serve it from a summary table"
+                    )
+            elif access == "index":
+                issues.append(f"full index scan on {table} using {value.get('key')}")
+            if value.get("using_join_buffer"):
+                issues.append(f"join buffer ({value['using_join_buffer']}) on {table}")
+        elif key == "using_filesort" and value is True:
+            issues.append("filesort")
+            columns = _clause_columns(_ORDER_BY, sql)
+            if columns and single_table:
+                recommend(
+                    f"ORDER BY {', '.join(columns)} sorts in memory/on disk; an index "
+                    f"ending with ({', '.join(columns)}) after the filter columns avoids it"
+                )
+        elif key == "using_temporary_table" and value is True:
+            issues.append("temporary table")
+            columns = _clause_columns(_GROUP_BY, sql)
+            if columns:
+                recommend(
+                    f"GROUP BY {', '.join(columns)} builds a temporary table; an index "
+                    f"on ({', '.join(columns)}) lets MySQL group in index order"
+                )
+    return list(dict.fromkeys(issues)), recommendations
+
+
+# ==========================================
+#  RECORDER
+# ==========================================
+
+_STOP = object()
+
+
+class SlowQueryLog:
+    """
+    Records statements slower than `threshold_ms`.
+
+    DatabaseManager hands over each slow statement with its duration and the
+    rows examined/sent as reported by performance_schema. A daemon thread then
+    runs EXPLAIN FORMAT=JSON on it (through the `explain` callable passed with
+    the statement), analyzes the plan and keeps the entry in memory (the last
+    `max_entries`) and, if `path` is set, appends it to a JSON Lines file for
+    the command-line report.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 500.0,
+        max_entries: int = 500,
+        path: Optional[str] = "slow_queries.jsonl",
+        explain: bool = True,
+        queue_size: int = 1000,
+    ):
+        self.threshold_ms = threshold_ms
+        self.path = path
+        self.explain = explain
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._entries: deque = deque(maxlen=max_entries)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="slow-query-log", daemon=True
+        )
+        self._thread.start()
+
+    def record(
+        self,
+        sql: str,
+        seconds: float,
+        operation: Optional[str] = None,
+        rows_examined: Optional[int] = None,
+        rows_sent: Optional[int] = None,
+        explain: Optional[Callable[[str], Optional[str]]] = None,
+    ):
+        """Queues one slow statement; EXPLAIN and analysis happen off-thread."""
+        entry = {
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "operation": operation,
+            "fingerprint": fingerprint(sql),
+            "sql": sql,
+            "ms": round(seconds * 1000, 2),
+            "rows_examined": rows_examined,
+            "rows_sent": rows_sent,
+            "plan": None,
+            "issues": [],
+            "recommendations": [],
+        }
+        try:
+            self._queue.put_nowait((entry, explain))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            entry, explain = item
+            if self.explain and explain is not None and is_explainable(entry["sql"]):
+                try:
+                    raw = explain(entry["sql"])
+                    entry["plan"] = json.loads(raw) if raw else None
+                except Exception as e:
+                    entry["issues"] = [f"EXPLAIN failed: {e}"]
+                if entry["plan"] is not None:
+                    entry["issues"], entry["recommendations"] = analyze_plan(
+                        entry["plan"], entry["sql"]
+                    )
+            with self._lock:
+                self._entries.append(entry)
+            if self.path:
+                try:
+                    with open(self.path, "a") as f:
+                        f.write(json.dumps(entry, default=str) + "\n")
+                except OSError as e:
+                    print(f"Slow query logging failed: {e}")
+
+    def entries(self) -> List[Dict]:
+        """Returns the recorded entries, oldest first."""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self, timeout: float = 5.0):
+        """Finishes queued entries and stops the worker thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+
+def summarize(entries: Iterable[Dict]) -> List[Dict]:
+    """Groups entries by fingerprint, slowest total time first."""
+    groups: Dict[str, Dict] = {}
+    for entry in entries:
+        group = groups.get(entry["fingerprint"])
+        if group is None:
+            group = groups[entry["fingerprint"]] = {
+                "fingerprint": entry["fingerprint"],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "max_rows_examined": None,
+                "operations": [],
+                "last_seen": entry["time"],
+                "sample_sql": entry["sql"],
+                "issues": [],
+                "recommendations": [],
+            }
+        group["count"] += 1
+        group["total_ms"] += entry["ms"]
+        if entry["ms"] >= group["max_ms"]:
+            group["max_ms"] = entry["ms"]
+            group["sample_sql"] = entry["sql"]
+        if entry.get("rows_examined") is not None:
+            group["max_rows_examined"] = max(
+                group["max_rows_examined"] or 0, entry["rows_examined"]
+            )
+        group["last_seen"] = max(group["last_seen"], entry["time"])
+        for field, value in (
+            ("operations", [entry.get("operation")]),
+            ("issues", entry.get("issues", [])),
+            ("recommendations", entry.get("recommendations", [])),
+        ):
+            for item in value:
+                if item and item not in group[field]:
+                    group[field].append(item)
+    for group in groups.values():
+        group["avg_ms"] = round(group["total_ms"] / group["count"], 2)
+        group["total_ms"] = round(group["total_ms"], 2)
+    return sorted(groups.values(), key=lambda g: g["total_ms"], reverse=True)
+
+
+def load_entries(path: str) -> List[Dict]:
+    """Reads a slow-query JSON Lines file (skipping damaged lines)."""
+    entries = []
+    with open(path) as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+_logs: Dict[Tuple, SlowQueryLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_slow_query_log(config: Dict[str, str], **options) -> SlowQueryLog:
+    """Returns the recorder shared by every DatabaseManager on the same database."""
+    key = (config["host"], config["database"])
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = SlowQueryLog(**options)
+        return log
+
+
+# ==========================================
+#  COMMAND-LINE REPORT
+# ==========================================
+
+
+def print_report(groups: List[Dict], top: int = 10, out=None):
+    out = out or sys.stdout
+    if not groups:
+        print("No slow queries recorded.", file=out)
+        return
+    for rank, group in enumerate(groups[:top], start=1):
+        examined = group["max_rows_examined"]
+        print(
+            f"#{rank}  {group['count']}x  total {group['total_ms']:.0f} ms  "
+            f"avg {group['avg_ms']:.0f} ms  max {group['max_ms']:.0f} ms  "
+            f"rows examined {examined if examined is not None else '?'}",
+            file=out,
+        )
+        print(f"    operations: {', '.join(group['operations']) or '-'}", file=out)
+        print(f"    {group['fingerprint'][:200]}", file=out)
+        for issue in group["issues"]:
+            print(f"    ! {issue}", file=out)
+        for recommendation in group["recommendations"]:
+            print(f"    > {recommendation}", file=out)
+        print(file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Summarize slow queries recorded by DatabaseManager."
+    )
+    parser.add_argument("path", nargs="?", default="slow_queries.jsonl")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--since", default=None, help="ISO date/time, e.g. 2024-05-01")
+    parser.add_argument("--json", action="store_true", help="Print the groups as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        entries = load_entries(args.path)
+    except OSError as e:
+        print(f"Cannot read {args.path}: {e}")
+        sys.exit(1)
+    if args.since:
+        entries = [e for e in entries if e["time"] >= args.since]
+    groups = summarize(entries)
+    if args.json:
+        print(json.dumps(groups[: args.top], indent=2))
+    else:
+        print(f"{len(entries)} slow statement(s) in {len(groups)} group(s)\n")
+        print_report(groups, args.top)
+
+
+if __name__ == "__main__":
+    main()
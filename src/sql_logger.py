@@ -0,0 +1,385 @@
+import atexit
+import bisect
+import datetime
+import os
+import queue
+import re
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_STOP = object()
+
+# Suffix of a backup made by daily rotation: sql_commands.log.2024-05-01
+_DATED_SUFFIX = re.compile(r"\d{4}-\d\d-\d\d")
+
+
+class SQLLogWriter:
+    """
+    Background writer for the SQL audit log (sql_commands.log).
+
+    Callers enqueue already-formatted statements; a daemon thread drains the
+    bounded queue and appends them in batches, flushing when `batch_size` lines
+    are pending or `flush_interval` seconds have passed. The file is rotated by
+    size (`max_bytes`) and/or by date (`rotate_daily`), keeping `backup_count`
+    old files. When the queue is full, `policy="drop"` discards the line (and
+    counts it) while `policy="block"` makes the caller wait.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5,
+        rotate_daily: bool = False,
+        policy: str = "drop",
+    ):
+        if policy not in ("drop", "block"):
+            raise ValueError("policy must be 'drop' or 'block'")
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rotate_daily = rotate_daily
+        self.policy = policy
+        self.dropped = 0
+        self.written = 0
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        # Guards enqueueing against close(), and direct writes once closed
+        self._state_lock = threading.Lock()
+        self._closed = False
+        self._current_date = datetime.date.today()
+        self._thread = threading.Thread(
+            target=self._run, name=f"sql-log-writer:{path}", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, sql: str, timestamp: Optional[datetime.datetime] = None):
+        """Queues one executed statement; never touches the disk itself.
+
+        Without `timestamp` the line is stamped by the writer thread as it is
+        dequeued, so the entries of one writer are always in time order. Once
+        the writer thread has stopped (e.g. at exit), lines are appended
+        directly instead of waiting on a queue nobody drains.
+        """
+        item = (sql, timestamp)
+        while True:
+            with self._state_lock:
+                if self._closed or not self._thread.is_alive():
+                    self._flush([self._format(item)])
+                    return
+                try:
+                    if self.policy == "block":
+                        # Short waits, so a close() meanwhile is noticed
+                        self._queue.put(item, timeout=0.1)
+                    else:
+                        self._queue.put_nowait(item)
+                    return
+                except queue.Full:
+                    if self.policy == "drop":
+                        self.dropped += 1
+                        return
+
+    @staticmethod
+    def _format(item: Tuple[str, Optional[datetime.datetime]]) -> str:
+        sql, timestamp = item
+        when = timestamp or datetime.datetime.now()
+        return f"[{when.strftime('%Y-%m-%d %H:%M:%S')}] {sql};\n"
+
+    def _run(self):
+        batch: List[str] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                batch.append(self._format(item))
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, batch: List[str]):
+        if not batch:
+            return
+        data = "".join(batch)
+        try:
+            self._maybe_rotate(len(data.encode()))
+            with open(self.path, "a") as f:
+                f.write(data)
+            self.written += len(batch)
+        except OSError as e:
+            print(f"Logging failed: {e}")
+
+    def _maybe_rotate(self, incoming: int):
+        today = datetime.date.today()
+        if self.rotate_daily and today != self._current_date:
+            if os.path.exists(self.path):
+                os.replace(self.path, f"{self.path}.{self._current_date.isoformat()}")
+            self._current_date = today
+            self._prune_dated()
+        if not self.max_bytes or not os.path.exists(self.path):
+            return
+        if os.path.getsize(self.path) + incoming <= self.max_bytes:
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _prune_dated(self):
+        """Removes dated backups (path.YYYY-MM-DD) beyond the newest `backup_count`."""
+        directory = os.path.dirname(self.path) or "."
+        prefix = os.path.basename(self.path) + "."
+        dated = sorted(
+            name
+            for name in os.listdir(directory)
+            if name.startswith(prefix) and _DATED_SUFFIX.fullmatch(name[len(prefix) :])
+        )
+        for name in dated[: max(len(dated) - self.backup_count, 0)]:
+            os.remove(os.path.join(directory, name))
+
+    def close(self, timeout: float = 5.0):
+        """Flushes pending lines and stops the writer thread."""
+        with self._state_lock:
+            self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+
+# ==========================================
+#  READER (incremental index over the log)
+# ==========================================
+
+# Start of an entry written by SQLLogWriter.write: "[YYYY-mm-dd HH:MM:SS] "
+_ENTRY_START = re.compile(rb"^\[(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d)\] ", re.M)
+
+
+def _stamp(when: datetime.datetime) -> int:
+    """A sortable integer (YYYYmmddHHMMSS) for a timestamp."""
+    return int(when.strftime("%Y%m%d%H%M%S"))
+
+
+def _from_stamp(stamp: int) -> datetime.datetime:
+    return datetime.datetime.strptime(str(stamp), "%Y%m%d%H%M%S")
+
+
+class SQLLogReader:
+    """
+    Incremental, newest-first reader for one SQL log file.
+
+    Keeps the byte offset and timestamp of every entry in compact arrays.
+    refresh() seeks to the end of what is already indexed and scans only the
+    bytes appended since (a partly written last line waits for the next
+    call); a rotated or truncated file is re-indexed from the start. Pages
+    read just the byte ranges of the entries they return, so the cost of a
+    view does not grow with the size of the log.
+
+    Entries are not guaranteed to be in time order (several processes may
+    append to one log), so time ranges are bisected on the running maximum
+    timestamp, widened by the largest lag seen behind it, and each entry's
+    own timestamp is checked as well.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1024 * 1024):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, inode: Optional[int]):
+        self._inode = inode
+        self._size = 0  # bytes indexed (always up to the end of a line)
+        self._offsets = array("q")
+        self._stamps = array("q")
+        self._max_stamps = array("q")  # running maximum of _stamps
+        self._lag = datetime.timedelta(0)  # largest gap below that maximum
+
+    def refresh(self) -> int:
+        """Indexes entries appended since the last call; returns how many."""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._reset(None)
+                return 0
+            if stat.st_ino != self._inode or stat.st_size < self._size:
+                self._reset(stat.st_ino)
+            before = len(self._offsets)
+            with open(self.path, "rb") as f:
+                f.seek(self._size)
+                pending = b""  # an incomplete line carried into the next chunk
+                remaining = stat.st_size - self._size
+                while remaining > 0:
+                    chunk = f.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    data = pending + chunk
+                    end = data.rfind(b"\n") + 1
+                    for match in _ENTRY_START.finditer(data, 0, end):
+                        stamp = int(b"".join(match.groups()))
+                        latest = self._max_stamps[-1] if self._max_stamps else stamp
+                        if stamp < latest:
+                            lag = _from_stamp(latest) - _from_stamp(stamp)
+                            self._lag = max(self._lag, lag)
+                        self._offsets.append(self._size + match.start())
+                        self._stamps.append(stamp)
+                        self._max_stamps.append(max(stamp, latest))
+                    self._size += end
+                    pending = data[end:]
+            return len(self._offsets) - before
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @property
+    def size(self) -> int:
+        """Bytes indexed so far."""
+        return self._size
+
+    def _read(self, f, lo: int, hi: int) -> List[Dict]:
+        """Entries lo..hi-1 (oldest first), read with a single seek."""
+        end = self._offsets[hi] if hi < len(self._offsets) else self._size
+        f.seek(self._offsets[lo])
+        data = f.read(end - self._offsets[lo])
+        entries = []
+        for i in range(lo, hi):
+            start = self._offsets[i] - self._offsets[lo]
+            stop = (self._offsets[i + 1] if i + 1 < hi else end) - self._offsets[lo]
+            text = data[start:stop].decode("utf-8", errors="replace")
+            sql = text[22:].rstrip()
+            if sql.endswith(";"):
+                sql = sql[:-1]
+            entries.append(
+                {
+                    "index": i,
+                    "timestamp": datetime.datetime.strptime(
+                        text[1:20], "%Y-%m-%d %H:%M:%S"
+                    ),
+                    "kind": (sql.split(None, 1) or ["?"])[0].upper(),
+                    "sql": sql,
+                }
+            )
+        return entries
+
+    def page(
+        self,
+        before: Optional[int] = None,
+        page_size: int = 50,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+        kinds: Optional[Iterable[str]] = None,
+        table: Optional[str] = None,
+        block: int = 500,
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """Returns up to `page_size` matching entries, newest first.
+
+        `before` is the cursor returned with the previous page (None starts at
+        the newest entry); the returned cursor is None after the oldest match.
+        `since`/`until` bound the timestamp (until is exclusive), `kinds` the
+        first keyword (SELECT, INSERT, ...) and `table` a table name anywhere
+        in the statement. The time range is narrowed by binary search; the
+        filters are checked while reading back `block` entries at a time.
+        """
+        kinds = {k.upper() for k in kinds} if kinds else None
+        pattern = re.compile(rf"\b{re.escape(table)}\b", re.I) if table else None
+        with self._lock:
+            hi = (
+                len(self._offsets)
+                if before is None
+                else min(before, len(self._offsets))
+            )
+            lo = 0
+            first, last = 0, None
+            # Every entry past the first with max >= until + lag is >= until,
+            # and every entry before the first with max >= since is < since
+            if until is not None:
+                last = _stamp(until)
+                bound = _stamp(until + self._lag)
+                hi = min(hi, bisect.bisect_left(self._max_stamps, bound))
+            if since is not None:
+                first = _stamp(since)
+                lo = bisect.bisect_left(self._max_stamps, first)
+            found: List[Dict] = []
+            if hi <= lo:
+                return found, None
+            with open(self.path, "rb") as f:
+                while hi > lo:
+                    start = max(lo, hi - block)
+                    for entry in reversed(self._read(f, start, hi)):
+                        stamp = self._stamps[entry["index"]]
+                        if stamp < first or (last is not None and stamp >= last):
+                            continue
+                        if (kinds is None or entry["kind"] in kinds) and (
+                            pattern is None or pattern.search(entry["sql"])
+                        ):
+                            found.append(entry)
+                            if len(found) == page_size:
+                                cursor = entry["index"]
+                                return found, cursor if cursor > lo else None
+                    hi = start
+            return found, None
+
+
+# ==========================================
+#  PROCESS-WIDE WRITER REGISTRY
+# ==========================================
+
+_writers: Dict[str, SQLLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_sql_logger(path: str, **options) -> SQLLogWriter:
+    """Returns the shared writer for `path`, so one thread owns each file."""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = SQLLogWriter(path, **options)
+            _writers[key] = writer
+        return writer
+
+
+_readers: Dict[str, SQLLogReader] = {}
+
+
+def get_log_reader(path: str, **options) -> SQLLogReader:
+    """Returns the shared reader for `path`, so its index is built only once."""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        reader = _readers.get(key)
+        if reader is None:
+            reader = SQLLogReader(path, **options)
+            _readers[key] = reader
+        return reader
+
+
+def close_all_loggers():
+    """Drains and stops every writer (registered to run at exit)."""
+    with _writers_lock:
+        for writer in _writers.values():
+            writer.close()
+        _writers.clear()
+
+
+atexit.register(close_all_loggers)
@@ -0,0 +1,291 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from db_utils import DatabaseManager
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Filter operator -> SQL template ({col} is the quoted column)
+FILTER_OPS = {
+    "=": "{col} = %s",
+    "!=": "{col} != %s",
+    "<": "{col} < %s",
+    "<=": "{col} <= %s",
+    ">": "{col} > %s",
+    ">=": "{col} >= %s",
+    "contains": "{col} LIKE %s",
+    "starts with": "{col} LIKE %s",
+    "is null": "{col} IS NULL",
+    "is not null": "{col} IS NOT NULL",
+}
+
+# A filter: (column, operator, value); the value is ignored for the NULL tests
+Filter = Tuple[str, str, Any]
+
+
+def _quote(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _plain(value: Any) -> Any:
+    """Turns a pandas/numpy cell back into a value PyMySQL can send."""
+    if value is None:
+        return None
+    try:
+        import pandas as pd
+
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, "to_pydatetime"):
+        return value.to_pydatetime()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def table_schema(db: DatabaseManager, table: str) -> Dict[str, Any]:
+    """Returns {"columns", "primary_key", "nullable"} for a table in the current database."""
+    sql = """SELECT column_name, is_nullable, column_key FROM information_schema.COLUMNS
+             WHERE table_schema = DATABASE() AND table_name = %s
+             ORDER BY ordinal_position"""
+    columns, primary_key, nullable = [], [], set()
+    for names, rows in db.iter_batches(sql, (table,)):
+        for name, is_nullable, key in rows:
+            columns.append(name)
+            if key == "PRI":
+                primary_key.append(name)
+            if is_nullable == "YES":
+                nullable.add(name)
+    if not columns:
+        raise ValueError(f"Unknown table '{table}'.")
+    return {"columns": columns, "primary_key": primary_key, "nullable": nullable}
+
+
+class TablePager:
+    """
+    Keyset-paginated view of one table.
+
+    Pages are ordered by the sort column followed by the primary key, so every
+    row has a unique position and page n+1 starts right after the last key of
+    page n (`WHERE key > last ORDER BY key LIMIT n`): each page costs one index
+    range read however deep it is, unlike OFFSET. Projection, filters and the
+    sort all run on the server. Recently visited pages are kept, and the next
+    page is fetched in the background while the current one is displayed.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        table: str,
+        columns: Optional[Sequence[str]] = None,
+        sort: Optional[str] = None,
+        descending: bool = False,
+        filters: Sequence[Filter] = (),
+        page_size: int = 50,
+        prefetch: bool = True,
+        keep_pages: int = 5,
+    ):
+        schema = table_schema(db, table)
+        known = schema["columns"]
+        for name in list(columns or []) + ([sort] if sort else []):
+            if name not in known:
+                raise ValueError(f"Unknown column '{name}' in {table}.")
+        self.db = db
+        self.table = table
+        self.columns = list(columns) if columns else list(known)
+        self.page_size = max(int(page_size), 1)
+        self.descending = descending
+        self.keep_pages = max(keep_pages, 3)
+
+        # Tables without a primary key have no unique order: page by every column
+        tiebreak = schema["primary_key"] or known
+        self.key = ([sort] if sort else []) + [c for c in tiebreak if c != sort]
+        self.nullable = schema["nullable"]
+        self.where, self.params = self._filters(filters, known)
+
+        hidden = [c for c in self.key if c not in self.columns]
+        direction = " DESC" if descending else ""
+        self._select = (
+            f"SELECT {', '.join(_quote(c) for c in self.columns + hidden)} "
+            f"FROM {_quote(table)}"
+        )
+        self._order = " ORDER BY " + ", ".join(_quote(c) + direction for c in self.key)
+
+        self._lock = threading.Lock()
+        self._starts: List[Optional[Tuple]] = [None]  # start key of each known page
+        self._last: Optional[int] = None  # index of the last page, once seen
+        self._pages: "OrderedDict[int, pd.DataFrame]" = OrderedDict()
+        self._pending: Dict[int, Future] = {}
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="dna-prefetch")
+            if prefetch
+            else None
+        )
+
+    # ------------------------------------------
+    #  SQL building
+    # ------------------------------------------
+
+    @staticmethod
+    def _filters(
+        filters: Sequence[Filter], known: List[str]
+    ) -> Tuple[List[str], Tuple]:
+        clauses, params = [], ()
+        for column, op, value in filters:
+            if column not in known:
+                raise ValueError(f"Unknown column '{column}'.")
+            if op not in FILTER_OPS:
+                raise ValueError(f"Unknown filter operator '{op}'.")
+            clauses.append(FILTER_OPS[op].format(col=_quote(column)))
+            if op == "contains":
+                params += (f"%{value}%",)
+            elif op == "starts with":
+                params += (f"{value}%",)
+            elif op not in ("is null", "is not null"):
+                params += (value,)
+        return clauses, params
+
+    def _after(self, start: Tuple) -> Tuple[str, Tuple]:
+        """Predicate for rows strictly after `start` in key order.
+
+        Expanded into (k1 > v1) OR (k1 = v1 AND k2 > v2) ... so MySQL can use
+        a range scan. NULLs sort first ascending and last descending, as in
+        MySQL's ORDER BY.
+        """
+        terms, params = [], ()
+        for i, column in enumerate(self.key):
+            parts, part_params = [], ()
+            for prev, value in zip(self.key[:i], start[:i]):
+                if value is None:
+                    parts.append(f"{_quote(prev)} IS NULL")
+                else:
+                    parts.append(f"{_quote(prev)} = %s")
+                    part_params += (value,)
+            value, col = start[i], _quote(column)
+            if value is None:
+                if self.descending:
+                    continue  # nothing sorts after NULL when descending
+                parts.append(f"{col} IS NOT NULL")
+            elif self.descending:
+                null_last = f" OR {col} IS NULL" if column in self.nullable else ""
+                parts.append(f"({col} < %s{null_last})")
+                part_params += (value,)
+            else:
+                parts.append(f"{col} > %s")
+                part_params += (value,)
+            terms.append("(" + " AND ".join(parts) + ")")
+            params += part_params
+        return "(" + " OR ".join(terms) + ")", params
+
+    def _query(self, start: Optional[Tuple]) -> Tuple[str, Tuple]:
+        clauses, params = list(self.where), self.params
+        if start is not None:
+            after, after_params = self._after(start)
+            clauses.append(after)
+            params += after_params
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return f"{self._select}{where}{self._order} LIMIT %s", params + (
+            self.page_size + 1,
+        )
+
+    # ------------------------------------------
+    #  Pages
+    # ------------------------------------------
+
+    def _fetch(self, n: int) -> "pd.DataFrame":
+        """Reads page n (its start key must be known) and records where n+1 starts."""
+        sql, params = self._query(self._starts[n])
+        try:
+            frame = self.db.execute_query(sql, params, tables=(self.table,))
+        except Exception:
+            with self._lock:
+                self._pending.pop(n, None)  # let the next request try again
+            raise
+        has_more = len(frame) > self.page_size
+        frame = frame.iloc[: self.page_size]
+        with self._lock:
+            if has_more and len(self._starts) == n + 1:
+                last = frame.iloc[-1]
+                self._starts.append(tuple(_plain(last[c]) for c in self.key))
+            elif not has_more:
+                self._last = n
+            self._pages[n] = frame
+            self._pages.move_to_end(n)
+            while len(self._pages) > self.keep_pages:
+                self._pages.popitem(last=False)
+            self._pending.pop(n, None)
+        return frame
+
+    def page(self, n: int) -> "pd.DataFrame":
+        """Returns page n (0-based) of the table, fetching only what is needed.
+
+        Pages are reachable one step past the furthest page seen so far.
+        """
+        with self._lock:
+            if n >= len(self._starts):
+                raise IndexError(f"Page {n + 1} is not reachable yet.")
+            frame = self._pages.get(n)
+            if frame is not None:
+                self._pages.move_to_end(n)
+            pending = self._pending.get(n)
+        if frame is None:
+            frame = pending.result() if pending is not None else self._fetch(n)
+        self._prefetch(n + 1)
+        hidden = [c for c in frame.columns if c not in self.columns]
+        return frame.drop(columns=hidden) if hidden else frame
+
+    def _prefetch(self, n: int):
+        if self._executor is None:
+            return
+        with self._lock:
+            if (
+                n >= len(self._starts)
+                or n in self._pages
+                or n in self._pending
+                or (self._last is not None and n > self._last)
+            ):
+                return
+            self._pending[n] = self._executor.submit(self._fetch, n)
+
+    def has_next(self, n: int) -> bool:
+        """True if there is a page after page n (known once n has been read)."""
+        with self._lock:
+            return n + 1 < len(self._starts)
+
+    # ------------------------------------------
+    #  Counts
+    # ------------------------------------------
+
+    def estimated_count(self) -> Optional[int]:
+        """A cheap row-count estimate: table statistics, or EXPLAIN when filtered."""
+        if not self.where:
+            sql = """SELECT table_rows FROM information_schema.TABLES
+                     WHERE table_schema = DATABASE() AND table_name = %s"""
+            value = self.db.fetch_value(sql, (self.table,))
+            return int(value) if value is not None else None
+        plan = self.db.execute_query(
+            f"EXPLAIN SELECT 1 FROM {_quote(self.table)} WHERE "
+            + " AND ".join(self.where),
+            self.params,
+        )
+        if plan.empty or "rows" not in plan:
+            return None
+        filtered = float(plan["filtered"].iloc[0]) if "filtered" in plan else 100.0
+        return int(float(plan["rows"].iloc[0]) * filtered / 100)
+
+    def exact_count(self) -> int:
+        """COUNT(*) with the current filters (a full scan on large tables)."""
+        where = " WHERE " + " AND ".join(self.where) if self.where else ""
+        value = self.db.fetch_value(
+            f"SELECT COUNT(*) FROM {_quote(self.table)}{where}", self.params
+        )
+        return int(value or 0)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,111 @@
+import shutil
+import sys
+from typing import Any, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+NULL_TEXT = "NULL"
+
+
+def _cell(value: Any, width: int) -> str:
+    text = NULL_TEXT if value is None else str(value).replace("\n", " ")
+    if len(text) > width:
+        return text[: max(width - 1, 0)] + "…"
+    return text
+
+
+def _widths(columns: Sequence[str], rows: List[Tuple], max_width: int) -> List[int]:
+    widths = [min(len(c), max_width) for c in columns]
+    for row in rows:
+        for i, value in enumerate(row):
+            text = NULL_TEXT if value is None else str(value)
+            if len(text) > widths[i]:
+                widths[i] = min(len(text), max_width)
+    return widths
+
+
+def _line(values: Sequence[str], widths: List[int], numeric: List[bool]) -> str:
+    cells = (
+        v.rjust(w) if right else v.ljust(w)
+        for v, w, right in zip(values, widths, numeric)
+    )
+    return " | ".join(cells).rstrip()
+
+
+def render_table(
+    batches: Iterable[Tuple[List[str], List[Tuple]]],
+    page_size: int = 40,
+    max_width: int = 30,
+    out: Optional[TextIO] = None,
+    interactive: Optional[bool] = None,
+) -> int:
+    """Prints streamed (columns, rows) batches as an aligned text table.
+
+    Column widths are fixed from the header and the first page, so rows are
+    printed as they arrive and memory holds at most one page; later, wider
+    values push their row out of line rather than being cut, and only cells
+    longer than `max_width` are truncated with "…". In interactive mode (default: when both
+    stdin and stdout are terminals) output pauses after every page; answering
+    "q" stops reading and closes the stream. Returns the rows printed.
+    """
+    out = out or sys.stdout
+    if interactive is None:
+        interactive = sys.stdin.isatty() and out.isatty()
+    # Never let a table wrap: shrink the cap to fit the terminal if needed
+    term_width = shutil.get_terminal_size((120, 24)).columns
+
+    batches = iter(batches)
+    columns: List[str] = []
+    first_page: List[Tuple] = []
+    for columns, rows in batches:
+        first_page.extend(rows)
+        if len(first_page) >= page_size:
+            break
+    if not columns:
+        print("(no result)", file=out)
+        return 0
+    if not first_page:
+        print(" | ".join(columns), file=out)
+        print("(0 rows)", file=out)
+        return 0
+
+    widths = _widths(columns, first_page, max_width)
+    while max_width > 8 and sum(widths) + 3 * (len(columns) - 1) > term_width:
+        max_width -= 4
+        widths = _widths(columns, first_page, max_width)
+    numeric = [
+        all(
+            isinstance(row[i], (int, float)) for row in first_page if row[i] is not None
+        )
+        for i in range(len(columns))
+    ]
+    header = _line(
+        [_cell(c, w) for c, w in zip(columns, widths)], widths, [False] * len(columns)
+    )
+
+    def rows_stream():
+        yield from first_page
+        for _, rows in batches:
+            yield from rows
+
+    printed = 0
+    try:
+        for row in rows_stream():
+            if printed == 0 or (interactive and printed % page_size == 0):
+                if printed:
+                    answer = input(
+                        f"-- {printed} rows shown, Enter for more, q to stop -- "
+                    )
+                    if answer.strip().lower() == "q":
+                        break
+                print(header, file=out)
+                print("-+-".join("-" * w for w in widths), file=out)
+            print(
+                _line([_cell(v, max_width) for v in row], widths, numeric),
+                file=out,
+            )
+            printed += 1
+    finally:
+        close = getattr(batches, "close", None)
+        if close is not None:
+            close()  # releases the server-side cursor if we stopped early
+    print(f"({printed} row{'s' if printed != 1 else ''})", file=out)
+    return printed
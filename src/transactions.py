@@ -0,0 +1,80 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+import pymysql
+
+# MySQL errors after which the whole transaction can simply be run again
+RETRYABLE_ERRORS = {
+    1205,  # ER_LOCK_WAIT_TIMEOUT
+    1213,  # ER_LOCK_DEADLOCK
+}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True if `error` (or the PyMySQL error it wraps) is a deadlock or lock timeout."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, pymysql.MySQLError) and error.args:
+            if error.args[0] in RETRYABLE_ERRORS:
+                return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class Transaction:
+    """
+    An open unit of work on one pooled connection.
+
+    Every DatabaseManager call made by the owning thread while it is open runs
+    on the same connection and commits (or rolls back) with it. Tables written
+    are collected so cache invalidation and change-feed events happen once,
+    after the commit, instead of exposing uncommitted state.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.tables: Optional[set] = set()
+        self._savepoints = 0
+
+    def touch(self, tables: Optional[Iterable[str]]):
+        if tables is None:
+            self.tables = None
+        elif self.tables is not None:
+            self.tables.update(tables)
+
+    @contextmanager
+    def savepoint(self) -> Iterator[str]:
+        """Runs the block under a SAVEPOINT; an error undoes only the block."""
+        self._savepoints += 1
+        name = f"sp_{self._savepoints}"
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {name}")
+        try:
+            yield name
+        except BaseException as e:
+            # A deadlock has already rolled back the whole transaction
+            if not is_retryable(e):
+                with self.conn.cursor() as cursor:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            raise
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"RELEASE SAVEPOINT {name}")
+
+
+# pool -> open Transaction, per thread (the pool hands each thread one connection)
+_active = threading.local()
+
+
+def active_transaction(pool) -> Optional[Transaction]:
+    return getattr(_active, "by_pool", {}).get(id(pool))
+
+
+def set_active_transaction(pool, tx: Optional[Transaction]):
+    if not hasattr(_active, "by_pool"):
+        _active.by_pool = {}
+    if tx is None:
+        _active.by_pool.pop(id(pool), None)
+    else:
+        _active.by_pool[id(pool)] = tx